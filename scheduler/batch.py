@@ -0,0 +1,108 @@
+# Batch generation of many single-room schedules in a process pool
+# Rooms are solved independently, one pool task per room, and reported as each finishes. Slot
+# grids are memoized by utils.weekly_slot_grid; every worker process also keeps the eligibility
+# filters it has computed per grid, so the rooms of a campus that share college time, breaks and
+# subject durations filter each faculty availability once per worker instead of once per room.
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+from model import ScheduleInput, TimeSlot
+from scheduler import SchedulerService
+from utils import generate_weekly_time_slots, slot_grid_key
+import metrics
+import startup
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Eligibility filter caches kept per worker process
+MAX_SHARED_GRIDS = 32
+
+# Per worker process: slot grid key -> eligibility filter cache over that grid's slots
+_shared: "OrderedDict[Tuple, Dict]" = OrderedDict()
+
+def _shared_grid(input_data: ScheduleInput) -> Tuple[Tuple[List[str], List[TimeSlot]], Dict]:
+    args = (input_data.college_time.startTime, input_data.college_time.endTime, input_data.break_, input_data.subjects)
+    grid = generate_weekly_time_slots(*args)
+    key = slot_grid_key(*args)
+    eligibility_cache = _shared.get(key)
+    if eligibility_cache is None:
+        eligibility_cache = _shared[key] = {}
+        while len(_shared) > MAX_SHARED_GRIDS:
+            _shared.popitem(last=False)
+    else:
+        _shared.move_to_end(key)
+    return grid, eligibility_cache
+
+def _solve_room(input_data: ScheduleInput, params: Dict[str, Any], control) -> Tuple[Dict[str, Any], Dict]:
+    """Worker entry point; returns the result and the metrics recorded for it, like jobs._run_job."""
+    metrics.REGISTRY.reset()
+    grid, eligibility_cache = _shared_grid(input_data)
+    should_stop = lambda: control.get("cancel", False)
+    result = SchedulerService().generate_schedule(input_data, should_stop=should_stop, slot_grid=grid, eligibility_cache=eligibility_cache, **params)
+    return result, metrics.REGISTRY.snapshot()
+
+class BatchRunner:
+    """Process pool for batch requests; rooms of all batches share its workers."""
+
+    def __init__(self, workers: Optional[int] = None, max_rooms: int = 500):
+        workers = workers or os.cpu_count() or 1
+        if workers < 1 or max_rooms < 1:
+            raise ValueError("workers and max_rooms must be at least 1")
+        self.workers = workers
+        self.max_rooms = max_rooms
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+
+    def _ensure_pool(self):
+        # Started lazily, on the first batch
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=startup.warm_up)
+
+    def submit(self, inputs: List[ScheduleInput], params: Dict[str, Any]) -> Tuple[List[Future], Any]:
+        """Queue one task per room input; returns the futures (in input order) and the batch control dict.
+
+        Setting control["cancel"] stops the running rooms at their next checkpoint.
+        """
+        if not inputs:
+            raise ValueError("A batch needs at least one room input")
+        if len(inputs) > self.max_rooms:
+            raise ValueError(f"A batch may contain at most {self.max_rooms} room inputs, got {len(inputs)}")
+        with self._lock:
+            self._ensure_pool()
+            control = self._manager.dict(cancel=False)
+            try:
+                futures = [self._executor.submit(_solve_room, input_data, params, control) for input_data in inputs]
+            except BrokenProcessPool:
+                logger.warning("Batch worker pool was broken, starting a new one")
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=startup.warm_up)
+                futures = [self._executor.submit(_solve_room, input_data, params, control) for input_data in inputs]
+        logger.info(f"Queued batch of {len(inputs)} room(s) on {self.workers} worker(s)")
+        return futures, control
+
+    def cancel(self, futures: List[Future], control):
+        """Drop the rooms still waiting for a worker and ask the running ones to stop."""
+        for future in futures:
+            future.cancel()
+        try:
+            control["cancel"] = True
+        except (EOFError, OSError, BrokenPipeError):
+            pass
+
+    def shutdown(self):
+        with self._lock:
+            executor, manager = self._executor, self._manager
+            self._executor = self._manager = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
@@ -0,0 +1,2 @@
+# Benchmark harness for the scheduling hot paths
+# Run from the scheduler directory: python -m benchmarks.run --help
@@ -0,0 +1,207 @@
+# Benchmark runner for slot generation, the greedy scheduler, the GA and fitness evaluation
+# Each benchmark runs on synthetic inputs of several sizes and records wall time (best of
+# --repeat runs), peak traced memory (one extra run under tracemalloc) and solution quality.
+# --record writes the results to a JSON baseline; --check compares against it and exits with
+# status 1 when a benchmark produced a worse solution. Wall time and memory depend on the machine,
+# so against the committed baseline their regressions are only reported; --fail-on-resources also
+# fails on them, for baselines recorded on the same machine before the change:
+#
+#   python -m benchmarks.run --check
+#   git stash && python -m benchmarks.run --record --baseline /tmp/before.json && git stash pop
+#   python -m benchmarks.run --check --baseline /tmp/before.json --fail-on-resources
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from model import ScheduleInput, ScheduleAssignment
+from utils import generate_weekly_time_slots
+from scheduler import SchedulerService
+from genetic_algorithm import GeneticAlgorithm
+from constraints import ConstraintChecker
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BASELINE_VERSION = 1
+
+SIZES = {
+    "small": SyntheticSpec(rooms=1, subjects=6, faculty_per_subject=2, availability_density=0.7, breaks=1, durations=(50,)),
+    "medium": SyntheticSpec(rooms=2, subjects=15, faculty_per_subject=3, availability_density=0.6, breaks=2, durations=(50, 100)),
+    "large": SyntheticSpec(rooms=6, subjects=80, faculty_per_subject=4, availability_density=0.5, breaks=3, durations=(50,), start_time="08:00", end_time="20:00"),
+}
+
+GA_POPULATION = 30
+GA_GENERATIONS = 10
+GA_SEED = 0
+# calculate_fitness is fast, so one measured run evaluates it this many times
+FITNESS_CALLS = 50
+
+# A benchmark prepares its (untimed) state and returns the timed callable, which returns the quality
+Benchmark = Callable[[ScheduleInput], Callable[[], float]]
+
+def _weekly_slots(input_data: ScheduleInput):
+    college_time = input_data.college_time
+    return generate_weekly_time_slots(college_time.startTime, college_time.endTime, input_data.break_, input_data.subjects)
+
+def bench_slot_generation(input_data: ScheduleInput) -> Callable[[], float]:
+    """Quality: number of weekly slots."""
+    return lambda: len(_weekly_slots(input_data)[1])
+
+def bench_greedy(input_data: ScheduleInput) -> Callable[[], float]:
+    """Quality: share of the required classes placed."""
+    required = sum(subject.no_of_classes_per_week for subject in input_data.subjects)
+    return lambda: SchedulerService().generate_schedule(input_data)["total_assignments"] / required if required else 1.0
+
+def bench_genetic_algorithm(input_data: ScheduleInput) -> Callable[[], float]:
+    """Quality: best fitness (a penalty, lower is better)."""
+    _, slots = _weekly_slots(input_data)
+
+    def run() -> float:
+        ga = GeneticAlgorithm(input_data, slots, pop_size=GA_POPULATION, generations=GA_GENERATIONS, fixed_room_id=input_data.rooms[0], seed=GA_SEED)
+        return ga.run()[1]
+    return run
+
+def bench_fitness(input_data: ScheduleInput) -> Callable[[], float]:
+    """Quality: fitness of the campus schedule over all rooms (a penalty, lower is better)."""
+    result = SchedulerService().generate_campus_schedule(input_data)
+    schedule = [ScheduleAssignment(**a) for day in result["weekly_schedule"]["days"].values() for a in day]
+    checker = ConstraintChecker(input_data.subjects)
+
+    def run() -> float:
+        fitness = 0.0
+        for _ in range(FITNESS_CALLS):
+            fitness = checker.calculate_fitness(schedule, input_data)
+        return fitness
+    return run
+
+# name -> (benchmark, quality direction: True = higher is better, False = lower, None = must not change)
+BENCHMARKS: Dict[str, Tuple[Benchmark, Optional[bool]]] = {
+    "slot_generation": (bench_slot_generation, None),
+    "greedy": (bench_greedy, True),
+    "genetic_algorithm": (bench_genetic_algorithm, False),
+    "fitness": (bench_fitness, False),
+}
+
+def measure(benchmark: Benchmark, input_data: ScheduleInput, repeat: int) -> Dict[str, float]:
+    run = benchmark(input_data)
+    quality = run()  # Warm-up; also fills lru caches so every measured run does the same work
+    best = float("inf")
+    # Like timeit, keep collector pauses out of the timings
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"wall_ms": round(best * 1000, 3), "peak_kib": round(peak / 1024, 1), "quality": round(quality, 6)}
+
+def run_benchmarks(sizes: List[str], names: List[str], repeat: int = 5) -> Dict[str, Any]:
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for size in sizes:
+        input_data = make_schedule_input(SIZES[size])
+        results[size] = {}
+        for name in names:
+            results[size][name] = measure(BENCHMARKS[name][0], input_data, repeat)
+            print(f"{size:>8} {name:<18} {results[size][name]['wall_ms']:>10.3f} ms {results[size][name]['peak_kib']:>10.1f} KiB  quality {results[size][name]['quality']:g}", file=sys.stderr)
+    return {
+        "version": BASELINE_VERSION,
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.5, memory_threshold: float = 0.1, min_delta_ms: float = 1.0) -> Tuple[List[str], List[str]]:
+    """Regressions of current against baseline: (quality regressions, wall time and memory regressions).
+
+    Wall time regresses when it grows by more than threshold (a fraction) and by at least
+    min_delta_ms, peak memory when it grows by more than memory_threshold. Quality is
+    deterministic for a given input and regresses on any change in the wrong direction.
+    """
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Baseline version {baseline.get('version')} does not match {BASELINE_VERSION}; record a new baseline")
+    quality_regressions = []
+    resource_regressions = []
+    for size, benchmarks in current["results"].items():
+        for name, now in benchmarks.items():
+            before = baseline["results"].get(size, {}).get(name)
+            if before is None:
+                continue
+            label = f"{size}/{name}"
+            if now["wall_ms"] > before["wall_ms"] * (1 + threshold) and now["wall_ms"] - before["wall_ms"] >= min_delta_ms:
+                resource_regressions.append(f"{label}: wall time {before['wall_ms']:.3f} -> {now['wall_ms']:.3f} ms")
+            if now["peak_kib"] > before["peak_kib"] * (1 + memory_threshold):
+                resource_regressions.append(f"{label}: peak memory {before['peak_kib']:.1f} -> {now['peak_kib']:.1f} KiB")
+            higher_is_better = BENCHMARKS[name][1]
+            delta = now["quality"] - before["quality"]
+            if (higher_is_better is None and delta != 0) or (higher_is_better is True and delta < 0) or (higher_is_better is False and delta > 0):
+                quality_regressions.append(f"{label}: quality {before['quality']:g} -> {now['quality']:g}")
+    return quality_regressions, resource_regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark the scheduling hot paths on synthetic inputs.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=5, help="measured runs per benchmark; the fastest counts")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--record", action="store_true", help="write the results to the baseline file, keeping the entries of benchmarks not run")
+    parser.add_argument("--check", action="store_true", help="fail on quality regressions against the baseline file and report slower runs")
+    parser.add_argument("--fail-on-resources", action="store_true", help="with --check, also fail on wall time and memory regressions")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed relative growth of wall time")
+    parser.add_argument("--memory-threshold", type=float, default=0.1, help="allowed relative growth of peak memory")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="wall time growth below this is never a regression")
+    parser.add_argument("--output", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    # The scheduler logs every run and warns about every unplaced class; keep the output readable and the timings clean
+    logging.disable(logging.WARNING)
+    current = run_benchmarks(args.sizes, args.only, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        quality_regressions, resource_regressions = compare(baseline, current, args.threshold, args.memory_threshold, args.min_delta_ms)
+        if args.fail_on_resources:
+            quality_regressions += resource_regressions
+        else:
+            for regression in resource_regressions:
+                print(f"WARNING {regression} (reported only; see --fail-on-resources)", file=sys.stderr)
+        for regression in quality_regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if quality_regressions:
+            return 1
+        print(f"No regressions against {args.baseline}", file=sys.stderr)
+    if args.record:
+        # Benchmarks left out with --sizes/--only keep their recorded values
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            if previous.get("version") == BASELINE_VERSION:
+                for size, benchmarks in previous["results"].items():
+                    for name, values in benchmarks.items():
+                        current["results"].setdefault(size, {}).setdefault(name, values)
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
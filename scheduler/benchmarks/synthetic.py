@@ -0,0 +1,83 @@
+# Synthetic ScheduleInput generator for benchmarks
+# Inputs are fully determined by a SyntheticSpec (including its seed), so timings and solution
+# quality are comparable between runs and machines.
+import random
+from dataclasses import dataclass
+from typing import Tuple
+from model import ScheduleInput, Subject, Faculty, TimeSlot, Break, PreferredSlot, CollegeTime, VALID_DAYS
+from utils import time_to_minutes, minutes_to_time
+
+# Granularity of faculty availability windows, in minutes
+AVAILABILITY_BLOCK = 60
+BREAK_LENGTH = 10
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    rooms: int = 1
+    subjects: int = 8
+    faculty_per_subject: int = 2
+    availability_density: float = 0.7  # Share of (day, hour) blocks a faculty member is available in
+    breaks: int = 1  # The first break is ALL_DAYS, the others fall on single days
+    durations: Tuple[int, ...] = (50,)  # Class durations in minutes, drawn per subject
+    classes_per_week: Tuple[int, int] = (2, 4)  # Inclusive range, drawn per subject
+    start_time: str = "09:00"
+    end_time: str = "17:00"
+    seed: int = 0
+
+def _availability(rng: random.Random, start: int, end: int, density: float) -> list:
+    """Merge the available hour blocks of every day into contiguous TimeSlots."""
+    slots = []
+    for day in VALID_DAYS:
+        window_start = None
+        for block in range(start, end, AVAILABILITY_BLOCK):
+            available = rng.random() < density
+            if available and window_start is None:
+                window_start = block
+            elif not available and window_start is not None:
+                slots.append(TimeSlot(day=day, startTime=minutes_to_time(window_start), endTime=minutes_to_time(block)))
+                window_start = None
+        if window_start is not None:
+            slots.append(TimeSlot(day=day, startTime=minutes_to_time(window_start), endTime=minutes_to_time(end)))
+    return slots
+
+def make_schedule_input(spec: SyntheticSpec) -> ScheduleInput:
+    if spec.rooms < 1 or spec.subjects < 0 or spec.faculty_per_subject < 0:
+        raise ValueError("rooms must be positive and subjects/faculty_per_subject must not be negative")
+    if not 0.0 <= spec.availability_density <= 1.0:
+        raise ValueError("availability_density must be between 0 and 1")
+    if not spec.durations:
+        raise ValueError("durations must not be empty")
+    rng = random.Random(spec.seed)
+    start, end = time_to_minutes(spec.start_time), time_to_minutes(spec.end_time)
+
+    # Breaks are spread evenly over the college day
+    breaks = []
+    for i in range(spec.breaks):
+        at = start + (end - start) * (i + 1) // (spec.breaks + 1)
+        day = "ALL_DAYS" if i == 0 else VALID_DAYS[(i - 1) % len(VALID_DAYS)]
+        breaks.append(Break(day=day, startTime=minutes_to_time(at), endTime=minutes_to_time(at + BREAK_LENGTH)))
+
+    subjects = []
+    for s in range(spec.subjects):
+        faculty = []
+        for f in range(spec.faculty_per_subject):
+            faculty.append(Faculty(
+                id=f"F{s}_{f}",
+                name=f"Faculty {s}.{f}",
+                availability=_availability(rng, start, end, spec.availability_density),
+                preferred_slots=[PreferredSlot(day="ANY_DAY", startTime=spec.start_time, endTime=minutes_to_time(min(end, start + 180)), priority=rng.randint(1, 5))]
+            ))
+        day = rng.choice(VALID_DAYS)
+        subjects.append(Subject(
+            name=f"Subject {s}",
+            time=rng.choice(spec.durations),
+            no_of_classes_per_week=rng.randint(*spec.classes_per_week),
+            faculty=faculty,
+            preferred_slots=[PreferredSlot(day=day, startTime=spec.start_time, endTime=spec.end_time, priority=rng.randint(1, 5))]
+        ))
+    return ScheduleInput(
+        subjects=subjects,
+        break_=breaks,
+        college_time=CollegeTime(startTime=spec.start_time, endTime=spec.end_time),
+        rooms=[f"R{r + 1}" for r in range(spec.rooms)]
+    )
@@ -0,0 +1,197 @@
+# Compact array-backed chromosome for the genetic algorithm
+# An individual is a fixed-length integer array with one gene per required class.
+# A gene holds the index of a (faculty, slot) candidate of its subject, or -1 when unassigned;
+# ScheduleAssignment objects are only built when an individual is decoded.
+import random
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from model import ScheduleInput, ScheduleAssignment, TimeSlot
+from eligibility import EligibilityIndex
+from occupancy import SlotGrid, OccupancyIndex
+from utils import record_conflicts_with_breaks
+from constraints import count_overlaps
+
+UNASSIGNED = -1
+
+class ChromosomeCodec:
+    """Gene layout, candidate tables and GA operators for compact chromosomes."""
+
+    def __init__(self, input_data: ScheduleInput, slots: List[TimeSlot], eligibility: EligibilityIndex, room_id: str, grid: SlotGrid, conflict_checker: Callable = None, rng: Optional[random.Random] = None):
+        self.input_data = input_data
+        # The operators draw from rng, which the GA shares with the codec (never the global RNG)
+        self.rng = rng or random.Random()
+        self.slots = slots
+        self.room_id = room_id
+        self.grid = grid
+        self.conflict_checker = conflict_checker
+        self.records = [slot.record for slot in slots]
+        self.break_hits = [record_conflicts_with_breaks(record, input_data.break_) for record in self.records]
+        self.n_assignable = len(slots)
+
+        # One block of genes per input subject; candidates are (faculty, slot id) pairs in eligibility order
+        self.subject_names: List[str] = []
+        self.gene_subject: List[int] = []
+        self.block_start: List[int] = []
+        self.candidate_faculty: List[List[Tuple[str, str]]] = []
+        self.candidate_slot: List[List[int]] = []
+        self.candidate_lookup: List[Dict[Tuple[str, int], int]] = []
+        for s, subject in enumerate(input_data.subjects):
+            self.subject_names.append(subject.name)
+            self.block_start.append(len(self.gene_subject))
+            self.gene_subject.extend([s] * subject.no_of_classes_per_week)
+            faculty, slot_ids = [], []
+            for member in subject.faculty:
+                for slot_id in eligibility.slot_ids(subject.name, member.id):
+                    faculty.append((member.id, member.name))
+                    slot_ids.append(slot_id)
+            self.candidate_faculty.append(faculty)
+            self.candidate_slot.append(slot_ids)
+            self.candidate_lookup.append({(faculty[c][0], slot_ids[c]): c for c in range(len(slot_ids))})
+        self.block_end = self.block_start[1:] + [len(self.gene_subject)]
+        self.length = len(self.gene_subject)
+        self.requirements = [(subject.name, subject.no_of_classes_per_week) for subject in input_data.subjects]
+        self.possible = [(s, c) for s in range(len(self.subject_names)) for c in range(len(self.candidate_slot[s]))]
+        self.slot_ids_by_record = {}
+        for slot_id, record in enumerate(self.records):
+            self.slot_ids_by_record.setdefault(record, slot_id)
+
+    def _gene(self, gene: int, candidate: int) -> Tuple[str, int]:
+        s = self.gene_subject[gene]
+        return self.candidate_faculty[s][candidate][0], self.candidate_slot[s][candidate]
+
+    def _allowed(self, occupancy: OccupancyIndex, faculty_id: str, slot_id: int) -> bool:
+        if not occupancy.is_free(faculty_id, self.room_id, self.records[slot_id]):
+            return False
+        return not self.conflict_checker or self.conflict_checker(faculty_id, self.slots[slot_id], self.room_id, self.input_data)
+
+    def random_genes(self) -> List[int]:
+        """Random conflict-free genes, filled in shuffled candidate order like _create_individual."""
+        genes = [UNASSIGNED] * self.length
+        next_gene = list(self.block_start)
+        occupancy = OccupancyIndex(self.grid)
+        possible = list(self.possible)
+        self.rng.shuffle(possible)
+        for s, c in possible:
+            gene = next_gene[s]
+            if gene >= self.block_end[s]:
+                continue
+            faculty_id, slot_id = self.candidate_faculty[s][c][0], self.candidate_slot[s][c]
+            if not self._allowed(occupancy, faculty_id, slot_id):
+                continue
+            genes[gene] = c
+            next_gene[s] += 1
+            occupancy.occupy(faculty_id, self.room_id, self.records[slot_id])
+        return genes
+
+    def encode(self, schedule: List[ScheduleAssignment]) -> List[int]:
+        """Genes for an assignment list; assignments outside the candidate tables are dropped."""
+        genes = [UNASSIGNED] * self.length
+        next_gene = list(self.block_start)
+        for assignment in schedule:
+            slot_id = self.slot_ids_by_record.get(assignment.record)
+            if slot_id is None or assignment.room_id != self.room_id:
+                continue
+            for s, name in enumerate(self.subject_names):
+                if name != assignment.subject_name or next_gene[s] >= self.block_end[s]:
+                    continue
+                candidate = self.candidate_lookup[s].get((assignment.faculty_id, slot_id))
+                if candidate is not None:
+                    genes[next_gene[s]] = candidate
+                    next_gene[s] += 1
+                    break
+        return genes
+
+    def decode(self, genes) -> List[ScheduleAssignment]:
+        schedule = []
+        for gene, candidate in enumerate(genes):
+            if candidate == UNASSIGNED:
+                continue
+            s = self.gene_subject[gene]
+            faculty_id, faculty_name = self.candidate_faculty[s][candidate]
+            slot = self.slots[self.candidate_slot[s][candidate]]
+            schedule.append(ScheduleAssignment(
+                subject_name=self.subject_names[s],
+                faculty_id=faculty_id,
+                faculty_name=faculty_name,
+                day=slot.day,
+                startTime=slot.startTime,
+                endTime=slot.endTime,
+                room_id=self.room_id
+            ))
+        return schedule
+
+    def fitness(self, genes) -> Tuple[int]:
+        """Same score as GeneticAlgorithm._calculate_fitness on the decoded schedule."""
+        counts = Counter()
+        conflicts = 0
+        occupancy = OccupancyIndex(self.grid)
+        faculty_records: Dict[str, List] = {}
+        room_records: List = []
+        used = set()
+        for gene, candidate in enumerate(genes):
+            if candidate == UNASSIGNED:
+                continue
+            faculty_id, slot_id = self._gene(gene, candidate)
+            record = self.records[slot_id]
+            counts[self.subject_names[self.gene_subject[gene]]] += 1
+            if self.break_hits[slot_id]:
+                conflicts += 1
+            if not occupancy.faculty_free(faculty_id, record):
+                conflicts += count_overlaps(record, faculty_records[faculty_id])
+            if not occupancy.room_free(self.room_id, record):
+                conflicts += count_overlaps(record, room_records)
+            occupancy.occupy(faculty_id, self.room_id, record)
+            faculty_records.setdefault(faculty_id, []).append(record)
+            room_records.append(record)
+            used.add(record)
+        requirement_penalty = sum(abs(counts[name] - required) for name, required in self.requirements) * 1000
+        return (requirement_penalty + conflicts * 100 + (self.n_assignable - len(used)) * 5000,)
+
+    def _repair(self, genes) -> OccupancyIndex:
+        """Unassign genes that clash with an earlier gene or a break; return the resulting occupancy."""
+        occupancy = OccupancyIndex(self.grid)
+        for gene, candidate in enumerate(genes):
+            if candidate == UNASSIGNED:
+                continue
+            faculty_id, slot_id = self._gene(gene, candidate)
+            if self.break_hits[slot_id] or not occupancy.is_free(faculty_id, self.room_id, self.records[slot_id]):
+                genes[gene] = UNASSIGNED
+                continue
+            occupancy.occupy(faculty_id, self.room_id, self.records[slot_id])
+        return occupancy
+
+    def crossover(self, ind1, ind2):
+        """One-point crossover over the gene arrays, then repair of the children."""
+        if self.length < 2:
+            return ind1, ind2
+        point = self.rng.randint(1, self.length - 1)
+        head1 = ind1[:point]
+        ind1[:point] = ind2[:point]
+        ind2[:point] = head1
+        self._repair(ind1)
+        self._repair(ind2)
+        return ind1, ind2
+
+    def mutate(self, individual, indpb: float):
+        """Reassign (or fill) each gene with probability indpb to a free candidate of its subject."""
+        occupancy = self._repair(individual)
+        for gene in range(self.length):
+            if self.rng.random() >= indpb:
+                continue
+            s = self.gene_subject[gene]
+            old = individual[gene]
+            if old != UNASSIGNED:
+                faculty_id, slot_id = self._gene(gene, old)
+                occupancy.release(faculty_id, self.room_id, self.records[slot_id])
+            candidates = self.candidate_slot[s]
+            for candidate in self.rng.sample(range(len(candidates)), len(candidates)):
+                faculty_id, slot_id = self.candidate_faculty[s][candidate][0], candidates[candidate]
+                if self._allowed(occupancy, faculty_id, slot_id):
+                    individual[gene] = candidate
+                    occupancy.occupy(faculty_id, self.room_id, self.records[slot_id])
+                    break
+            else:
+                if old != UNASSIGNED:
+                    faculty_id, slot_id = self._gene(gene, old)
+                    occupancy.occupy(faculty_id, self.room_id, self.records[slot_id])
+        return individual,
@@ -0,0 +1,116 @@
+# Compact columnar encoding of schedule results
+# The default response repeats every field name, subject, faculty and room string per assignment
+# and is run through FastAPI's jsonable_encoder, which dominates the response time of large
+# campus results. The columnar layout stores each weekly schedule as parallel integer arrays
+# indexing interned tables and is encoded directly, with orjson when it is installed:
+#
+#   "weekly_schedule": {
+#     "layout": "columnar",
+#     "days": [...], "time_slots": [...], "grid_slots": n,
+#     "subjects": [...], "faculty": {"id": [...], "name": [...]}, "rooms": [...],
+#     "assignments": {"subject": [...], "faculty": [...], "room": [...], "slot": [...],
+#                     "is_special": [0/1, ...], "priority_score": [...]}
+#   }
+#
+# A slot id is day_index * len(time_slots) + label_index. The first grid_slots labels are the
+# slot grid; labels of assignments off the grid (kept by /api/reschedule) follow them. Campus
+# results drop the per-room copies of the weekly schedule, since the "room" column holds the
+# same split. Every other key of the result is left as it is.
+import json
+import msgpack
+from typing import Any, Dict, List, Tuple
+from model import VALID_DAYS
+
+try:
+    import orjson
+except ImportError:  # Optional; the standard library encoder is used without it
+    orjson = None
+
+# Values of the "format" query parameter; "json" is the per-day layout, unchanged
+FORMATS = ("json", "compact", "msgpack")
+LAYOUT = "columnar"
+
+class _Interner:
+    """Assigns consecutive ids to values in first-seen order."""
+
+    def __init__(self, values: List = ()):
+        self.values = list(values)
+        self.ids = {value: i for i, value in enumerate(self.values)}
+
+    def __call__(self, value) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+def columnar_weekly_schedule(weekly_schedule: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one {"time_slots", "days"} weekly schedule to the columnar layout."""
+    grid = weekly_schedule.get("time_slots") or []
+    days = weekly_schedule.get("days") or {}
+    day_names = _Interner(VALID_DAYS)
+    labels = _Interner(grid)
+    subjects = _Interner()
+    faculty = _Interner()
+    rooms = _Interner()
+    entries = []
+    for day, assignments in days.items():
+        day_index = day_names(day)
+        for a in assignments:
+            entries.append((
+                subjects(a["subject_name"]),
+                faculty((a["faculty_id"], a["faculty_name"])),
+                rooms(a["room_id"]),
+                day_index,
+                labels(f"{a['startTime']}-{a['endTime']}"),
+                1 if a.get("is_special") else 0,
+                a.get("priority_score", 0)
+            ))
+    # Slot ids need the final label count, so they are computed once every label is interned
+    width = len(labels.values)
+    subject_ids, faculty_ids, room_ids, day_ids, label_ids, special, scores = zip(*entries) if entries else ((),) * 7
+    return {
+        "layout": LAYOUT,
+        "days": day_names.values,
+        "time_slots": labels.values,
+        "grid_slots": len(grid),
+        "subjects": subjects.values,
+        "faculty": {"id": [f[0] for f in faculty.values], "name": [f[1] for f in faculty.values]},
+        "rooms": rooms.values,
+        "assignments": {
+            "subject": list(subject_ids),
+            "faculty": list(faculty_ids),
+            "room": list(room_ids),
+            "slot": [day * width + label for day, label in zip(day_ids, label_ids)],
+            "is_special": list(special),
+            "priority_score": list(scores)
+        }
+    }
+
+def to_columnar(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a generate-schedule or campus result with its weekly schedule in the columnar layout."""
+    converted = dict(result)
+    if isinstance(result.get("weekly_schedule"), dict):
+        converted["weekly_schedule"] = columnar_weekly_schedule(result["weekly_schedule"])
+    if isinstance(result.get("rooms"), dict):
+        converted["rooms"] = {
+            room_id: {key: value for key, value in room.items() if key != "weekly_schedule"}
+            for room_id, room in result["rooms"].items()
+        }
+    return converted
+
+def _default(value: Any) -> Any:
+    # NumPy scalars (e.g. GA fitness values) and anything else json.dumps would not take either
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def encode(result: Dict[str, Any], output_format: str) -> Tuple[bytes, str]:
+    """Encode a result (already converted with to_columnar) as "compact" JSON or "msgpack"; returns the body and media type."""
+    if output_format == "compact":
+        if orjson is not None:
+            return orjson.dumps(result, default=_default), "application/json"
+        return json.dumps(result, separators=(",", ":"), default=_default).encode(), "application/json"
+    if output_format == "msgpack":
+        return msgpack.packb(result, default=_default), "application/msgpack"
+    raise ValueError(f"Unknown format '{output_format}'; expected one of {', '.join(FORMATS)}")
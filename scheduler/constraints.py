@@ -117,9 +117,80 @@
 #             return False
 
 #         return True
-from typing import List
-from model import ScheduleInput, ScheduleAssignment, Subject, TimeSlot, Faculty
-from utils import check_time_conflict, check_break_conflict, time_to_minutes
+from typing import Dict, List, Tuple
+from model import ScheduleInput, ScheduleAssignment, Subject, TimeSlot, Faculty, SlotRecord
+from utils import check_time_conflict, check_break_conflict, record_conflicts_with_breaks
+from collections import defaultdict
+import heapq
+import metrics
+import time
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def _overlaps(r1: SlotRecord, r2: SlotRecord) -> bool:
+    return r1.start < r2.end and r2.start < r1.end
+
+def count_overlaps(record: SlotRecord, records: List[SlotRecord]) -> int:
+    """Count the records that overlap record on the same day.
+
+    Shared by every GA fitness path (scalar, FitnessState, compact codec), so they count alike.
+    """
+    count = 0
+    for other in records:
+        if record.day == other.day and record.start < other.end and other.start < record.end:
+            count += 1
+    return count
+
+def _overlapping_pairs(records: List[SlotRecord]) -> int:
+    """Number of overlapping pairs among the records of one resource and day, in O(n log n)."""
+    if len(records) < 2:
+        return 0
+    pairs = 0
+    # The sweep needs start < end. Empty or inverted records still overlap a proper record that
+    # spans them under the pairwise check, so they are paired up directly (two of them never overlap)
+    proper = [r for r in records if r.start < r.end]
+    if len(proper) < len(records):
+        pairs += sum(1 for r1 in records if r1.start >= r1.end for r2 in proper if _overlaps(r1, r2))
+        records = proper
+    # Sweep by start: an earlier record overlaps the current one exactly when it ends after the
+    # current start, and once it does not it cannot overlap any later record either
+    records.sort()
+    active: List[int] = []  # Min-heap of the ends of earlier records still open
+    for record in records:
+        while active and active[0] <= record.start:
+            heapq.heappop(active)
+        pairs += len(active)
+        heapq.heappush(active, record.end)
+    return pairs
+
+def _overlapping_pairs_across_faculty(assignments: List[ScheduleAssignment]) -> int:
+    """Like _overlapping_pairs for the classes of one room and day, skipping pairs with the same faculty."""
+    if len(assignments) < 2:
+        return 0
+    pairs = 0
+    # Empty or inverted records are paired up directly, as in _overlapping_pairs
+    proper = [a for a in assignments if a.record.start < a.record.end]
+    if len(proper) < len(assignments):
+        pairs += sum(
+            1 for a1 in assignments if a1.record.start >= a1.record.end
+            for a2 in proper if a1.faculty_id != a2.faculty_id and _overlaps(a1.record, a2.record)
+        )
+        assignments = proper
+    assignments.sort(key=lambda a: a.record)
+    active: List[Tuple[int, str]] = []  # Min-heap of (end, faculty id) of earlier classes still open
+    open_by_faculty: Dict[str, int] = defaultdict(int)
+    for a in assignments:
+        record = a.record
+        while active and active[0][0] <= record.start:
+            open_by_faculty[heapq.heappop(active)[1]] -= 1
+        pairs += len(active) - open_by_faculty[a.faculty_id]
+        heapq.heappush(active, (record.end, a.faculty_id))
+        open_by_faculty[a.faculty_id] += 1
+    return pairs
+
 # This module contains the ConstraintChecker class which validates scheduling constraints.
 class ConstraintChecker:
     def __init__(self, subjects: List[Subject]):
@@ -131,6 +202,7 @@ class ConstraintChecker:
 
     def calculate_fitness(self, schedule: List[ScheduleAssignment], input_data: ScheduleInput) -> float:
         """Calculate fitness based on unassigned subjects, unmet class requirements, and conflicts."""
+        started = time.perf_counter()
         # Count how many times each subject is scheduled
         subject_counts = {}
         for s in input_data.subjects:
@@ -147,40 +219,45 @@ class ConstraintChecker:
                 unmet_requirements += (required - scheduled)
 
         # Penalty for conflicts
+        # A pair sharing faculty or room is counted once: overlapping pairs per (faculty, day) plus
+        # pairs of different faculty per (room, day), each counted by a sorted sweep
         conflicts = 0
-        for i, a1 in enumerate(schedule):
-            slot1 = TimeSlot(a1.day, a1.startTime, a1.endTime)
-            for a2 in schedule[i+1:]:
-                slot2 = TimeSlot(a2.day, a2.startTime, a2.endTime)
-                if (a1.faculty_id == a2.faculty_id or a1.room_id == a2.room_id) and check_time_conflict(slot1, slot2):
-                    conflicts += 1
-            if check_break_conflict(slot1, input_data.break_):
+        by_faculty = defaultdict(list)
+        by_room = defaultdict(list)
+        break_hits = {}
+        for a in schedule:
+            r = a.record
+            by_faculty[(a.faculty_id, r.day)].append(r)
+            by_room[(a.room_id, r.day)].append(a)
+            hit = break_hits.get(r)
+            if hit is None:
+                hit = break_hits[r] = record_conflicts_with_breaks(r, input_data.break_)
+            if hit:
                 conflicts += 1
+        conflicts += sum(map(_overlapping_pairs, by_faculty.values()))
+        conflicts += sum(map(_overlapping_pairs_across_faculty, by_room.values()))
 
         fitness = unmet_requirements * 1000 + conflicts * 10
-        print(f"[DEBUG] Fitness: {fitness} (unmet requirements: {unmet_requirements}, conflicts: {conflicts})")
+        # Called per individual; only format the message when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Fitness: {fitness} (unmet requirements: {unmet_requirements}, conflicts: {conflicts})")
+        metrics.fitness_evaluations.observe(time.perf_counter() - started, evaluator="constraint_checker")
         return fitness
 
     def get_valid_slots(self, availability: List[TimeSlot], fixed_slots: List[TimeSlot], duration: int) -> List[TimeSlot]:
         """Filter fixed slots that are within faculty availability and match duration."""
         valid_slots = []
+        debug = logger.isEnabledFor(logging.DEBUG)
         for fixed_slot in fixed_slots:
-            slot_duration = time_to_minutes(fixed_slot.endTime) - time_to_minutes(fixed_slot.startTime)
-            if slot_duration != duration:
+            record = fixed_slot.record
+            if record.duration != duration:
                 continue
             for avail in availability:
-                if fixed_slot.day == avail.day:
-                    try:
-                        avail_start = time_to_minutes(avail.startTime)
-                        avail_end = time_to_minutes(avail.endTime)
-                        slot_start = time_to_minutes(fixed_slot.startTime)
-                        slot_end = time_to_minutes(fixed_slot.endTime)
-                        if avail_start <= slot_start and slot_end <= avail_end:
-                            valid_slots.append(fixed_slot)
-                            print(f"[DEBUG] Valid slot for {fixed_slot.day}: {fixed_slot.startTime}-{fixed_slot.endTime}")
-                            break
-                    except ValueError as e:
-                        print(f"[ERROR] Time parsing error in get_valid_slots: {e}")
+                if avail.day == fixed_slot.day and avail.record.contains(record):
+                    valid_slots.append(fixed_slot)
+                    if debug:
+                        logger.debug(f"Valid slot for {fixed_slot.day}: {fixed_slot.startTime}-{fixed_slot.endTime}")
+                    break
         return valid_slots
 
     def check_constraints(self, faculty_id: str, time_slot: TimeSlot, room_id: str, input_data: ScheduleInput) -> bool:
@@ -197,42 +274,29 @@ class ConstraintChecker:
                 break
 
         if not faculty or not subject:
-            print(f"[DEBUG] Invalid faculty_id {faculty_id} or subject not found")
+            logger.debug(f"Invalid faculty_id {faculty_id} or subject not found")
             return False
 
+        record = time_slot.record
         valid_slot = False
         for avail in faculty.availability:
-            if avail.day == time_slot.day:
-                try:
-                    avail_start = time_to_minutes(avail.startTime)
-                    avail_end = time_to_minutes(avail.endTime)
-                    slot_start = time_to_minutes(time_slot.startTime)
-                    slot_end = time_to_minutes(time_slot.endTime)
-                    if avail_start <= slot_start and slot_end <= avail_end:
-                        valid_slot = True
-                        break
-                except ValueError as e:
-                    print(f"[ERROR] Time parsing error in check_constraints: {e}")
-                    return False
+            if avail.day == time_slot.day and avail.record.contains(record):
+                valid_slot = True
+                break
         if not valid_slot:
-            print(f"[DEBUG] Slot {time_slot.startTime}-{time_slot.endTime} not in faculty {faculty_id} availability")
+            logger.debug(f"Slot {time_slot.startTime}-{time_slot.endTime} not in faculty {faculty_id} availability")
             return False
 
         if check_break_conflict(time_slot, input_data.break_):
-            print(f"[DEBUG] Slot {time_slot.startTime}-{time_slot.endTime} conflicts with break")
+            logger.debug(f"Slot {time_slot.startTime}-{time_slot.endTime} conflicts with break")
             return False
 
         if room_id not in input_data.rooms:
-            print(f"[DEBUG] Invalid room_id {room_id}")
+            logger.debug(f"Invalid room_id {room_id}")
             return False
 
-        try:
-            slot_duration = time_to_minutes(time_slot.endTime) - time_to_minutes(time_slot.startTime)
-            if slot_duration != subject.time:
-                print(f"[DEBUG] Slot duration {slot_duration} does not match subject {subject.name} time {subject.time}")
-                return False
-        except ValueError as e:
-            print(f"[ERROR] Duration check failed: {e}")
+        if record.duration != subject.time:
+            logger.debug(f"Slot duration {record.duration} does not match subject {subject.name} time {subject.time}")
             return False
 
         return True
\ No newline at end of file
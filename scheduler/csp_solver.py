@@ -0,0 +1,318 @@
+# Backtracking constraint solver for schedule generation
+# Every required class is a variable whose domain is a bitmask over its subject's
+# (faculty, slot, room) candidates. AC-3 makes the domains arc consistent once up front,
+# then a depth-first search with forward checking picks variables by MRV, breaking ties
+# with the degree-aware subject order. At every node the open classes must still have a
+# matching into distinct (room, slot) pairs, which cuts off pigeonhole dead ends early.
+# Classes of one subject go to distinct days, in day order, which mirrors the greedy
+# distribution and removes symmetric solutions.
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from model import ScheduleInput, ScheduleAssignment, TimeSlot, Subject
+from eligibility import EligibilityIndex
+from utils import record_conflicts_with_breaks, calculate_preference_score
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SOLVED = "solved"
+INFEASIBLE = "infeasible"
+TIMEOUT = "timeout"
+
+# Search nodes (or preprocessing steps) between two time-limit checks
+_CHECK_INTERVAL = 256
+
+class _Timeout(Exception):
+    pass
+
+@dataclass
+class CSPResult:
+    status: str
+    assignments: List[ScheduleAssignment] = field(default_factory=list)
+    reason: Optional[str] = None
+    nodes: int = 0
+    variables: int = 0
+    elapsed: float = 0.0
+
+    def report(self) -> Dict:
+        return {
+            "status": self.status,
+            "reason": self.reason,
+            "variables": self.variables,
+            "nodes": self.nodes,
+            "elapsed_ms": round(self.elapsed * 1000, 2),
+        }
+
+def _bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+class CSPSolver:
+    """Complete solver for the 'place every class' problem; proves infeasibility when the search is exhausted."""
+
+    def __init__(self, input_data: ScheduleInput, slots: List[TimeSlot], eligibility: EligibilityIndex, rooms: List[str], subjects: List[Subject], time_limit: Optional[float] = None, node_limit: Optional[int] = None):
+        """subjects is the static variable order (e.g. sort_subjects_by_constraints with use_degree=True).
+
+        time_limit counts from construction, so it also bounds the constraint tables and AC-3.
+        """
+        self._started = time.monotonic()
+        self._deadline = self._started + time_limit if time_limit is not None else None
+        self.input_data = input_data
+        self.slots = slots
+        self.subjects = subjects
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.nodes = 0
+
+        break_hits = {}
+        # Candidate tables per subject: (faculty, slot id, room, preference score) and the day of each
+        self.candidates: List[List[Tuple]] = []
+        self.days: List[List[int]] = []
+        self.value_order: List[List[int]] = []
+        for subject in subjects:
+            candidates = []
+            subject_rooms = [subject.room_id] if subject.room_id else rooms
+            for faculty in subject.faculty:
+                for slot_id in eligibility.slot_ids(subject.name, faculty.id):
+                    record = slots[slot_id].record
+                    hit = break_hits.get(record)
+                    if hit is None:
+                        hit = break_hits[record] = record_conflicts_with_breaks(record, input_data.break_)
+                    if hit:
+                        continue
+                    score = calculate_preference_score(slots[slot_id], getattr(subject, 'preferred_slots', []), getattr(faculty, 'preferred_slots', []))
+                    for room_id in subject_rooms:
+                        candidates.append((faculty, slot_id, room_id, score))
+            self.candidates.append(candidates)
+            self.days.append([slots[c[1]].record.day for c in candidates])
+            # Preferred slots first, then slot order
+            self.value_order.append(sorted(range(len(candidates)), key=lambda a, cs=candidates: (-cs[a][3], cs[a][1])))
+
+        # Variables: one per required class, (subject index, class number)
+        self.variables: List[Tuple[int, int]] = [(s, k) for s, subject in enumerate(subjects) for k in range(subject.no_of_classes_per_week)]
+
+    def _check_time(self, step: int):
+        """Raise _Timeout every _CHECK_INTERVAL steps once the deadline has passed."""
+        if step % _CHECK_INTERVAL == 0 and self._deadline is not None and time.monotonic() >= self._deadline:
+            raise _Timeout()
+
+    def _build_constraints(self):
+        n = len(self.subjects)
+        # Per subject: values grouped by (slot, faculty) and (slot, room), to find clashes without pairwise loops
+        by_faculty: List[Dict[Tuple[int, str], int]] = []
+        by_room: List[Dict[Tuple[int, str], int]] = []
+        for s in range(n):
+            faculty_masks, room_masks = {}, {}
+            for a, (faculty, slot_id, room_id, _) in enumerate(self.candidates[s]):
+                faculty_masks[(slot_id, faculty.id)] = faculty_masks.get((slot_id, faculty.id), 0) | (1 << a)
+                room_masks[(slot_id, room_id)] = room_masks.get((slot_id, room_id), 0) | (1 << a)
+            by_faculty.append(faculty_masks)
+            by_room.append(room_masks)
+        # Two classes never share a (slot, room) pair; these keys drive the matching check
+        self.room_keys = by_room
+        self.key_masks = [list(masks.items()) for masks in by_room]
+
+        # Slots overlapping each slot (including itself)
+        used_slots = sorted({c[1] for cands in self.candidates for c in cands})
+        per_day: Dict[int, List[int]] = {}
+        for slot_id in used_slots:
+            per_day.setdefault(self.slots[slot_id].record.day, []).append(slot_id)
+        overlapping: Dict[int, List[int]] = {}
+        for day_slots in per_day.values():
+            for slot_id in day_slots:
+                record = self.slots[slot_id].record
+                overlapping[slot_id] = [o for o in day_slots if record.start < self.slots[o].record.end and self.slots[o].record.start < record.end]
+
+        # conflicts[s][a][t]: values of subject t that clash with value a of subject s
+        self.full: List[int] = [(1 << len(self.candidates[s])) - 1 for s in range(n)]
+        self.conflicts: List[List[List[int]]] = []
+        step = 0
+        for s in range(n):
+            rows = []
+            for faculty, slot_id, room_id, _ in self.candidates[s]:
+                step += 1
+                self._check_time(step)
+                row = []
+                for t in range(n):
+                    clash = 0
+                    for other in overlapping[slot_id]:
+                        clash |= by_faculty[t].get((other, faculty.id), 0) | by_room[t].get((other, room_id), 0)
+                    row.append(clash)
+                rows.append(row)
+            self.conflicts.append(rows)
+
+        # Same-subject ordering: later classes on strictly later days
+        self.later: List[List[int]] = []
+        self.earlier: List[List[int]] = []
+        for s in range(n):
+            day_masks: Dict[int, int] = {}
+            for a, day in enumerate(self.days[s]):
+                day_masks[day] = day_masks.get(day, 0) | (1 << a)
+            later = [sum(m for d, m in day_masks.items() if d > day) for day in self.days[s]]
+            earlier = [sum(m for d, m in day_masks.items() if d < day) for day in self.days[s]]
+            self.later.append(later)
+            self.earlier.append(earlier)
+
+    def _allowed(self, x: int, a: int, y: int) -> int:
+        """Values of variable y compatible with variable x taking value a."""
+        s, k = self.variables[x]
+        t, m = self.variables[y]
+        if s == t:
+            return self.later[s][a] if m > k else self.earlier[s][a]
+        return self.full[t] & ~self.conflicts[s][a][t]
+
+    def _precheck(self) -> Optional[str]:
+        for s, subject in enumerate(self.subjects):
+            required = subject.no_of_classes_per_week
+            if not required:
+                continue
+            if not self.candidates[s]:
+                return f"{subject.name} has no eligible (faculty, slot) pair outside the breaks"
+            days = len(set(self.days[s]))
+            if days < required:
+                return f"{subject.name} needs {required} classes on distinct days but only {days} day(s) have eligible slots"
+        return None
+
+    def _ac3(self, domains: List[int]) -> Optional[str]:
+        """Make every arc consistent; return the reason when a domain is wiped out."""
+        n = len(self.variables)
+        queue = deque()
+        for x in range(n):
+            self._check_time(x)
+            queue.extend((x, y) for y in range(n) if x != y)
+        queued = set(queue)
+        step = 0
+        while queue:
+            step += 1
+            self._check_time(step)
+            x, y = queue.popleft()
+            queued.discard((x, y))
+            domain = domains[x]
+            revised = domain
+            for a in _bits(domain):
+                if not self._allowed(x, a, y) & domains[y]:
+                    revised &= ~(1 << a)
+            if revised == domain:
+                continue
+            domains[x] = revised
+            if not revised:
+                s, k = self.variables[x]
+                return f"{self.subjects[s].name} class {k + 1} has no slot left that is compatible with the other classes"
+            for z in range(n):
+                if z != x and z != y and (z, x) not in queued:
+                    queue.append((z, x))
+                    queued.add((z, x))
+        return None
+
+    def solve(self) -> CSPResult:
+        started = self._started
+        result = CSPResult(status=INFEASIBLE, variables=len(self.variables))
+
+        reason = self._precheck()
+        try:
+            if reason is None:
+                self._build_constraints()
+                domains = [self.full[s] for s, _ in self.variables]
+                reason = self._ac3(domains)
+            unassigned = list(range(len(self.variables)))
+            match: Dict[int, Tuple[int, str]] = {}
+            if reason is None and not self._match(domains, unassigned, match):
+                reason = f"the {len(self.variables)} classes need more distinct room slots than their candidates offer"
+            if reason is None:
+                assignment: Dict[int, int] = {}
+                if self._search(domains, unassigned, assignment, match):
+                    result.status = SOLVED
+                    result.assignments = self._build_assignments(assignment)
+                else:
+                    reason = "no placement satisfies every class without clashes"
+        except _Timeout:
+            result.status = TIMEOUT
+            reason = "search budget exhausted before a solution or proof was found"
+        result.reason = reason
+        result.nodes = self.nodes
+        result.elapsed = time.monotonic() - started
+        logger.info(f"CSP {result.status} after {result.nodes} nodes in {result.elapsed:.3f}s" + (f": {reason}" if reason else ""))
+        return result
+
+    def _match(self, domains: List[int], unassigned: List[int], match: Dict[int, Tuple[int, str]]) -> bool:
+        """Extend match (class -> (slot, room)) to every unassigned class; False when no such matching exists."""
+        owner = {key: var for var, key in match.items()}
+        for var in unassigned:
+            if var not in match and not self._augment(var, domains, match, owner, set()):
+                return False
+        return True
+
+    def _augment(self, var: int, domains: List[int], match: Dict[int, Tuple[int, str]], owner: Dict[Tuple[int, str], int], seen: set) -> bool:
+        domain = domains[var]
+        for key, mask in self.key_masks[self.variables[var][0]]:
+            if domain & mask and key not in seen:
+                seen.add(key)
+                other = owner.get(key)
+                if other is None or self._augment(other, domains, match, owner, seen):
+                    match[var] = key
+                    owner[key] = var
+                    return True
+        return False
+
+    def _search(self, domains: List[int], unassigned: List[int], assignment: Dict[int, int], match: Dict[int, Tuple[int, str]]) -> bool:
+        if not unassigned:
+            return True
+        self.nodes += 1
+        self._check_time(self.nodes)
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise _Timeout()
+
+        # MRV; variable indices follow the (degree-aware) subject order, which breaks ties
+        var = min(unassigned, key=lambda v: (_popcount(domains[v]), v))
+        rest = [v for v in unassigned if v != var]
+        s, _ = self.variables[var]
+        domain = domains[var]
+        for a in self.value_order[s]:
+            if not domain >> a & 1:
+                continue
+            # Forward checking
+            pruned = list(domains)
+            pruned[var] = 1 << a
+            for y in rest:
+                pruned[y] = domains[y] & self._allowed(var, a, y)
+                if not pruned[y]:
+                    break
+            else:
+                # Keep the parent's matching where it is still valid and repair the rest
+                child_match = {v: key for v, key in match.items() if v != var and pruned[v] & self.room_keys[self.variables[v][0]][key]}
+                if not self._match(pruned, rest, child_match):
+                    continue
+                assignment[var] = a
+                if self._search(pruned, rest, assignment, child_match):
+                    return True
+                del assignment[var]
+        return False
+
+    def _build_assignments(self, assignment: Dict[int, int]) -> List[ScheduleAssignment]:
+        assignments = []
+        for var in sorted(assignment):
+            s, _ = self.variables[var]
+            subject = self.subjects[s]
+            faculty, slot_id, room_id, score = self.candidates[s][assignment[var]]
+            slot = self.slots[slot_id]
+            assignments.append(ScheduleAssignment(
+                subject_name=subject.name,
+                faculty_id=faculty.id,
+                faculty_name=faculty.name,
+                day=slot.day,
+                startTime=slot.startTime,
+                endTime=slot.endTime,
+                room_id=room_id,
+                is_special=getattr(subject, 'is_special', False),
+                priority_score=score
+            ))
+        return assignments
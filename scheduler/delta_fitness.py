@@ -0,0 +1,96 @@
+# Incremental (delta) fitness for GA individuals
+# Each individual carries a FitnessState with its subject counts, per-resource slots and
+# conflict count, so adding or removing one assignment updates the fitness in time
+# proportional to the assignments sharing its faculty/room and day.
+from collections import Counter
+from typing import Dict, List, Tuple, Iterable
+from model import ScheduleInput, ScheduleAssignment, TimeSlot, SlotRecord
+from utils import record_conflicts_with_breaks
+from constraints import count_overlaps
+
+class FitnessContext:
+    """Request-wide constants of the GA fitness, shared by every FitnessState."""
+
+    def __init__(self, input_data: ScheduleInput, assignable_slots: List[TimeSlot]):
+        self.breaks = input_data.break_
+        # Requirements per subject name; duplicated names are penalized once per entry, like the scalar loop
+        self.requirements: Dict[str, List[int]] = {}
+        for subject in input_data.subjects:
+            self.requirements.setdefault(subject.name, []).append(subject.no_of_classes_per_week)
+        self.n_assignable = len(assignable_slots)
+        self._break_hits: Dict[SlotRecord, bool] = {}
+
+    def break_hit(self, record: SlotRecord) -> bool:
+        hit = self._break_hits.get(record)
+        if hit is None:
+            hit = self._break_hits[record] = record_conflicts_with_breaks(record, self.breaks)
+        return hit
+
+    def requirement_penalty(self, subject_name: str, count: int) -> int:
+        return sum(abs(count - required) for required in self.requirements[subject_name]) * 1000
+
+class FitnessState:
+    """Running terms of GeneticAlgorithm._calculate_fitness for one individual."""
+
+    def __init__(self, context: FitnessContext):
+        self.context = context
+        self.subject_counts: Dict[str, int] = {name: 0 for name in context.requirements}
+        self.requirement_penalty = sum(context.requirement_penalty(name, 0) for name in context.requirements)
+        self.faculty_slots: Dict[Tuple[str, int], List[SlotRecord]] = {}
+        self.room_slots: Dict[Tuple[str, int], List[SlotRecord]] = {}
+        self.slot_usage: Counter = Counter()
+        self.conflicts = 0
+
+    @classmethod
+    def from_assignments(cls, context: FitnessContext, assignments: Iterable[ScheduleAssignment]) -> "FitnessState":
+        state = cls(context)
+        for assignment in assignments:
+            state.add(assignment)
+        return state
+
+    def fitness(self) -> Tuple[int]:
+        unfilled_slots = self.context.n_assignable - len(self.slot_usage)
+        return (self.requirement_penalty + self.conflicts * 100 + unfilled_slots * 5000,)
+
+    def _count(self, subject_name: str, delta: int):
+        count = self.subject_counts[subject_name]
+        self.requirement_penalty += self.context.requirement_penalty(subject_name, count + delta) - self.context.requirement_penalty(subject_name, count)
+        self.subject_counts[subject_name] = count + delta
+
+    def add(self, assignment: ScheduleAssignment):
+        record = assignment.record
+        self._count(assignment.subject_name, 1)
+        faculty_day = self.faculty_slots.setdefault((assignment.faculty_id, record.day), [])
+        room_day = self.room_slots.setdefault((assignment.room_id, record.day), [])
+        self.conflicts += count_overlaps(record, faculty_day) + count_overlaps(record, room_day)
+        if self.context.break_hit(record):
+            self.conflicts += 1
+        faculty_day.append(record)
+        room_day.append(record)
+        self.slot_usage[record] += 1
+
+    def remove(self, assignment: ScheduleAssignment):
+        record = assignment.record
+        self._count(assignment.subject_name, -1)
+        faculty_day = self.faculty_slots[(assignment.faculty_id, record.day)]
+        room_day = self.room_slots[(assignment.room_id, record.day)]
+        faculty_day.remove(record)
+        room_day.remove(record)
+        self.conflicts -= count_overlaps(record, faculty_day) + count_overlaps(record, room_day)
+        if self.context.break_hit(record):
+            self.conflicts -= 1
+        self.slot_usage[record] -= 1
+        if not self.slot_usage[record]:
+            del self.slot_usage[record]
+
+    def __deepcopy__(self, memo) -> "FitnessState":
+        # Shares the context; only the per-individual containers are copied
+        clone = FitnessState.__new__(FitnessState)
+        clone.context = self.context
+        clone.subject_counts = dict(self.subject_counts)
+        clone.requirement_penalty = self.requirement_penalty
+        clone.faculty_slots = {key: list(records) for key, records in self.faculty_slots.items()}
+        clone.room_slots = {key: list(records) for key, records in self.room_slots.items()}
+        clone.slot_usage = Counter(self.slot_usage)
+        clone.conflicts = self.conflicts
+        return clone
@@ -0,0 +1,59 @@
+# Precomputed (subject, faculty) -> candidate slot lookup shared by all scheduling engines.
+# Built once per request so the engines never re-filter slots against availability in their loops.
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Iterable
+from model import Subject, TimeSlot, SlotRecord
+import metrics
+import time
+
+class EligibilityIndex:
+    """Maps (subject name, faculty id) to the ids of slots matching the subject duration and faculty availability.
+
+    cache may be shared between indexes built over the same slot list (e.g. the rooms of a batch
+    with one slot grid); it maps (duration, availability) to the filtered slot ids.
+    """
+
+    def __init__(self, subjects: Iterable[Subject], slots: List[TimeSlot], cache: Optional[Dict[Tuple[int, Tuple[SlotRecord, ...]], Tuple[int, ...]]] = None):
+        started = time.perf_counter()
+        self.slots = list(slots)
+        self._pairs: Dict[Tuple[str, str], Tuple[int, ...]] = {}
+        self._by_day: Dict[Tuple[str, str], Dict[str, List[TimeSlot]]] = {}
+
+        slot_ids_by_duration = defaultdict(list)
+        for slot_id, slot in enumerate(self.slots):
+            slot_ids_by_duration[slot.record.duration].append(slot_id)
+
+        # Faculty usually repeat across subjects with identical availability, so filter each combination once
+        filtered: Dict[Tuple[int, Tuple[SlotRecord, ...]], Tuple[int, ...]] = {} if cache is None else cache
+        for subject in subjects:
+            candidates = slot_ids_by_duration.get(subject.time, [])
+            for faculty in subject.faculty:
+                availability = tuple(avail.record for avail in faculty.availability)
+                key = (subject.time, availability)
+                if key not in filtered:
+                    filtered[key] = tuple(
+                        slot_id for slot_id in candidates
+                        if any(avail.contains(self.slots[slot_id].record) for avail in availability)
+                    )
+                self._pairs[(subject.name, faculty.id)] = filtered[key]
+        metrics.eligibility_build.observe(time.perf_counter() - started)
+
+    def slot_ids(self, subject_name: str, faculty_id: str) -> Tuple[int, ...]:
+        """Candidate slot ids in slot order; empty if the pair is unknown."""
+        return self._pairs.get((subject_name, faculty_id), ())
+
+    def slots_for(self, subject_name: str, faculty_id: str) -> List[TimeSlot]:
+        return [self.slots[slot_id] for slot_id in self.slot_ids(subject_name, faculty_id)]
+
+    def slots_by_day(self, subject_name: str, faculty_id: str) -> Dict[str, List[TimeSlot]]:
+        """Candidate slots grouped per day and sorted by start time."""
+        key = (subject_name, faculty_id)
+        grouped = self._by_day.get(key)
+        if grouped is None:
+            grouped = {}
+            for slot in self.slots_for(subject_name, faculty_id):
+                grouped.setdefault(slot.day, []).append(slot)
+            for day_slots in grouped.values():
+                day_slots.sort(key=lambda s: s.record.start)
+            self._by_day[key] = grouped
+        return grouped
@@ -0,0 +1,238 @@
+# Fast feasibility bounds for schedule inputs
+# Runs before any engine: counts the eligible (faculty, slot) pairs of every subject and checks
+# that all required classes fit into distinct (room, slot) pairs (a max-flow bound). Both are
+# necessary conditions only, so "feasible" means "not ruled out"; a failed bound proves that no
+# engine can place every class. At most one class of a subject per day is how the greedy and CSP
+# engines place classes, not an input constraint, so that bound is only reported as a warning.
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from model import ScheduleInput, TimeSlot
+from eligibility import EligibilityIndex
+from utils import record_conflicts_with_breaks
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+@dataclass
+class FeasibilityResult:
+    feasible: bool
+    subjects: Dict[str, Dict] = field(default_factory=dict)
+    capacity: Dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def impossible_subjects(self) -> List[str]:
+        return [name for name, info in self.subjects.items() if info["reasons"]]
+
+    @property
+    def reason(self) -> Optional[str]:
+        """The first violated bound, for one-line messages."""
+        for name, info in self.subjects.items():
+            if info["reasons"]:
+                return f"{name} {info['reasons'][0]}"
+        bottleneck = self.capacity.get("bottleneck")
+        return bottleneck["reason"] if bottleneck else None
+
+    def report(self) -> Dict:
+        return {
+            "feasible": self.feasible,
+            "impossible_subjects": self.impossible_subjects,
+            "subjects": self.subjects,
+            "capacity": self.capacity,
+            "warnings": self.warnings,
+            "elapsed_ms": round(self.elapsed * 1000, 2),
+        }
+
+class _FlowNetwork:
+    """Dinic max flow on integer nodes."""
+
+    def __init__(self, size: int):
+        self.graph: List[List[int]] = [[] for _ in range(size)]
+        self.to: List[int] = []
+        self.cap: List[int] = []
+
+    def add_edge(self, u: int, v: int, capacity: int) -> int:
+        """Add u -> v and return the edge id; its flow is the residual capacity of id ^ 1."""
+        edge = len(self.to)
+        self.graph[u].append(edge)
+        self.to.append(v)
+        self.cap.append(capacity)
+        self.graph[v].append(len(self.to))
+        self.to.append(u)
+        self.cap.append(0)
+        return edge
+
+    def _levels(self, source: int, sink: int) -> Optional[List[int]]:
+        level = [-1] * len(self.graph)
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for e in self.graph[u]:
+                if self.cap[e] and level[self.to[e]] < 0:
+                    level[self.to[e]] = level[u] + 1
+                    queue.append(self.to[e])
+        return level if level[sink] >= 0 else None
+
+    def _push(self, u: int, sink: int, amount: int, level: List[int], cursor: List[int]) -> int:
+        if u == sink:
+            return amount
+        edges = self.graph[u]
+        while cursor[u] < len(edges):
+            e = edges[cursor[u]]
+            v = self.to[e]
+            if self.cap[e] and level[v] == level[u] + 1:
+                pushed = self._push(v, sink, min(amount, self.cap[e]), level, cursor)
+                if pushed:
+                    self.cap[e] -= pushed
+                    self.cap[e ^ 1] += pushed
+                    return pushed
+            cursor[u] += 1
+        return 0
+
+    def max_flow(self, source: int, sink: int) -> int:
+        flow = 0
+        while True:
+            level = self._levels(source, sink)
+            if level is None:
+                return flow
+            cursor = [0] * len(self.graph)
+            while True:
+                pushed = self._push(source, sink, float("inf"), level, cursor)
+                if not pushed:
+                    break
+                flow += pushed
+
+    def reachable(self, source: int) -> set:
+        """Nodes reachable from source in the residual network (the source side of a min cut)."""
+        seen = {source}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for e in self.graph[u]:
+                if self.cap[e] and self.to[e] not in seen:
+                    seen.add(self.to[e])
+                    queue.append(self.to[e])
+        return seen
+
+def check_feasibility(input_data: ScheduleInput, slots: List[TimeSlot], eligibility: EligibilityIndex, rooms: List[str]) -> FeasibilityResult:
+    """Per-subject eligibility counts plus a room-slot capacity bound; cheap enough to run on every request."""
+    started = time.monotonic()
+    break_hits = {}
+    subjects: Dict[str, Dict] = {}
+    # Eligible slot ids per subject day, for the capacity bound
+    day_slots: List[Dict[str, set]] = []
+    for subject in input_data.subjects:
+        required = subject.no_of_classes_per_week
+        pairs = 0
+        by_day: Dict[str, set] = {}
+        for faculty in subject.faculty:
+            for slot_id in eligibility.slot_ids(subject.name, faculty.id):
+                record = slots[slot_id].record
+                hit = break_hits.get(record)
+                if hit is None:
+                    hit = break_hits[record] = record_conflicts_with_breaks(record, input_data.break_)
+                if not hit:
+                    pairs += 1
+                    by_day.setdefault(slots[slot_id].day, set()).add(slot_id)
+        reasons, warnings = [], []
+        if required > 0:
+            if not subject.faculty:
+                reasons.append("has no faculty assigned")
+            elif not pairs:
+                reasons.append(f"has no faculty available for a {subject.time}-minute slot outside the breaks")
+            elif len(by_day) < required:
+                warnings.append(f"needs {required} classes but only {len(by_day)} day(s) have eligible slots, so some days get more than one")
+        subjects[subject.name] = {
+            "required": required,
+            "eligible_pairs": pairs,
+            "eligible_slots": sum(len(ids) for ids in by_day.values()),
+            "eligible_days": len(by_day),
+            "reasons": reasons,
+            "warnings": warnings,
+        }
+        day_slots.append(by_day)
+
+    capacity = _capacity_bound(input_data, day_slots, rooms, per_day=False)
+    feasible = capacity["max_placeable"] == capacity["required_classes"] and not any(info["reasons"] for info in subjects.values())
+    warnings = [f"{name} {warning}" for name, info in subjects.items() for warning in info["warnings"]]
+    if feasible:
+        per_day = _capacity_bound(input_data, day_slots, rooms, per_day=True)
+        capacity["one_class_per_day"] = {key: per_day[key] for key in ("max_placeable", "bottleneck")}
+        if per_day["bottleneck"]:
+            warnings.append(f"with at most one class of a subject per day, {per_day['bottleneck']['reason']}")
+    result = FeasibilityResult(
+        feasible=feasible,
+        subjects=subjects,
+        capacity=capacity,
+        elapsed=time.monotonic() - started,
+        warnings=warnings
+    )
+    if not result.feasible:
+        logger.warning(f"Input is infeasible: {result.reason} (at most {capacity['max_placeable']}/{capacity['required_classes']} classes fit)")
+    elif warnings:
+        logger.info(f"Feasibility warning: {warnings[0]}")
+    return result
+
+def _capacity_bound(input_data: ScheduleInput, day_slots: List[Dict[str, set]], rooms: List[str], per_day: bool) -> Dict:
+    """Max flow source -> subject (required) -> (room, slot) (1) -> sink.
+
+    per_day adds a subject day layer of capacity 1 between the subject and its room slots.
+    """
+    nodes: Dict[Tuple, int] = {}
+
+    def node(key: Tuple) -> int:
+        if key not in nodes:
+            nodes[key] = len(nodes)
+        return nodes[key]
+
+    source, sink = node(("source",)), node(("sink",))
+    edges = []
+    demands = {}
+    for s, subject in enumerate(input_data.subjects):
+        required = subject.no_of_classes_per_week
+        if required <= 0:
+            continue
+        demands[s] = len(edges)
+        edges.append((source, node(("subject", s)), required))
+        for day, slot_ids in day_slots[s].items():
+            via = node(("subject", s))
+            if per_day:
+                edges.append((via, node(("day", s, day)), 1))
+                via = node(("day", s, day))
+            for slot_id in slot_ids:
+                for room_id in rooms:
+                    edges.append((via, node(("slot", room_id, slot_id)), 1))
+    room_slots = [key for key in nodes if key[0] == "slot"]
+    network = _FlowNetwork(len(nodes))
+    edge_ids = [network.add_edge(u, v, capacity) for u, v, capacity in edges]
+    for key in room_slots:
+        network.add_edge(nodes[key], sink, 1)
+
+    required_classes = sum(max(0, subject.no_of_classes_per_week) for subject in input_data.subjects)
+    max_placeable = network.max_flow(source, sink)
+    bottleneck = None
+    if max_placeable < required_classes:
+        # Subjects on the source side of the min cut cannot all be served by the room slots they share
+        cut = network.reachable(source)
+        group = [s for s in demands if nodes[("subject", s)] in cut]
+        names = [input_data.subjects[s].name for s in group]
+        required = sum(input_data.subjects[s].no_of_classes_per_week for s in group)
+        placeable = sum(network.cap[edge_ids[demands[s]] ^ 1] for s in group)
+        bottleneck = {
+            "subjects": names,
+            "required": required,
+            "max_placeable": placeable,
+            "reason": f"{', '.join(names)} {'need' if len(names) > 1 else 'needs'} {required} classes but at most {placeable} fit into the room slots they can use",
+        }
+    return {
+        "required_classes": required_classes,
+        "max_placeable": max_placeable,
+        "room_slots": len(room_slots),
+        "bottleneck": bottleneck,
+    }
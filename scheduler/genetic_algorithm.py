@@ -371,42 +371,112 @@
 #         best = deap.tools.selBest(pop, k=1)[0]
 #         logger.info("Genetic Algorithm completed.")
 #         return best, best.fitness.values[0]
+import array
 import random
-from typing import List, Callable, Tuple
+import time
+from operator import attrgetter
+from typing import List, Callable, Tuple, Optional, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
 import deap.base
 import deap.creator
 import deap.tools
 from collections import defaultdict
-from model import ScheduleInput, ScheduleAssignment, TimeSlot
-from utils import check_time_conflict, check_break_conflict, time_to_minutes
+from model import ScheduleInput, ScheduleAssignment, TimeSlot, SlotRecord
+from utils import check_time_conflict, check_break_conflict, record_conflicts_with_breaks
+from occupancy import SlotGrid, OccupancyIndex
+from eligibility import EligibilityIndex
+from vectorized_fitness import BatchFitnessEvaluator
+from delta_fitness import FitnessContext, FitnessState
+from chromosome import ChromosomeCodec
+from constraints import count_overlaps
+import metrics
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Define the fitness and individual types for DEAP
-deap.creator.create("FitnessMin", deap.base.Fitness, weights=(-1.0,))
-deap.creator.create("Individual", list, fitness=deap.creator.FitnessMin)
+# Fitness evaluation modes: per-individual Python, batched NumPy, or both with a mismatch check
+FITNESS_MODES = ("scalar", "vectorized", "crosscheck")
+
+# Individual encodings: lists of ScheduleAssignment, or compact integer gene arrays (see chromosome.py)
+REPRESENTATIONS = ("assignments", "compact")
+
+# Individuals created or evaluated between two checks of a run's deadline
+DEADLINE_CHUNK = 8
+
+def register_deap_types():
+    """Define the fitness and individual types for DEAP, once per process.
+
+    deap.creator.create replaces an existing class (with a warning), which would leave individuals
+    created before a re-import or module reload unpicklable, so types that exist are kept.
+    """
+    if not hasattr(deap.creator, "FitnessMin"):
+        deap.creator.create("FitnessMin", deap.base.Fitness, weights=(-1.0,))
+    if not hasattr(deap.creator, "Individual"):
+        deap.creator.create("Individual", list, fitness=deap.creator.FitnessMin)
+    if not hasattr(deap.creator, "CompactIndividual"):
+        deap.creator.create("CompactIndividual", array.array, typecode="i", fitness=deap.creator.FitnessMin)
+
+# At import, so pool workers can unpickle individuals as soon as they load this module
+register_deap_types()
+
+# Per-process GA used by pool workers; built once by _init_worker
+_worker_ga = None
+
+def _init_worker(ga_kwargs):
+    global _worker_ga
+    _worker_ga = GeneticAlgorithm(**ga_kwargs)
+
+def _worker_call(method_name, item):
+    return getattr(_worker_ga, method_name)(item)
 
 class GeneticAlgorithm:
-    def __init__(self, input_data: ScheduleInput, fixed_slots: List[TimeSlot], pop_size: int = 100, generations: int = 50, fixed_room_id: str = "R1", conflict_checker: Callable = None):
+    def __init__(self, input_data: ScheduleInput, fixed_slots: List[TimeSlot], pop_size: int = 100, generations: int = 50, fixed_room_id: str = "R1", conflict_checker: Callable = None, eligibility: EligibilityIndex = None, fitness_mode: str = "scalar", workers: int = 1, seed: Optional[int] = None, incremental: bool = True, representation: str = "assignments"):
         self.input_data = input_data
         self.fixed_slots = fixed_slots
         self.pop_size = pop_size
         self.generations = generations
         self.fixed_room_id = fixed_room_id
         self.conflict_checker = conflict_checker
+        if fitness_mode not in FITNESS_MODES:
+            raise ValueError(f"Invalid fitness_mode: {fitness_mode}. Expected one of {FITNESS_MODES}")
+        self.fitness_mode = fitness_mode
+        # With incremental on, crossover/mutation keep a FitnessState per individual and offspring
+        # are re-scored from it; fitness_mode is then only used for individuals without a state
+        self.incremental = incremental
+        if representation not in REPRESENTATIONS:
+            raise ValueError(f"Invalid representation: {representation}. Expected one of {REPRESENTATIONS}")
+        self.representation = representation
+        self.workers = max(1, workers)
+        self.seed = seed
+        # Runs share the process with other requests (API threads), so they never touch the global RNG
+        self.rng = random.Random(seed)
+        self._executor = None
+        self.fitness_history: List[float] = []
+        self.generations_run = 0
+        self.stop_reason = None
         self.toolbox = deap.base.Toolbox()
         self.assignable_slots = self._get_assignable_slots()
+        self.grid = SlotGrid.from_slots(self.assignable_slots)
+        # A caller-supplied index must be built over the same assignable slots
+        self.eligibility = eligibility or EligibilityIndex(input_data.subjects, self.assignable_slots)
+        self.batch_evaluator = BatchFitnessEvaluator(input_data, self.assignable_slots) if fitness_mode != "scalar" else None
+        self.fitness_context = FitnessContext(input_data, self.assignable_slots)
+        self.codec = ChromosomeCodec(input_data, self.assignable_slots, self.eligibility, fixed_room_id, self.grid, conflict_checker, rng=self.rng) if representation == "compact" else None
+        # Workers rebuild an equivalent single-process GA from these arguments
+        self._worker_kwargs = dict(
+            input_data=input_data, fixed_slots=fixed_slots, pop_size=pop_size, generations=generations,
+            fixed_room_id=fixed_room_id, conflict_checker=conflict_checker, eligibility=self.eligibility,
+            incremental=incremental, representation=representation,
+        )
         self._setup_ga()
 
     def _get_assignable_slots(self) -> List[TimeSlot]:
         """Filter out slots that overlap with breaks and return assignable slots."""
         assignable_slots = []
         for slot in self.fixed_slots:
-            slot_obj = TimeSlot(day=slot.day, startTime=slot.startTime, endTime=slot.endTime)
-            if check_break_conflict(slot_obj, self.input_data.break_):
+            if record_conflicts_with_breaks(slot.record, self.input_data.break_):
                 logger.debug(f"Excluding slot {slot.day} {slot.startTime}-{slot.endTime} due to break conflict")
                 continue
             assignable_slots.append(slot)
@@ -414,22 +484,17 @@ class GeneticAlgorithm:
         return assignable_slots
 
     def _get_slot_duration(self, slot: TimeSlot) -> int:
-        """Calculate the duration of a slot in minutes with error handling."""
-        try:
-            slot_duration = time_to_minutes(slot.endTime) - time_to_minutes(slot.startTime)
-            if slot_duration <= 0:
-                logger.error(f"Invalid slot duration for {slot.day} {slot.startTime}-{slot.endTime}: {slot_duration} minutes")
-                return -1
-            return slot_duration
-        except ValueError as e:
-            logger.error(f"Failed to calculate slot duration for {slot.day} {slot.startTime}-{slot.endTime}: {e}")
+        """Calculate the duration of a slot in minutes, or -1 for an empty/inverted slot."""
+        slot_duration = slot.record.duration
+        if slot_duration <= 0:
+            logger.error(f"Invalid slot duration for {slot.day} {slot.startTime}-{slot.endTime}: {slot_duration} minutes")
             return -1
+        return slot_duration
 
     def _create_individual(self) -> List[ScheduleAssignment]:
         """Create an individual by randomly scheduling subjects within faculty availability."""
         schedule = []
-        used_slots_per_faculty = defaultdict(list)
-        used_slots_per_room = defaultdict(list)
+        occupancy = OccupancyIndex(self.grid)
         subject_counts = {subject.name: 0 for subject in self.input_data.subjects}
 
         # Create a list of all possible assignments
@@ -438,34 +503,15 @@ class GeneticAlgorithm:
             if subject_counts.get(subject.name, 0) >= subject.no_of_classes_per_week:
                 continue
             for faculty in subject.faculty:
-                valid_slots = []
-                for slot in self.assignable_slots:
-                    slot_duration = self._get_slot_duration(slot)
-                    if slot_duration != subject.time:
-                        continue
-                    for avail in faculty.availability:
-                        if slot.day == avail.day or avail.day == "ALL_DAYS":
-                            try:
-                                avail_start = time_to_minutes(avail.startTime)
-                                avail_end = time_to_minutes(avail.endTime)
-                                slot_start = time_to_minutes(slot.startTime)
-                                slot_end = time_to_minutes(slot.endTime)
-                                if avail_start <= slot_start and slot_end <= avail_end:
-                                    valid_slots.append(slot)
-                                    break
-                            except ValueError as e:
-                                logger.error(f"Time parsing error in _create_individual for faculty {faculty.id}: {e}")
-                                continue
-                for slot in valid_slots:
+                for slot in self.eligibility.slots_for(subject.name, faculty.id):
                     possible_assignments.append((subject, faculty, slot))
 
         # Randomly assign subjects up to no_of_classes_per_week
-        random.shuffle(possible_assignments)
+        self.rng.shuffle(possible_assignments)
         for subject, faculty, slot in possible_assignments:
             if subject_counts.get(subject.name, 0) >= subject.no_of_classes_per_week:
                 continue
-            if any(slot.day == s.day and check_time_conflict(slot, s)
-                   for s in used_slots_per_faculty[faculty.id] + used_slots_per_room[self.fixed_room_id]):
+            if not occupancy.is_free(faculty.id, self.fixed_room_id, slot.record):
                 continue
             if self.conflict_checker and not self.conflict_checker(faculty.id, slot, self.fixed_room_id, self.input_data):
                 continue
@@ -480,22 +526,38 @@ class GeneticAlgorithm:
                 room_id=self.fixed_room_id
             )
             schedule.append(assignment)
-            used_slots_per_faculty[faculty.id].append(slot)
-            used_slots_per_room[self.fixed_room_id].append(slot)
+            occupancy.occupy(faculty.id, self.fixed_room_id, slot.record)
             subject_counts[subject.name] += 1
             logger.debug(f"Assigned {subject.name} to {faculty.name} at {slot.day} {slot.startTime}-{slot.endTime}")
 
-        logger.info(f"Individual created with {len(schedule)} assignments")
+        logger.debug(f"Individual created with {len(schedule)} assignments")
         return schedule
 
     def _setup_ga(self):
         """Set up the genetic algorithm toolbox."""
-        self.toolbox.register("individual", deap.tools.initIterate, deap.creator.Individual, self._create_individual)
+        if self.representation == "compact":
+            self.toolbox.register("individual", deap.tools.initIterate, deap.creator.CompactIndividual, self.codec.random_genes)
+            self.toolbox.register("evaluate", self.codec.fitness)
+            self.toolbox.register("mate", self.codec.crossover)
+            self.toolbox.register("mutate", self.codec.mutate, indpb=0.2)
+        else:
+            self.toolbox.register("individual", deap.tools.initIterate, deap.creator.Individual, self._create_individual)
+            self.toolbox.register("evaluate", self._calculate_fitness)
+            self.toolbox.register("mate", self._crossover)
+            self.toolbox.register("mutate", self._mutate, indpb=0.2)
         self.toolbox.register("population", self._valid_population)
-        self.toolbox.register("evaluate", self._calculate_fitness)
-        self.toolbox.register("mate", self._crossover)
-        self.toolbox.register("mutate", self._mutate, indpb=0.2)
-        self.toolbox.register("select", deap.tools.selTournament, tournsize=3)
+        self.toolbox.register("select", self._select_tournament, tournsize=3)
+
+    def decode(self, individual) -> List[ScheduleAssignment]:
+        """Return an individual as a list of assignments, whatever its representation."""
+        if self.representation == "compact":
+            return self.codec.decode(individual)
+        return list(individual)
+
+    def _has_assignments(self, individual) -> bool:
+        if self.representation == "compact":
+            return any(gene >= 0 for gene in individual)
+        return len(individual) > 0
 
     def _calculate_fitness(self, individual: List[ScheduleAssignment]) -> Tuple[float]:
         """Calculate the fitness of an individual based on constraints and coverage."""
@@ -514,40 +576,146 @@ class GeneticAlgorithm:
                 excess_penalty += (scheduled - required) * 1000
 
         conflicts = 0
+        # Bitmaps answer "no earlier overlap" in O(1); the exact scan only runs on a hit
+        occupancy = OccupancyIndex(self.grid)
         used_slots_per_faculty = defaultdict(list)
         used_slots_per_room = defaultdict(list)
         for a in individual:
-            slot = TimeSlot(day=a.day, startTime=a.startTime, endTime=a.endTime)
-            if check_break_conflict(slot, self.input_data.break_):
+            record = a.record
+            if record_conflicts_with_breaks(record, self.input_data.break_):
                 conflicts += 1
-            for existing_slot in used_slots_per_faculty[a.faculty_id]:
-                if slot.day == existing_slot.day and check_time_conflict(slot, existing_slot):
-                    conflicts += 1
-            for existing_slot in used_slots_per_room[a.room_id]:
-                if slot.day == existing_slot.day and check_time_conflict(slot, existing_slot):
-                    conflicts += 1
-            used_slots_per_faculty[a.faculty_id].append(slot)
-            used_slots_per_room[a.room_id].append(slot)
-
-        used_slots = set((a.day, a.startTime, a.endTime) for a in individual)
+            if not occupancy.faculty_free(a.faculty_id, record):
+                conflicts += count_overlaps(record, used_slots_per_faculty[a.faculty_id])
+            if not occupancy.room_free(a.room_id, record):
+                conflicts += count_overlaps(record, used_slots_per_room[a.room_id])
+            occupancy.occupy(a.faculty_id, a.room_id, record)
+            used_slots_per_faculty[a.faculty_id].append(record)
+            used_slots_per_room[a.room_id].append(record)
+
+        used_slots = set(a.record for a in individual)
         unfilled_slots = len(self.assignable_slots) - len(used_slots)
         unfilled_penalty = unfilled_slots * 5000
 
         fitness = class_requirement_penalty + excess_penalty + (conflicts * 100) + unfilled_penalty
         return (fitness,)
 
-    def _valid_population(self, n):
-        """Generate a valid population, retrying if necessary."""
+    def _map(self, method_name: str, items: List) -> List:
+        """Apply a GA method to items, across the process pool when one is running."""
+        if self._executor is None:
+            return list(map(getattr(self, method_name), items))
+        chunksize = max(1, len(items) // (self.workers * 4))
+        return list(self._executor.map(_worker_call, [method_name] * len(items), items, chunksize=chunksize))
+
+    def use_rng(self, rng: random.Random) -> random.Random:
+        """Make the operators draw from rng; returns the generator it replaces."""
+        previous = self.rng
+        self.rng = rng
+        if self.codec is not None:
+            self.codec.rng = rng
+        return previous
+
+    def _create_seeded(self, seed: int):
+        """Create an individual from its own seed so results do not depend on which process ran it."""
+        previous = self.use_rng(random.Random(seed))
+        try:
+            return self.toolbox.individual()
+        finally:
+            self.use_rng(previous)
+
+    def _mutate_seeded(self, task):
+        individual, seed = task
+        previous = self.use_rng(random.Random(seed))
+        try:
+            return self.toolbox.mutate(individual)[0]
+        finally:
+            self.use_rng(previous)
+
+    def _select_tournament(self, individuals: List, k: int, tournsize: int) -> List:
+        """deap.tools.selTournament drawing from this run's generator."""
+        return [max((self.rng.choice(individuals) for _ in range(tournsize)), key=attrgetter("fitness")) for _ in range(k)]
+
+    def _compact_fitness(self, individual) -> Tuple[float]:
+        return self.codec.fitness(individual)
+
+    def _state(self, individual) -> FitnessState:
+        """Return the individual's running fitness state, building it on first use."""
+        state = getattr(individual, "state", None)
+        if state is None:
+            state = individual.state = FitnessState.from_assignments(self.fitness_context, individual)
+        return state
+
+    def _evaluate_population(self, individuals, deadline: Optional[float] = None) -> Optional[List[Tuple[float]]]:
+        """Evaluate individuals from their running state, or in full with the configured fitness mode.
+
+        With a deadline, individuals are evaluated in chunks and None is returned once it passes.
+        """
+        with metrics.fitness_evaluations.time(count=len(individuals), evaluator="genetic_algorithm"):
+            if deadline is None:
+                return self._evaluate_individuals(individuals)
+            fitnesses = []
+            for start in range(0, len(individuals), DEADLINE_CHUNK):
+                if time.monotonic() >= deadline:
+                    return None
+                fitnesses.extend(self._evaluate_individuals(individuals[start:start + DEADLINE_CHUNK]))
+            return fitnesses
+
+    def _evaluate_individuals(self, individuals) -> List[Tuple[float]]:
+        if self.representation == "compact":
+            fitnesses = self._map("_compact_fitness", individuals)
+            if self.fitness_mode == "crosscheck":
+                scalar = [self._calculate_fitness(self.codec.decode(ind)) for ind in individuals]
+                mismatches = sum(1 for a, b in zip(fitnesses, scalar) if a != b)
+                if mismatches:
+                    logger.error(f"Compact fitness disagrees with scalar fitness for {mismatches}/{len(scalar)} individuals")
+                    return scalar
+            return fitnesses
+        fitnesses = [None] * len(individuals)
+        pending = []
+        for k, ind in enumerate(individuals):
+            state = getattr(ind, "state", None) if self.incremental else None
+            if state is not None:
+                fitnesses[k] = state.fitness()
+            else:
+                pending.append(k)
+        if pending:
+            subset = [individuals[k] for k in pending]
+            if self.fitness_mode == "scalar":
+                full = self._map("_calculate_fitness", subset)
+            else:
+                full = self.batch_evaluator.evaluate(subset)
+            for k, fit in zip(pending, full):
+                fitnesses[k] = fit
+        if self.fitness_mode == "crosscheck":
+            scalar = list(map(self.toolbox.evaluate, individuals))
+            mismatches = sum(1 for a, b in zip(fitnesses, scalar) if a != b)
+            if mismatches:
+                logger.error(f"Fast fitness disagrees with scalar fitness for {mismatches}/{len(scalar)} individuals")
+                return scalar
+        return fitnesses
+
+    def _valid_population(self, n, deadline: Optional[float] = None, minimum: int = 1):
+        """Generate a valid population, retrying if necessary.
+
+        Once the deadline passes, the population is returned as soon as it has minimum individuals.
+        """
         pop = []
         attempts = 0
         max_attempts = 10000
+        # Without a deadline the whole batch goes to the pool at once
+        chunk = max_attempts if deadline is None else DEADLINE_CHUNK * self.workers
         while len(pop) < n and attempts < max_attempts:
-            individual = self.toolbox.individual()
-            if len(individual) > 0:
-                pop.append(individual)
-            attempts += 1
-            if attempts % 100 == 0:
-                logger.info(f"Tried {attempts} individuals, population size: {len(pop)}")
+            # Seeds are drawn up front so the batch is reproducible however it is distributed
+            seeds = [self.rng.randrange(2**32) for _ in range(min(n - len(pop), max_attempts - attempts))]
+            for start in range(0, len(seeds), chunk):
+                if deadline is not None and len(pop) >= minimum and time.monotonic() >= deadline:
+                    logger.warning(f"Time budget ran out while creating the population, stopping at {len(pop)} individuals")
+                    return pop
+                for individual in self._map("_create_seeded", seeds[start:start + chunk]):
+                    if self._has_assignments(individual) and len(pop) < n:
+                        pop.append(individual)
+                    attempts += 1
+                    if attempts % 100 == 0:
+                        logger.info(f"Tried {attempts} individuals, population size: {len(pop)}")
         if len(pop) < n:
             logger.warning(f"Could only generate {len(pop)} individuals out of {n} requested")
         return pop
@@ -557,120 +725,101 @@ class GeneticAlgorithm:
         if len(ind1) < 2 or len(ind2) < 2:
             return ind1, ind2
 
-        point = random.randint(1, min(len(ind1), len(ind2)) - 1)
+        point = self.rng.randint(1, min(len(ind1), len(ind2)) - 1)
         new_ind1, new_ind2 = [], []
-        used_slots1_faculty = defaultdict(list)
-        used_slots1_room = defaultdict(list)
-        used_slots2_faculty = defaultdict(list)
-        used_slots2_room = defaultdict(list)
+        occupancy1 = OccupancyIndex(self.grid)
+        occupancy2 = OccupancyIndex(self.grid)
+        # Each child's state is its parent's state minus what the child drops plus what it takes over
+        state1 = self._state(ind1) if self.incremental else None
+        state2 = self._state(ind2) if self.incremental else None
 
         for a in ind1[:point]:
-            slot = TimeSlot(day=a.day, startTime=a.startTime, endTime=a.endTime)
-            if any(slot.day == s.day and check_time_conflict(slot, s)
-                   for s in used_slots1_faculty[a.faculty_id] + used_slots1_room[a.room_id]):
-                continue
-            if check_break_conflict(slot, self.input_data.break_):
+            record = a.record
+            if not occupancy1.is_free(a.faculty_id, a.room_id, record) or record_conflicts_with_breaks(record, self.input_data.break_):
+                if state1 is not None:
+                    state1.remove(a)
                 continue
             new_ind1.append(a)
-            used_slots1_faculty[a.faculty_id].append(slot)
-            used_slots1_room[a.room_id].append(slot)
+            occupancy1.occupy(a.faculty_id, a.room_id, record)
 
         for a in ind2[point:]:
-            slot = TimeSlot(day=a.day, startTime=a.startTime, endTime=a.endTime)
-            if any(slot.day == s.day and check_time_conflict(slot, s)
-                   for s in used_slots1_faculty[a.faculty_id] + used_slots1_room[a.room_id]):
+            record = a.record
+            if not occupancy1.is_free(a.faculty_id, a.room_id, record):
                 continue
-            if check_break_conflict(slot, self.input_data.break_):
+            if record_conflicts_with_breaks(record, self.input_data.break_):
                 continue
             new_ind1.append(a)
-            used_slots1_faculty[a.faculty_id].append(slot)
-            used_slots1_room[a.room_id].append(slot)
+            occupancy1.occupy(a.faculty_id, a.room_id, record)
+            if state1 is not None:
+                state1.add(a)
 
         for a in ind2[:point]:
-            slot = TimeSlot(day=a.day, startTime=a.startTime, endTime=a.endTime)
-            if any(slot.day == s.day and check_time_conflict(slot, s)
-                   for s in used_slots2_faculty[a.faculty_id] + used_slots2_room[a.room_id]):
-                continue
-            if check_break_conflict(slot, self.input_data.break_):
+            record = a.record
+            if not occupancy2.is_free(a.faculty_id, a.room_id, record) or record_conflicts_with_breaks(record, self.input_data.break_):
+                if state2 is not None:
+                    state2.remove(a)
                 continue
             new_ind2.append(a)
-            used_slots2_faculty[a.faculty_id].append(slot)
-            used_slots2_room[a.room_id].append(slot)
+            occupancy2.occupy(a.faculty_id, a.room_id, record)
 
         for a in ind1[point:]:
-            slot = TimeSlot(day=a.day, startTime=a.startTime, endTime=a.endTime)
-            if any(slot.day == s.day and check_time_conflict(slot, s)
-                   for s in used_slots2_faculty[a.faculty_id] + used_slots2_room[a.room_id]):
+            record = a.record
+            if not occupancy2.is_free(a.faculty_id, a.room_id, record):
                 continue
-            if check_break_conflict(slot, self.input_data.break_):
+            if record_conflicts_with_breaks(record, self.input_data.break_):
                 continue
             new_ind2.append(a)
-            used_slots2_faculty[a.faculty_id].append(slot)
-            used_slots2_room[a.room_id].append(slot)
-
+            occupancy2.occupy(a.faculty_id, a.room_id, record)
+            if state2 is not None:
+                state2.add(a)
+
+        if self.incremental:
+            for a in ind1[point:]:
+                state1.remove(a)
+            for a in ind2[point:]:
+                state2.remove(a)
         ind1[:] = new_ind1
         ind2[:] = new_ind2
         return ind1, ind2
 
     def _mutate(self, individual, indpb):
         """Mutate an individual by reassigning some assignments."""
-        used_slots_per_faculty = defaultdict(list)
-        used_slots_per_room = defaultdict(list)
+        occupancy = OccupancyIndex(self.grid)
         temp_schedule = []
         subject_counts = {subject.name: 0 for subject in self.input_data.subjects}
+        state = self._state(individual) if self.incremental else None
         for a in individual:
-            slot = TimeSlot(day=a.day, startTime=a.startTime, endTime=a.endTime)
-            if any(slot.day == s.day and check_time_conflict(slot, s)
-                   for s in used_slots_per_faculty[a.faculty_id] + used_slots_per_room[a.room_id]):
-                continue
-            if check_break_conflict(slot, self.input_data.break_):
-                continue
-            if subject_counts[a.subject_name] >= next(s.no_of_classes_per_week for s in self.input_data.subjects if s.name == a.subject_name):
+            record = a.record
+            if (not occupancy.is_free(a.faculty_id, a.room_id, record)
+                    or record_conflicts_with_breaks(record, self.input_data.break_)
+                    or subject_counts[a.subject_name] >= next(s.no_of_classes_per_week for s in self.input_data.subjects if s.name == a.subject_name)):
+                if state is not None:
+                    state.remove(a)
                 continue
             temp_schedule.append(a)
-            used_slots_per_faculty[a.faculty_id].append(slot)
-            used_slots_per_room[a.room_id].append(slot)
+            occupancy.occupy(a.faculty_id, a.room_id, record)
             subject_counts[a.subject_name] += 1
         individual[:] = temp_schedule
 
         for i in range(len(individual)):
-            if random.random() < indpb:
+            if self.rng.random() < indpb:
                 subject_name = individual[i].subject_name
                 subject = next(s for s in self.input_data.subjects if s.name == subject_name)
-                old_slot = TimeSlot(day=individual[i].day, startTime=individual[i].startTime, endTime=individual[i].endTime)
-                used_slots_per_faculty[individual[i].faculty_id].remove(old_slot)
-                used_slots_per_room[self.fixed_room_id].remove(old_slot)
+                occupancy.release(individual[i].faculty_id, self.fixed_room_id, individual[i].record)
                 subject_counts[subject_name] -= 1
 
                 assigned = False
-                for faculty in random.sample(subject.faculty, len(subject.faculty)):
-                    valid_slots = []
-                    for slot in self.assignable_slots:
-                        slot_duration = self._get_slot_duration(slot)
-                        if slot_duration != subject.time:
-                            continue
-                        for avail in faculty.availability:
-                            if slot.day == avail.day or avail.day == "ALL_DAYS":
-                                try:
-                                    avail_start = time_to_minutes(avail.startTime)
-                                    avail_end = time_to_minutes(avail.endTime)
-                                    slot_start = time_to_minutes(slot.startTime)
-                                    slot_end = time_to_minutes(slot.endTime)
-                                    if avail_start <= slot_start and slot_end <= avail_end:
-                                        valid_slots.append(slot)
-                                        break
-                                except ValueError as e:
-                                    logger.error(f"Time parsing error in _mutate for faculty {faculty.id}: {e}")
-                                    continue
-
-                    for slot in random.sample(valid_slots, len(valid_slots)):
-                        if any(slot.day == s.day and check_time_conflict(slot, s)
-                               for s in used_slots_per_faculty[faculty.id] + used_slots_per_room[self.fixed_room_id]):
+                for faculty in self.rng.sample(subject.faculty, len(subject.faculty)):
+                    valid_slots = self.eligibility.slots_for(subject.name, faculty.id)
+                    for slot in self.rng.sample(valid_slots, len(valid_slots)):
+                        if not occupancy.is_free(faculty.id, self.fixed_room_id, slot.record):
                             continue
                         if self.conflict_checker and not self.conflict_checker(faculty.id, slot, self.fixed_room_id, self.input_data):
                             continue
                         if subject_counts[subject.name] >= subject.no_of_classes_per_week:
                             continue
+                        if state is not None:
+                            state.remove(individual[i])
                         individual[i] = ScheduleAssignment(
                             subject_name=subject.name,
                             faculty_id=faculty.id,
@@ -680,9 +829,10 @@ class GeneticAlgorithm:
                             endTime=slot.endTime,
                             room_id=self.fixed_room_id
                         )
-                        used_slots_per_faculty[faculty.id].append(slot)
-                        used_slots_per_room[self.fixed_room_id].append(slot)
+                        occupancy.occupy(faculty.id, self.fixed_room_id, slot.record)
                         subject_counts[subject.name] += 1
+                        if state is not None:
+                            state.add(individual[i])
                         assigned = True
                         break
                     if assigned:
@@ -693,39 +843,131 @@ class GeneticAlgorithm:
 
         return individual,
 
-    def run(self) -> Tuple[List[ScheduleAssignment], float]:
-        """Run the genetic algorithm to generate an optimized schedule."""
-        logger.info("Starting Genetic Algorithm...")
-        pop = self.toolbox.population(n=self.pop_size)
+    def run(self, initial: Optional[List[List[ScheduleAssignment]]] = None, time_budget: Optional[float] = None, patience: Optional[int] = None, should_stop: Optional[Callable[[], bool]] = None, on_generation: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[List[ScheduleAssignment], float]:
+        """Run the genetic algorithm to generate an optimized schedule.
+
+        initial schedules (e.g. the greedy result) are injected into the first population.
+        time_budget is a wall-clock limit in seconds; patience stops the run after that many
+        generations without improvement of the best fitness. should_stop is polled once per
+        generation; a True result ends the run with stop_reason "cancelled". on_generation is
+        called after every generation with its best and mean fitness.
+        """
+        logger.info(f"Starting Genetic Algorithm with {self.workers} worker(s)...")
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        if self.seed is not None:
+            self.use_rng(random.Random(self.seed))
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self._worker_kwargs,))
+        try:
+            pop = self.initial_population(initial, deadline=deadline)
+            pop = self.evolve(pop, self.generations, deadline=deadline, patience=patience, should_stop=should_stop, on_generation=on_generation)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        if not pop:
+            raise ValueError("Genetic algorithm could not generate any valid individual")
+        best = deap.tools.selBest(pop, k=1)[0]
+        logger.info(f"Genetic Algorithm completed after {self.generations_run} generation(s): {self.stop_reason}")
+        if self.representation == "compact":
+            return self.codec.decode(best), best.fitness.values[0]
+        return best, best.fitness.values[0]
+
+    def initial_population(self, initial: Optional[List[List[ScheduleAssignment]]] = None, deadline: Optional[float] = None) -> List:
+        """Create and evaluate a population of pop_size individuals, starting from any initial schedules.
+
+        Past the deadline, creation stops early; the population keeps at least one individual.
+        """
+        if self.representation == "compact":
+            seeded = [deap.creator.CompactIndividual(self.codec.encode(schedule)) for schedule in (initial or []) if schedule]
+        else:
+            seeded = [deap.creator.Individual(schedule) for schedule in (initial or []) if schedule]
+        seeded = seeded[:self.pop_size]
+        pop = seeded + self.toolbox.population(n=self.pop_size - len(seeded), deadline=deadline, minimum=0 if seeded else 1)
         logger.info(f"Initial population created: {len(pop)} individuals")
 
-        fitnesses = list(map(self.toolbox.evaluate, pop))
+        fitnesses = self._evaluate_population(pop)
         for ind, fit in zip(pop, fitnesses):
             ind.fitness.values = fit
+        return pop
 
-        for gen in range(self.generations):
-            logger.info(f"Generation {gen+1}/{self.generations}")
-            offspring = self.toolbox.select(pop, len(pop))
-            offspring = list(map(self.toolbox.clone, offspring))
-
-            for c1, c2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < 0.8:
-                    self.toolbox.mate(c1, c2)
-                    del c1.fitness.values
-                    del c2.fitness.values
-
-            for mutant in offspring:
-                if random.random() < 0.2:
-                    self.toolbox.mutate(mutant)
-                    del mutant.fitness.values
-
-            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = map(self.toolbox.evaluate, invalid_ind)
+    def _vary(self, pop: List, deadline: Optional[float] = None) -> Optional[List]:
+        """Select, clone, mate and mutate one generation of offspring; None once the deadline passes."""
+        def out_of_time(step: int) -> bool:
+            return deadline is not None and step % DEADLINE_CHUNK == 0 and time.monotonic() >= deadline
+
+        offspring = []
+        for step, ind in enumerate(self.toolbox.select(pop, len(pop))):
+            if out_of_time(step):
+                return None
+            offspring.append(self.toolbox.clone(ind))
+
+        for step, (c1, c2) in enumerate(zip(offspring[::2], offspring[1::2])):
+            if out_of_time(step):
+                return None
+            if self.rng.random() < 0.8:
+                self.toolbox.mate(c1, c2)
+                del c1.fitness.values
+                del c2.fitness.values
+
+        if out_of_time(0):
+            return None
+        mutant_indices = [i for i in range(len(offspring)) if self.rng.random() < 0.2]
+        tasks = [(offspring[i], self.rng.randrange(2**32)) for i in mutant_indices]
+        for i, mutant in zip(mutant_indices, self._map("_mutate_seeded", tasks)):
+            del mutant.fitness.values
+            offspring[i] = mutant
+        return offspring
+
+    def evolve(self, pop: List, generations: int, deadline: Optional[float] = None, patience: Optional[int] = None, should_stop: Optional[Callable[[], bool]] = None, on_generation: Optional[Callable[[Dict[str, Any]], None]] = None) -> List:
+        """Evolve an evaluated population, stopping early at the deadline, on cancellation or once progress stalls."""
+        self.fitness_history = [deap.tools.selBest(pop, k=1)[0].fitness.values[0]] if pop else []
+        self.generations_run = 0
+        self.stop_reason = "completed"
+        stale_generations = 0
+        for gen in range(generations):
+            if not pop:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                self.stop_reason = "time_budget"
+                break
+            if should_stop is not None and should_stop():
+                self.stop_reason = "cancelled"
+                break
+            logger.info(f"Generation {gen+1}/{generations}")
+            generation_started = time.perf_counter()
+            offspring = self._vary(pop, deadline)
+            fitnesses = None
+            if offspring is not None:
+                invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+                fitnesses = self._evaluate_population(invalid_ind, deadline=deadline)
+            if fitnesses is None:
+                # The budget ran out mid-generation; its offspring are dropped
+                self.stop_reason = "time_budget"
+                break
             for ind, fit in zip(invalid_ind, fitnesses):
                 ind.fitness.values = fit
 
             pop[:] = deap.tools.selBest(pop + offspring, k=self.pop_size)
 
-        best = deap.tools.selBest(pop, k=1)[0]
-        logger.info("Genetic Algorithm completed.")
-        return best, best.fitness.values[0]
\ No newline at end of file
+            self.generations_run += 1
+            metrics.ga_generations.observe(time.perf_counter() - generation_started)
+            best_fitness = pop[0].fitness.values[0]
+            if best_fitness < min(self.fitness_history):
+                stale_generations = 0
+            else:
+                stale_generations += 1
+            self.fitness_history.append(best_fitness)
+            if on_generation is not None:
+                on_generation({
+                    "generation": gen + 1,
+                    "generations": generations,
+                    "best_fitness": best_fitness,
+                    "mean_fitness": sum(ind.fitness.values[0] for ind in pop) / len(pop)
+                })
+            if patience and stale_generations >= patience:
+                self.stop_reason = "converged"
+                break
+
+        return pop
\ No newline at end of file
@@ -0,0 +1,138 @@
+# Island-model genetic algorithm
+# Several GeneticAlgorithm sub-populations evolve in separate processes and periodically
+# exchange their best individuals, which keeps large rooms from converging too early.
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Callable, Tuple, Optional, Dict, Any
+import deap.tools
+from model import ScheduleInput, ScheduleAssignment, TimeSlot
+from eligibility import EligibilityIndex
+from genetic_algorithm import GeneticAlgorithm
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ring: island i sends to i+1; fully_connected: every island sends to all others;
+# random: every island sends to one other island drawn per migration
+TOPOLOGIES = ("ring", "fully_connected", "random")
+
+# Per-process island engine; built once by _init_island_worker
+_island_ga = None
+
+def _init_island_worker(ga_kwargs):
+    global _island_ga
+    _island_ga = GeneticAlgorithm(**ga_kwargs)
+
+def _run_island_epoch(task):
+    """Create (when population is None) and evolve one island for one migration interval.
+
+    initial schedules seed a newly created island; returns the population and its generations run.
+    """
+    population, seed, generations, initial, deadline = task
+    _island_ga.use_rng(random.Random(seed))
+    if population is None:
+        population = _island_ga.initial_population(initial, deadline=deadline)
+    # time.monotonic() is system-wide on Linux, so the parent's deadline holds in the workers
+    population = _island_ga.evolve(population, generations, deadline=deadline)
+    return population, _island_ga.generations_run
+
+class IslandModel:
+    def __init__(self, input_data: ScheduleInput, fixed_slots: List[TimeSlot], islands: int = 4, island_pop_size: int = 50, generations: int = 50, migration_interval: int = 5, migration_size: int = 2, topology: str = "ring", fixed_room_id: str = "R1", conflict_checker: Callable = None, eligibility: EligibilityIndex = None, workers: Optional[int] = None, seed: Optional[int] = None, representation: str = "assignments"):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Invalid topology: {topology}. Expected one of {TOPOLOGIES}")
+        if islands < 1 or migration_interval < 1:
+            raise ValueError("islands and migration_interval must be at least 1")
+        self.islands = islands
+        self.generations = generations
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.workers = workers or islands
+        self.seed = seed
+        self.generations_run = 0
+        self.stop_reason = "completed"
+        self.fitness_history: List[float] = []
+        self.ga_kwargs = dict(
+            input_data=input_data, fixed_slots=fixed_slots, pop_size=island_pop_size, generations=migration_interval,
+            fixed_room_id=fixed_room_id, conflict_checker=conflict_checker, eligibility=eligibility,
+            representation=representation,
+        )
+
+    def _destinations(self, source: int, rng: random.Random) -> List[int]:
+        """Islands that receive migrants from source under the configured topology."""
+        if self.islands == 1:
+            return []
+        if self.topology == "ring":
+            return [(source + 1) % self.islands]
+        if self.topology == "fully_connected":
+            return [i for i in range(self.islands) if i != source]
+        return [rng.choice([i for i in range(self.islands) if i != source])]
+
+    def _migrate(self, populations: List[List], rng: random.Random):
+        """Replace the worst individuals of each island with clones of its neighbours' best."""
+        incoming: Dict[int, List] = {i: [] for i in range(self.islands)}
+        for source, pop in enumerate(populations):
+            emigrants = deap.tools.selBest(pop, k=min(self.migration_size, len(pop)))
+            for destination in self._destinations(source, rng):
+                incoming[destination].extend(emigrants)
+        for destination, migrants in incoming.items():
+            pop = populations[destination]
+            if not migrants or not pop:
+                continue
+            migrants = deap.tools.selBest(migrants, k=min(len(migrants), len(pop)))
+            survivors = deap.tools.selBest(pop, k=len(pop) - len(migrants))
+            # Individuals are pickled per task, so islands never share migrant objects
+            pop[:] = survivors + migrants
+
+    def run(self, initial: Optional[List[List[ScheduleAssignment]]] = None, time_budget: Optional[float] = None, should_stop: Optional[Callable[[], bool]] = None, on_generation: Optional[Callable[[Dict[str, Any]], None]] = None) -> Tuple[List[ScheduleAssignment], float]:
+        """Evolve all islands and return the best individual found on any of them.
+
+        initial schedules (e.g. the greedy result) seed the first island. time_budget is a
+        wall-clock limit in seconds that the islands also check between generations;
+        should_stop is polled and on_generation called once per migration interval.
+        """
+        logger.info(f"Starting island model: {self.islands} islands, {self.workers} worker(s), topology={self.topology}")
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        rng = random.Random(self.seed)
+        populations: List = [None] * self.islands
+        self.generations_run = 0
+        self.stop_reason = "completed"
+        self.fitness_history = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_island_worker, initargs=(self.ga_kwargs,)) as executor:
+            while True:
+                epoch = min(self.migration_interval, self.generations - self.generations_run)
+                tasks = [(pop, rng.randrange(2**32), epoch, initial if i == 0 else None, deadline) for i, pop in enumerate(populations)]
+                populations, runs = (list(column) for column in zip(*executor.map(_run_island_epoch, tasks)))
+                self.generations_run += max(runs)
+                candidates = [ind for pop in populations for ind in pop]
+                if candidates:
+                    best_fitness = deap.tools.selBest(candidates, k=1)[0].fitness.values[0]
+                    self.fitness_history.append(best_fitness)
+                    if on_generation is not None and max(runs) > 0:
+                        on_generation({
+                            "generation": self.generations_run,
+                            "generations": self.generations,
+                            "best_fitness": best_fitness,
+                            "mean_fitness": sum(ind.fitness.values[0] for ind in candidates) / len(candidates)
+                        })
+                if self.generations_run >= self.generations:
+                    break
+                if max(runs) < epoch or (deadline is not None and time.monotonic() >= deadline):
+                    self.stop_reason = "time_budget"
+                    break
+                if should_stop is not None and should_stop():
+                    self.stop_reason = "cancelled"
+                    break
+                self._migrate(populations, rng)
+                logger.info(f"Migration done, {self.generations_run}/{self.generations} generations")
+
+        candidates = [ind for pop in populations for ind in pop]
+        if not candidates:
+            raise ValueError("No valid individuals could be generated on any island")
+        best = deap.tools.selBest(candidates, k=1)[0]
+        logger.info(f"Island model completed after {self.generations_run} generation(s): {self.stop_reason}")
+        # Compact chromosomes are decoded by a local engine built from the same arguments
+        return GeneticAlgorithm(**self.ga_kwargs).decode(best), best.fitness.values[0]
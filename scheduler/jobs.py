@@ -0,0 +1,230 @@
+# Background job queue for schedule generation
+# Jobs run SchedulerService.generate_schedule in a bounded process pool, so the API event loop
+# stays responsive while a large room is scheduled. Clients poll a job (or stream its events)
+# until it reaches a final state.
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, Future, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from model import ScheduleInput
+from scheduler import SchedulerService, GenerationCancelled
+from result_cache import ResultCache
+import metrics
+import startup
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINAL_STATES = (COMPLETED, FAILED, CANCELLED)
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while max_pending jobs are already queued or running."""
+
+def _run_job(input_data: ScheduleInput, params: Dict[str, Any], control) -> Tuple[Dict[str, Any], Dict]:
+    """Worker entry point; control is a manager dict shared with the queue.
+
+    Returns the result and the metrics the run recorded in this worker process, which the
+    queue merges into the API process registry.
+    """
+    control["status"] = RUNNING
+    control["started_at"] = time.time()
+    metrics.REGISTRY.reset()
+    params = dict(params)
+    should_stop = lambda: control.get("cancel", False)
+    if params.pop("campus", False):
+        return SchedulerService().generate_campus_schedule(input_data, should_stop=should_stop), metrics.REGISTRY.snapshot()
+
+    def progress(event: Dict[str, Any]):
+        control["progress"] = event
+
+    return SchedulerService().generate_schedule(input_data, should_stop=should_stop, progress=progress, **params), metrics.REGISTRY.snapshot()
+
+@dataclass
+class Job:
+    id: str
+    params: Dict[str, Any]
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    progress: Optional[Dict[str, Any]] = None
+    future: Optional[Future] = field(default=None, repr=False)
+    control: Any = field(default=None, repr=False)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "error_type": self.error_type,
+            "progress": self.progress,
+        }
+        if include_result and self.status == COMPLETED:
+            data["result"] = self.result
+        return data
+
+class JobQueue:
+    """Bounded process pool with job bookkeeping, queue-depth limits and cancellation."""
+
+    def __init__(self, workers: int = 2, max_pending: int = 16, max_finished: int = 100, cache: Optional[ResultCache] = None):
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be at least 1")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.cache = cache
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+
+    def _ensure_pool(self):
+        # The pool and its manager process are started lazily, on the first submission
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=startup.warm_up)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status not in FINAL_STATES)
+
+    def submit(self, input_data: ScheduleInput, **params) -> Job:
+        """Queue a generation run; params are forwarded to SchedulerService.generate_schedule,
+        or select generate_campus_schedule with campus=True. Cache hits complete immediately."""
+        key, cache_info = None, None
+        if self.cache is not None:
+            key, cached, cache_info = self.cache.lookup(input_data, params)
+            if cached is not None:
+                now = time.time()
+                job = Job(id=uuid.uuid4().hex, params=params, status=COMPLETED, started_at=now, finished_at=now, result=dict(cached, cache=cache_info))
+                with self._lock:
+                    self._jobs[job.id] = job
+                    self._evict_finished()
+                metrics.events.info("job_cached", job_id=job.id)
+                return job
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if job.status not in FINAL_STATES)
+            if active >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({active}/{self.max_pending} jobs pending)")
+            self._ensure_pool()
+            job = Job(id=uuid.uuid4().hex, params=params)
+            job.control = self._manager.dict(status=QUEUED, cancel=False)
+            try:
+                job.future = self._executor.submit(_run_job, input_data, params, job.control)
+            except BrokenProcessPool:
+                logger.warning("Job worker pool was broken, starting a new one")
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=startup.warm_up)
+                job.future = self._executor.submit(_run_job, input_data, params, job.control)
+            self._jobs[job.id] = job
+            self._evict_finished()
+        job.future.add_done_callback(lambda future: self._finish(job, future, key, cache_info))
+        metrics.events.info("job_queued", job_id=job.id, pending=active + 1, max_pending=self.max_pending)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            self._refresh(job)
+        return job
+
+    def all(self) -> List[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            self._refresh(job)
+        return jobs
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued job immediately, or ask a running one to stop at its next checkpoint."""
+        job = self.get(job_id)
+        if job is None or job.status in FINAL_STATES:
+            return job
+        try:
+            job.control["cancel"] = True
+        except (EOFError, OSError, BrokenPipeError):
+            pass
+        # Succeeds only while the job is still waiting for a worker; the done callback records it
+        job.future.cancel()
+        metrics.events.info("job_cancel_requested", job_id=job.id, status=job.status)
+        return job
+
+    def shutdown(self):
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status not in FINAL_STATES:
+                    job.future.cancel()
+                    try:
+                        job.control["cancel"] = True
+                    except (EOFError, OSError, BrokenPipeError):
+                        pass
+            executor, manager = self._executor, self._manager
+            self._executor = self._manager = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+
+    def _refresh(self, job: Job):
+        """Pick up the queued -> running transition and the latest progress event, which only the worker knows about."""
+        control = job.control
+        if job.status not in (QUEUED, RUNNING) or control is None:
+            return
+        try:
+            status, started_at, progress = control.get("status"), control.get("started_at"), control.get("progress")
+        except (EOFError, OSError, BrokenPipeError, KeyError):
+            return
+        with self._lock:
+            if job.status == QUEUED and status == RUNNING:
+                job.status = RUNNING
+                job.started_at = started_at
+            if job.status == RUNNING:
+                job.progress = progress
+
+    def _finish(self, job: Job, future: Future, cache_key: Optional[str] = None, cache_info: Optional[Dict[str, Any]] = None):
+        self._refresh(job)
+        result = None
+        with self._lock:
+            job.finished_at = time.time()
+            try:
+                result, samples = future.result()
+                metrics.REGISTRY.merge(samples)
+                job.result = result if cache_info is None else dict(result, cache=cache_info)
+                job.status = COMPLETED
+            except (CancelledError, GenerationCancelled):
+                job.status = CANCELLED
+            except Exception as e:
+                job.status = FAILED
+                job.error = str(e)
+                job.error_type = type(e).__name__
+            job.control = None
+        if result is not None and self.cache is not None:
+            self.cache.store(cache_key, result)
+        queued_ms = round(((job.started_at or job.finished_at) - job.created_at) * 1000, 2)
+        run_ms = round((job.finished_at - job.started_at) * 1000, 2) if job.started_at is not None else None
+        metrics.events.log(logging.WARNING if job.status == FAILED else logging.INFO, "job_finished", job_id=job.id, status=job.status, queued_ms=queued_ms, run_ms=run_ms, error_type=job.error_type)
+
+    def _evict_finished(self):
+        # Called with the lock held; drops the oldest finished jobs beyond max_finished
+        finished = [job for job in self._jobs.values() if job.status in FINAL_STATES]
+        for job in sorted(finished, key=lambda j: j.finished_at or 0)[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
@@ -0,0 +1,271 @@
+# Simulated-annealing improver for constructed schedules
+# Starts from a conflict-free schedule (e.g. the greedy result) and applies fill, move, swap
+# and eject moves checked against an OccupancyIndex. The objective rewards every required
+# class that is placed first and the total preference score second; the best schedule seen
+# is returned, so the pass never makes its input worse.
+import math
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from model import ScheduleInput, ScheduleAssignment, TimeSlot
+from eligibility import EligibilityIndex
+from occupancy import SlotGrid, OccupancyIndex
+from utils import record_conflicts_with_breaks, calculate_preference_score
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Objective value of one placed required class; larger than any preference score difference
+FILL_WEIGHT = 1000
+# Annealing temperatures, in preference-score units
+START_TEMPERATURE = 40.0
+END_TEMPERATURE = 0.5
+# Iterations between two time-budget/cancellation checks
+_CHECK_INTERVAL = 64
+
+class LocalSearchImprover:
+    """Improves coverage and preference score of a single-room schedule within an iteration/time budget."""
+
+    def __init__(self, input_data: ScheduleInput, slots: List[TimeSlot], eligibility: EligibilityIndex, grid: SlotGrid, room_id: str, iterations: int = 2000, time_budget: Optional[float] = None, seed: Optional[int] = None, should_stop: Optional[Callable[[], bool]] = None):
+        if iterations < 0:
+            raise ValueError("iterations must not be negative")
+        self.slots = slots
+        self.grid = grid
+        self.room_id = room_id
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.should_stop = should_stop
+        self.rng = random.Random(seed)
+
+        self.subjects = input_data.subjects
+        self.subject_index: Dict[str, int] = {}
+        for s, subject in enumerate(self.subjects):
+            self.subject_index.setdefault(subject.name, s)
+        # Candidates per subject: (faculty, slot id, preference score), break-free slots only
+        break_hits = {}
+        self.candidates: List[List[Tuple]] = []
+        for subject in self.subjects:
+            candidates = []
+            for faculty in subject.faculty:
+                for slot_id in eligibility.slot_ids(subject.name, faculty.id):
+                    record = slots[slot_id].record
+                    hit = break_hits.get(record)
+                    if hit is None:
+                        hit = break_hits[record] = record_conflicts_with_breaks(record, input_data.break_)
+                    if not hit:
+                        score = calculate_preference_score(slots[slot_id], getattr(subject, 'preferred_slots', []), getattr(faculty, 'preferred_slots', []))
+                        candidates.append((faculty, slot_id, score))
+            self.candidates.append(candidates)
+        self.candidate_index = [{(c[0].id, c[1]): c for c in candidates} for candidates in self.candidates]
+        self.slot_ids_by_record = {}
+        for slot_id, slot in enumerate(slots):
+            self.slot_ids_by_record.setdefault(slot.record, slot_id)
+
+    def _totals(self) -> Tuple[int, int]:
+        """(required classes placed, total preference score) of the current state."""
+        placed = sum(min(len(entries), subject.no_of_classes_per_week) for subject, entries in zip(self.subjects, self.placed))
+        return placed, sum(entry[2] for entries in self.placed for entry in entries)
+
+    def _load(self, schedule: List[ScheduleAssignment]) -> List[ScheduleAssignment]:
+        """Take over the assignments that map onto candidates; the others are returned untouched."""
+        self.occupancy = OccupancyIndex(self.grid)
+        self.placed: List[List[Tuple]] = [[] for _ in self.subjects]
+        foreign = []
+        for assignment in schedule:
+            s = self.subject_index.get(assignment.subject_name)
+            slot_id = self.slot_ids_by_record.get(assignment.record)
+            candidate = None
+            if s is not None and slot_id is not None and assignment.room_id == self.room_id:
+                candidate = self.candidate_index[s].get((assignment.faculty_id, slot_id))
+            if candidate is None:
+                foreign.append(assignment)
+                continue
+            self.placed[s].append(candidate)
+        # Foreign assignments keep their faculty and room busy
+        for assignment in foreign:
+            self.occupancy.occupy(assignment.faculty_id, assignment.room_id, assignment.record)
+        for entries in self.placed:
+            for faculty, slot_id, _ in entries:
+                self.occupancy.occupy(faculty.id, self.room_id, self.slots[slot_id].record)
+        return foreign
+
+    def _days(self, s: int, skip: Optional[Tuple] = None) -> set:
+        return {self.slots[entry[1]].day for entry in self.placed[s] if entry is not skip}
+
+    def _free(self, candidate: Tuple) -> bool:
+        return self.occupancy.is_free(candidate[0].id, self.room_id, self.slots[candidate[1]].record)
+
+    def _occupy(self, candidate: Tuple):
+        self.occupancy.occupy(candidate[0].id, self.room_id, self.slots[candidate[1]].record)
+
+    def _release(self, candidate: Tuple):
+        self.occupancy.release(candidate[0].id, self.room_id, self.slots[candidate[1]].record)
+
+    def _accept(self, delta: int, temperature: float) -> bool:
+        return delta >= 0 or self.rng.random() < math.exp(delta / temperature)
+
+    def _try_fill(self, temperature: float) -> Optional[int]:
+        short = [s for s, subject in enumerate(self.subjects) if len(self.placed[s]) < subject.no_of_classes_per_week and self.candidates[s]]
+        if not short:
+            return None
+        s = self.rng.choice(short)
+        candidate = self.rng.choice(self.candidates[s])
+        if self.slots[candidate[1]].day in self._days(s) or not self._free(candidate):
+            return None
+        self.placed[s].append(candidate)
+        self._occupy(candidate)
+        return FILL_WEIGHT + candidate[2]
+
+    def _try_move(self, temperature: float) -> Optional[int]:
+        filled = [s for s in range(len(self.subjects)) if self.placed[s]]
+        if not filled:
+            return None
+        s = self.rng.choice(filled)
+        i = self.rng.randrange(len(self.placed[s]))
+        old = self.placed[s][i]
+        new = self.rng.choice(self.candidates[s])
+        if new is old or self.slots[new[1]].day in self._days(s, skip=old):
+            return None
+        self._release(old)
+        delta = new[2] - old[2]
+        if not self._free(new) or not self._accept(delta, temperature):
+            self._occupy(old)
+            return None
+        self.placed[s][i] = new
+        self._occupy(new)
+        return delta
+
+    def _try_swap(self, temperature: float) -> Optional[int]:
+        """Exchange the slots of two classes, each keeping its faculty."""
+        filled = [(s, i) for s in range(len(self.subjects)) for i in range(len(self.placed[s]))]
+        if len(filled) < 2:
+            return None
+        (s1, i1), (s2, i2) = self.rng.sample(filled, 2)
+        a, b = self.placed[s1][i1], self.placed[s2][i2]
+        new_a = self.candidate_index[s1].get((a[0].id, b[1]))
+        new_b = self.candidate_index[s2].get((b[0].id, a[1]))
+        if new_a is None or new_b is None or s1 == s2:
+            return None
+        if self.slots[b[1]].day in self._days(s1, skip=a) or self.slots[a[1]].day in self._days(s2, skip=b):
+            return None
+        self._release(a)
+        self._release(b)
+        delta = new_a[2] + new_b[2] - a[2] - b[2]
+        ok = self._free(new_a)
+        if ok:
+            self._occupy(new_a)
+            ok = self._free(new_b)
+            if not ok:
+                self._release(new_a)
+        if not ok or not self._accept(delta, temperature):
+            if ok:
+                self._release(new_a)
+            self._occupy(a)
+            self._occupy(b)
+            return None
+        self._occupy(new_b)
+        self.placed[s1][i1], self.placed[s2][i2] = new_a, new_b
+        return delta
+
+    def _try_eject(self, temperature: float) -> Optional[int]:
+        """Place a missing class of one subject by removing the single class blocking it."""
+        short = [s for s, subject in enumerate(self.subjects) if len(self.placed[s]) < subject.no_of_classes_per_week and self.candidates[s]]
+        if not short:
+            return None
+        s = self.rng.choice(short)
+        new = self.rng.choice(self.candidates[s])
+        record = self.slots[new[1]].record
+        if self.slots[new[1]].day in self._days(s):
+            return None
+        blockers = []
+        for t, entries in enumerate(self.placed):
+            for j, entry in enumerate(entries):
+                other = self.slots[entry[1]].record
+                if other.day == record.day and other.start < record.end and record.start < other.end:
+                    blockers.append((t, j))
+        if len(blockers) != 1:
+            return None
+        t, j = blockers[0]
+        old = self.placed[t][j]
+        if t == s:
+            return None
+        self._release(old)
+        delta = new[2] - old[2]
+        if len(self.placed[t]) > self.subjects[t].no_of_classes_per_week:
+            # The ejected class was surplus, so the subject stays covered
+            delta += FILL_WEIGHT
+        if not self._free(new) or not self._accept(delta, temperature):
+            self._occupy(old)
+            return None
+        del self.placed[t][j]
+        self.placed[s].append(new)
+        self._occupy(new)
+        return delta
+
+    def improve(self, schedule: List[ScheduleAssignment]) -> Tuple[List[ScheduleAssignment], Dict]:
+        """Return the best schedule found and a report of the search."""
+        started = time.monotonic()
+        deadline = started + self.time_budget if self.time_budget is not None else None
+        foreign = self._load(schedule)
+        initial_classes, initial_score = self._totals()
+        current = initial_classes * FILL_WEIGHT + initial_score
+        best, best_placed = current, [list(entries) for entries in self.placed]
+        moves = (self._try_fill, self._try_move, self._try_swap, self._try_eject)
+        accepted = 0
+        iterations = 0
+        stop_reason = "completed"
+        for iterations in range(1, self.iterations + 1):
+            if iterations % _CHECK_INTERVAL == 1:
+                if self.should_stop is not None and self.should_stop():
+                    iterations -= 1
+                    stop_reason = "cancelled"
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    iterations -= 1
+                    stop_reason = "time_budget"
+                    break
+            progress = (iterations - 1) / max(1, self.iterations)
+            temperature = START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** progress
+            delta = self.rng.choice(moves)(temperature)
+            if delta is None:
+                continue
+            accepted += 1
+            current += delta
+            if current > best:
+                best, best_placed = current, [list(entries) for entries in self.placed]
+
+        self.placed = best_placed
+        improved = foreign + self._build_assignments()
+        final_classes, final_score = self._totals()
+        report = {
+            "engine": "simulated_annealing",
+            "iterations": iterations,
+            "accepted_moves": accepted,
+            "stopped_reason": stop_reason,
+            "initial_score": initial_score,
+            "final_score": final_score,
+            "classes_added": final_classes - initial_classes,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 2),
+        }
+        logger.info(f"Local search: {iterations} iterations, {report['classes_added']} classes added, preference score {report['initial_score']} -> {report['final_score']}")
+        return improved, report
+
+    def _build_assignments(self) -> List[ScheduleAssignment]:
+        assignments = []
+        for subject, entries in zip(self.subjects, self.placed):
+            for faculty, slot_id, score in entries:
+                slot = self.slots[slot_id]
+                assignments.append(ScheduleAssignment(
+                    subject_name=subject.name,
+                    faculty_id=faculty.id,
+                    faculty_name=faculty.name,
+                    day=slot.day,
+                    startTime=slot.startTime,
+                    endTime=slot.endTime,
+                    room_id=self.room_id,
+                    is_special=getattr(subject, 'is_special', False),
+                    priority_score=score
+                ))
+        return assignments
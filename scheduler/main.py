@@ -1,13 +1,26 @@
 # Class Scheduler API
 # This API provides endpoints to generate class schedules, retrieve schedule history, and display schedules in HTML
-from fastapi import FastAPI, HTTPException, Query, Depends, Response
+from fastapi import FastAPI, HTTPException, Query, Depends, Response, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from typing import Optional, List, Dict, Any
-from model import ScheduleInput, ScheduleAssignment, Break
-from scheduler import SchedulerService
+from model import ScheduleInput, ScheduleAssignment, Break, RescheduleInput, BatchScheduleInput
+from scheduler import SchedulerService, GenerationCancelled, ENGINES, LOCAL_SEARCH_ITERATIONS
+from jobs import JobQueue, QueueFullError, FINAL_STATES
+from batch import BatchRunner
+from result_cache import ResultCache
+import columnar
+import metrics
+import profiling
+import startup
+import asyncio
+import hmac
 import logging
 import json
+import os
+import threading
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -31,6 +44,72 @@ app.add_middleware(
 # Create a singleton instance of the scheduler service
 scheduler_service = SchedulerService()
 
+# Results of identical requests; SCHEDULER_CACHE_SIZE=0 disables the in-memory LRU and
+# SCHEDULER_CACHE_DIR adds a disk backend that survives restarts
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("SCHEDULER_CACHE_SIZE", "128")),
+    directory=os.environ.get("SCHEDULER_CACHE_DIR") or None
+)
+
+# Background generation jobs; worker count and queue depth are configurable per deployment
+job_queue = JobQueue(
+    workers=int(os.environ.get("SCHEDULER_JOB_WORKERS", "2")),
+    max_pending=int(os.environ.get("SCHEDULER_JOB_QUEUE_LIMIT", "16")),
+    cache=result_cache
+)
+# Process pool of /api/generate-schedules/batch; defaults to one worker per CPU
+batch_runner = BatchRunner(
+    workers=int(os.environ.get("SCHEDULER_BATCH_WORKERS", "0")) or None,
+    max_rooms=int(os.environ.get("SCHEDULER_BATCH_LIMIT", "500"))
+)
+# Recent profiles of admin requests; SCHEDULER_PROFILE_DIR also writes every artifact to disk
+profile_store = profiling.ProfileStore(
+    max_entries=int(os.environ.get("SCHEDULER_PROFILE_STORE_SIZE", "16")),
+    directory=os.environ.get("SCHEDULER_PROFILE_DIR") or None
+)
+# Admin-only features (profiling) are disabled unless this token is configured
+ADMIN_TOKEN = os.environ.get("SCHEDULER_ADMIN_TOKEN") or None
+# Accepted values of the "engine" query parameter
+ENGINE_PATTERN = f"^({'|'.join(ENGINES)})$"
+PROFILER_PATTERN = f"^({'|'.join(profiling.PROFILERS)})$"
+OUTPUT_FORMAT_PATTERN = f"^({'|'.join(columnar.FORMATS)})$"
+# island_model.TOPOLOGIES, spelled out so that the API does not import DEAP to validate requests
+TOPOLOGY_PATTERN = "^(ring|fully_connected|random)$"
+OUTPUT_FORMAT_DESCRIPTION = "json (per-day assignment lists), or the columnar layout as compact JSON or msgpack"
+# Seconds between status checks of the job event stream
+JOB_EVENT_INTERVAL = 0.5
+
+@app.on_event("startup")
+def warm_up():
+    # Runs before the server accepts connections
+    startup.warm_up()
+
+@app.on_event("shutdown")
+def shutdown_job_queue():
+    job_queue.shutdown()
+    batch_runner.shutdown()
+
+def _require_admin(token: Optional[str]):
+    """Admin-only features need SCHEDULER_ADMIN_TOKEN on the server and the same value in X-Admin-Token."""
+    if ADMIN_TOKEN is None:
+        raise HTTPException(status_code=403, detail="Admin features are disabled; set SCHEDULER_ADMIN_TOKEN to enable them")
+    if token is None or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="A valid X-Admin-Token header is required")
+
+def _respond(data: Dict[str, Any], output_format: str, result_key: Optional[str] = None) -> Any:
+    """The data as is, for FastAPI to encode, or already encoded in the columnar layout.
+
+    result_key names the entry holding the schedule result when it is nested (job status).
+    """
+    if output_format == "json":
+        return data
+    if result_key is None:
+        data = columnar.to_columnar(data)
+    elif data.get(result_key) is not None:
+        data = dict(data, **{result_key: columnar.to_columnar(data[result_key])})
+    body, media_type = columnar.encode(data, output_format)
+    return Response(content=body, media_type=media_type)
+
 @app.get("/")
 async def root():
     """
@@ -41,8 +120,16 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "generate_schedule": "/api/generate-schedule",
+            "generate_campus_schedule": "/api/generate-campus-schedule",
+            "generate_schedules_batch": "/api/generate-schedules/batch",
+            "check_feasibility": "/api/check-feasibility",
+            "reschedule": "/api/reschedule",
+            "jobs": "/api/jobs",
+            "cache": "/api/cache",
             "schedule_history": "/api/schedule-history",
             "health": "/api/health",
+            "metrics": "/metrics",
+            "profiles": "/api/profiles",
             "schedule_table": "/api/schedule-table"
         }
     }
@@ -50,26 +137,284 @@ async def root():
 @app.post("/api/generate-schedule", response_model=Dict[str, Any])
 async def generate_schedule(
     input_data: ScheduleInput, 
-    use_ga: bool = Query(False, description="Use genetic algorithm for optimization")
+    use_ga: bool = Query(False, description="Use genetic algorithm for optimization"),
+    time_budget: Optional[float] = Query(None, gt=0, description="Wall-clock budget for the whole request, in seconds"),
+    patience: Optional[int] = Query(None, ge=1, description="Stop the GA after this many generations without improvement"),
+    generations: int = Query(50, ge=0, le=1000, description="Maximum number of GA generations"),
+    seed: Optional[int] = Query(None, description="Random seed for reproducible GA runs"),
+    engine: str = Query("greedy", pattern=ENGINE_PATTERN, description="Construction engine: greedy or csp"),
+    local_search: bool = Query(False, description="Refine the constructed schedule with simulated annealing"),
+    local_search_iterations: int = Query(LOCAL_SEARCH_ITERATIONS, ge=0, le=1000000, description="Move budget of the local-search pass"),
+    islands: int = Query(1, ge=1, le=64, description="Run the GA as this many migrating sub-populations (1: a single population)"),
+    topology: str = Query("ring", pattern=TOPOLOGY_PATTERN, description="Migration topology of the GA islands: ring, fully_connected or random"),
+    stream: bool = Query(False, description="Stream progress as server-sent events instead of waiting for the result"),
+    profile: Optional[str] = Query(None, pattern=PROFILER_PATTERN, description="Admin only: run under cprofile or the sampling profiler"),
+    output_format: str = Query("json", alias="format", pattern=OUTPUT_FORMAT_PATTERN, description=OUTPUT_FORMAT_DESCRIPTION),
+    x_admin_token: Optional[str] = Header(None)
 ):
     """
     Generate a class schedule based on the provided input data.
     
     - **input_data**: The schedule input data including subjects, faculty, breaks, etc.
     - **use_ga**: Whether to use genetic algorithm for optimization (default: False)
+    - **time_budget**: Optional wall-clock limit; the GA stops when it runs out
+    - **patience**: Optional early stopping once the best fitness stalls
+    - **engine**: "csp" searches for a schedule placing every class and reports under "csp"
+      whether it solved the input or proved it infeasible; it falls back to greedy otherwise
+    - **local_search**: Refine the constructed schedule (before any GA) with a simulated-annealing
+      pass that fills missing classes and raises the preference score; reported under "local_search"
+    - **islands**: With use_ga, evolve this many sub-populations in parallel processes that exchange
+      their best individuals along the **topology** (see island_model.py); patience does not apply
     
-    Returns a weekly schedule with time slots and assignments.
+    - **stream**: Respond with server-sent events: "progress" events per greedy subject and
+      GA generation, then one "result" (or "error") event. Closing the connection cancels the run
+    - **profile**: Admin only (X-Admin-Token header). Runs the request under "cprofile" or the
+      low-overhead "sampling" profiler, bypassing the cache. The hottest functions are returned
+      under "profile"; the pstats file or collapsed stacks download from /api/profiles/{id}
+    - **format**: "compact" returns the weekly schedule as columnar arrays over interned subject,
+      faculty and room tables with integer slot ids (see columnar.py), encoded as JSON; "msgpack"
+      encodes the same layout as MessagePack. Much smaller and faster for large schedules
+    
+    Returns a weekly schedule with time slots and assignments. GA runs also report
+    generations run and the best-fitness trajectory under "optimization". "cache" tells
+    whether the result was served from the result cache.
     """
+    if profile is not None:
+        _require_admin(x_admin_token)
+    started = time.monotonic()
     try:
         logger.info(f"Generating schedule with GA: {use_ga}")
-        result = scheduler_service.generate_schedule(input_data, use_ga)
-        return result
+        params = dict(use_ga=use_ga, time_budget=time_budget, patience=patience, generations=generations, seed=seed, engine=engine, local_search=local_search, local_search_iterations=local_search_iterations, islands=islands, topology=topology)
+        if stream and output_format != "json":
+            raise ValueError("format cannot be combined with stream")
+        if profile is not None:
+            if stream:
+                raise ValueError("profile cannot be combined with stream")
+            # A cached result would profile nothing, so profiled runs always go to the engines
+            result, artifact = await run_in_threadpool(profiling.profile_call, profile, SchedulerService().generate_schedule, input_data, **params)
+            profile_store.put(artifact)
+            return _respond(dict(result, cache={"hit": False, "cacheable": False}, profile=dict(artifact.summary, id=artifact.id, download=f"/api/profiles/{artifact.id}")), output_format)
+        key, cached, cache_info = result_cache.lookup(input_data, params)
+        if stream:
+            return StreamingResponse(_stream_generation(input_data, params, key, cached, cache_info), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+        if cached is not None:
+            _request_event(started, params, 200, cached, cache_hit=True)
+            return _respond(dict(cached, cache=cache_info), output_format)
+        # The run is CPU-bound, so it goes to a worker thread with its own service instance
+        result = await run_in_threadpool(SchedulerService().generate_schedule, input_data, **params)
+        result_cache.store(key, result)
+        _request_event(started, params, 200, result, cache_hit=False)
+        return _respond(dict(result, cache=cache_info), output_format)
+    except ValueError as e:
+        logger.error(f"Bad request: {str(e)}")
+        _request_event(started, params, 400, error=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Internal server error: {str(e)}")
+        _request_event(started, params, 500, error_type=type(e).__name__)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+def _request_event(started: float, params: Dict[str, Any], status: int, result: Optional[Dict[str, Any]] = None, **fields):
+    """Structured event for a finished /api/generate-schedule request."""
+    if result is not None:
+        fields.update(total_assignments=result.get("total_assignments"), feasible=result.get("feasibility", {}).get("feasible"))
+    metrics.events.log(logging.INFO if status < 500 else logging.ERROR, "schedule_request", status=status, engine=params["engine"], use_ga=params["use_ga"], local_search=params["local_search"], elapsed_ms=round((time.monotonic() - started) * 1000, 2), **fields)
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _stream_generation(input_data: ScheduleInput, params: Dict[str, Any], key: Optional[str], cached: Optional[Dict[str, Any]], cache_info: Dict[str, Any]):
+    """Run a generation in a worker thread and relay its progress events; a disconnect cancels the run."""
+    if cached is not None:
+        yield _sse("result", dict(cached, cache=cache_info))
+        return
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+    progress = lambda event: loop.call_soon_threadsafe(events.put_nowait, event)
+    run = asyncio.ensure_future(run_in_threadpool(SchedulerService().generate_schedule, input_data, should_stop=cancelled.is_set, progress=progress, **params))
+    try:
+        while not run.done() or not events.empty():
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({next_event, run}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                yield _sse("progress", next_event.result())
+            else:
+                next_event.cancel()
+        try:
+            result = run.result()
+        except ValueError as e:
+            logger.error(f"Bad request: {str(e)}")
+            yield _sse("error", {"status_code": 400, "detail": str(e)})
+            return
+        except Exception as e:
+            logger.error(f"Internal server error: {str(e)}")
+            yield _sse("error", {"status_code": 500, "detail": f"Internal server error: {str(e)}"})
+            return
+        result_cache.store(key, result)
+        yield _sse("result", dict(result, cache=cache_info))
+    finally:
+        if not run.done():
+            # The client went away; the worker stops at its next checkpoint
+            logger.info("Client disconnected, cancelling schedule generation")
+            cancelled.set()
+            run.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+@app.post("/api/generate-campus-schedule", response_model=Dict[str, Any])
+async def generate_campus_schedule(
+    input_data: ScheduleInput,
+    output_format: str = Query("json", alias="format", pattern=OUTPUT_FORMAT_PATTERN, description=OUTPUT_FORMAT_DESCRIPTION)
+):
+    """
+    Generate schedules for all rooms of a campus in one run.
+
+    - **input_data.rooms**: every room to schedule
+    - **subjects[].room_id**: room a subject is taught in; subjects without one may use any room
+    - **format**: "compact" or "msgpack" return the columnar layout (see /api/generate-schedule);
+      the per-room schedules are then left out, since the "room" column splits the combined one
+
+    Faculty shared between rooms are never double-booked. Returns the combined weekly
+    schedule plus one schedule per room under "rooms".
+    """
+    try:
+        logger.info(f"Generating campus schedule for {len(input_data.rooms)} rooms")
+        key, cached, cache_info = result_cache.lookup(input_data, {"campus": True})
+        if cached is not None:
+            return _respond(dict(cached, cache=cache_info), output_format)
+        result = await run_in_threadpool(SchedulerService().generate_campus_schedule, input_data)
+        result_cache.store(key, result)
+        return _respond(dict(result, cache=cache_info), output_format)
+    except ValueError as e:
+        logger.error(f"Bad request: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Internal server error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/api/generate-schedules/batch")
+async def generate_schedules_batch(
+    request: BatchScheduleInput,
+    use_ga: bool = Query(False, description="Use genetic algorithm for optimization"),
+    time_budget: Optional[float] = Query(None, gt=0, description="Wall-clock budget per room, in seconds"),
+    patience: Optional[int] = Query(None, ge=1, description="Stop the GA after this many generations without improvement"),
+    generations: int = Query(50, ge=0, le=1000, description="Maximum number of GA generations"),
+    seed: Optional[int] = Query(None, description="Random seed for reproducible GA runs"),
+    engine: str = Query("greedy", pattern=ENGINE_PATTERN, description="Construction engine: greedy or csp"),
+    local_search: bool = Query(False, description="Refine the constructed schedule with simulated annealing"),
+    local_search_iterations: int = Query(LOCAL_SEARCH_ITERATIONS, ge=0, le=1000000, description="Move budget of the local-search pass"),
+    islands: int = Query(1, ge=1, le=64, description="Run the GA as this many migrating sub-populations (1: a single population)"),
+    topology: str = Query("ring", pattern=TOPOLOGY_PATTERN, description="Migration topology of the GA islands: ring, fully_connected or random")
+):
+    """
+    Generate the schedules of many rooms in one request.
+
+    - **inputs**: One input per room, each scheduled like /api/generate-schedule with the
+      same query parameters (time_budget applies per room)
+
+    Rooms are solved in parallel by a worker pool. Rooms with the same college time, breaks
+    and subject durations share their slot grid and eligibility filters. The response is
+    newline-delimited JSON with one line per room, in completion order:
+    {"index", "room", "status": "completed" | "failed" | "cancelled", "result" or "error"}.
+    A final {"summary": ...} line follows. Cached rooms are reported first. Closing the
+    connection cancels the rooms that have not finished.
+    """
+    params = dict(use_ga=use_ga, time_budget=time_budget, patience=patience, generations=generations, seed=seed, engine=engine, local_search=local_search, local_search_iterations=local_search_iterations, islands=islands, topology=topology)
+    if not request.inputs:
+        raise HTTPException(status_code=400, detail="A batch needs at least one room input")
+    if len(request.inputs) > batch_runner.max_rooms:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {batch_runner.max_rooms} room inputs, got {len(request.inputs)}")
+    logger.info(f"Generating batch of {len(request.inputs)} room schedule(s) with GA: {use_ga}")
+    return StreamingResponse(_stream_batch(request.inputs, params), media_type="application/x-ndjson")
+
+def _batch_line(index: int, input_data: ScheduleInput, **data) -> str:
+    room = input_data.rooms[0] if input_data.rooms else None
+    return json.dumps(dict(index=index, room=room, **data)) + "\n"
+
+async def _stream_batch(inputs: List[ScheduleInput], params: Dict[str, Any]):
+    started = time.monotonic()
+    lookups = [result_cache.lookup(input_data, params) for input_data in inputs]
+    pending = [index for index, (_, cached, _) in enumerate(lookups) if cached is None]
+    futures, control = batch_runner.submit([inputs[index] for index in pending], params) if pending else ([], None)
+    waiting = {asyncio.wrap_future(future): index for future, index in zip(futures, pending)}
+    counts = {"completed": 0, "failed": 0, "cancelled": 0}
+    try:
+        for index, (_, cached, cache_info) in enumerate(lookups):
+            if cached is not None:
+                counts["completed"] += 1
+                yield _batch_line(index, inputs[index], status="completed", result=dict(cached, cache=cache_info))
+        remaining = set(waiting)
+        while remaining:
+            done, remaining = await asyncio.wait(remaining, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = waiting[future]
+                key, _, cache_info = lookups[index]
+                try:
+                    result, samples = future.result()
+                except (asyncio.CancelledError, GenerationCancelled):
+                    counts["cancelled"] += 1
+                    yield _batch_line(index, inputs[index], status="cancelled")
+                    continue
+                except Exception as e:
+                    counts["failed"] += 1
+                    logger.error(f"Batch room {index} failed: {str(e)}")
+                    yield _batch_line(index, inputs[index], status="failed", error=str(e), error_type=type(e).__name__)
+                    continue
+                metrics.REGISTRY.merge(samples)
+                result_cache.store(key, result)
+                counts["completed"] += 1
+                yield _batch_line(index, inputs[index], status="completed", result=dict(result, cache=cache_info))
+        summary = dict(counts, rooms=len(inputs), elapsed_ms=round((time.monotonic() - started) * 1000, 2))
+        metrics.events.info("batch_finished", **summary)
+        yield json.dumps({"summary": summary}) + "\n"
+    finally:
+        if any(not future.done() for future in waiting):
+            logger.info("Batch client disconnected; cancelling unfinished rooms")
+            # Cancelling the wrappers also drops the rooms still waiting for a worker
+            for future in waiting:
+                future.cancel()
+            batch_runner.cancel(futures, control)
+
+@app.post("/api/check-feasibility", response_model=Dict[str, Any])
+async def check_feasibility(input_data: ScheduleInput):
+    """
+    Check whether every required class can possibly be placed, without generating a schedule.
+
+    Reports per subject the eligible (faculty, slot) pairs and days, the subjects that are
+    impossible and why, and a room-slot capacity bound with the bottleneck subjects.
+    "feasible": true only means that no bound rules the input out. "warnings" lists the
+    subjects that cannot get at most one class per day, which the greedy and CSP engines assume.
+    """
+    try:
+        return await run_in_threadpool(SchedulerService().check_feasibility, input_data)
     except ValueError as e:
         logger.error(f"Bad request: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Internal server error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/api/reschedule", response_model=Dict[str, Any])
+async def reschedule(request: RescheduleInput):
+    """
+    Repair a previous schedule after small input edits instead of regenerating it.
+
+    - **input_data**: the input the previous schedule was generated from
+    - **previous_schedule**: its assignments
+    - **changes**: faculty availability, classes per week, added/removed subjects or new breaks
+
+    Unaffected assignments are kept as they are. The response lists the removed and added
+    assignments and any classes that could not be placed under "changes".
+    """
+    try:
+        logger.info(f"Rescheduling {len(request.previous_schedule)} assignments")
+        return await run_in_threadpool(SchedulerService().reschedule, request.input_data, request.previous_schedule, request.changes)
+    except ValueError as e:
+        logger.error(f"Bad request: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Internal server error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 # uvicorn main:app --reload --port 8000
 @app.post("/generate_schedule", response_model=Dict[str, Any])
 async def generate_schedule_legacy(
@@ -79,7 +424,136 @@ async def generate_schedule_legacy(
     """
     Legacy endpoint for backward compatibility.
     """
-    return await generate_schedule(input_data, use_ga)
+    return await generate_schedule(input_data, use_ga, time_budget=None, patience=None, generations=50, seed=None, engine="greedy", local_search=False, local_search_iterations=LOCAL_SEARCH_ITERATIONS, islands=1, topology="ring", stream=False, profile=None, x_admin_token=None, output_format="json")
+
+@app.post("/api/jobs", response_model=Dict[str, Any], status_code=202)
+async def submit_job(
+    input_data: ScheduleInput,
+    use_ga: bool = Query(False, description="Use genetic algorithm for optimization"),
+    time_budget: Optional[float] = Query(None, gt=0, description="Wall-clock budget for the whole run, in seconds"),
+    patience: Optional[int] = Query(None, ge=1, description="Stop the GA after this many generations without improvement"),
+    generations: int = Query(50, ge=0, le=1000, description="Maximum number of GA generations"),
+    seed: Optional[int] = Query(None, description="Random seed for reproducible GA runs"),
+    engine: str = Query("greedy", pattern=ENGINE_PATTERN, description="Construction engine: greedy or csp"),
+    local_search: bool = Query(False, description="Refine the constructed schedule with simulated annealing"),
+    local_search_iterations: int = Query(LOCAL_SEARCH_ITERATIONS, ge=0, le=1000000, description="Move budget of the local-search pass"),
+    islands: int = Query(1, ge=1, le=64, description="Run the GA as this many migrating sub-populations (1: a single population)"),
+    topology: str = Query("ring", pattern=TOPOLOGY_PATTERN, description="Migration topology of the GA islands: ring, fully_connected or random"),
+    campus: bool = Query(False, description="Schedule all rooms jointly (greedy engine only)")
+):
+    """
+    Queue a schedule generation job and return its id immediately.
+
+    Poll **/api/jobs/{job_id}** or stream **/api/jobs/{job_id}/events** for the status and result.
+    Returns 429 when the queue is full.
+    """
+    if campus and (use_ga or local_search):
+        raise HTTPException(status_code=400, detail="Campus jobs do not support use_ga or local_search")
+    try:
+        if campus:
+            job = job_queue.submit(input_data, campus=True)
+        else:
+            job = job_queue.submit(input_data, use_ga=use_ga, time_budget=time_budget, patience=patience, generations=generations, seed=seed, engine=engine, local_search=local_search, local_search_iterations=local_search_iterations, islands=islands, topology=topology)
+    except QueueFullError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_dict(include_result=False)
+
+@app.get("/api/jobs", response_model=List[Dict[str, Any]])
+async def list_jobs():
+    """
+    List known jobs (pending and recently finished) without their results.
+    """
+    return [job.to_dict(include_result=False) for job in job_queue.all()]
+
+@app.get("/api/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_job(
+    job_id: str,
+    output_format: str = Query("json", alias="format", pattern=OUTPUT_FORMAT_PATTERN, description=OUTPUT_FORMAT_DESCRIPTION)
+):
+    """
+    Get the status of a job, including the schedule once it has completed.
+    With format "compact" or "msgpack" the schedule under "result" uses the columnar layout.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    try:
+        return _respond(job.to_dict(), output_format, result_key="result")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.delete("/api/jobs/{job_id}", response_model=Dict[str, Any])
+async def cancel_job(job_id: str):
+    """
+    Cancel a job. Queued jobs are dropped at once; running jobs stop at their next checkpoint.
+    """
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.to_dict(include_result=False)
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream job status changes as server-sent events; the last event carries the final state and result.
+    "progress" events carry the latest progress of a running job, sampled every JOB_EVENT_INTERVAL seconds.
+    """
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    async def events():
+        last_status = last_progress = None
+        while True:
+            job = job_queue.get(job_id)
+            if job is None:
+                break
+            if job.status != last_status:
+                last_status = job.status
+                yield _sse("status", job.to_dict())
+            elif job.progress != last_progress:
+                yield _sse("progress", job.progress)
+            last_progress = job.progress
+            if job.status in FINAL_STATES:
+                break
+            await asyncio.sleep(JOB_EVENT_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/api/cache", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """
+    Result cache size and hit/miss counters.
+    """
+    return result_cache.stats()
+
+@app.delete("/api/cache", response_model=Dict[str, Any])
+async def clear_cache():
+    """
+    Drop every cached result, in memory and on disk.
+    """
+    result_cache.clear()
+    return result_cache.stats()
+
+@app.get("/api/profiles", response_model=List[Dict[str, Any]])
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """
+    Admin only: the profiles still held in memory, oldest first.
+    """
+    _require_admin(x_admin_token)
+    return profile_store.entries()
+
+@app.get("/api/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """
+    Admin only: download a profile artifact. cprofile runs give a pstats file
+    (python -m pstats, snakeviz); sampling runs give collapsed stacks (flamegraph.pl, speedscope).
+    """
+    _require_admin(x_admin_token)
+    artifact = profile_store.get(profile_id)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return Response(content=artifact.data, media_type=artifact.media_type, headers={"Content-Disposition": f'attachment; filename="{artifact.filename}"'})
 
 @app.get("/api/schedule-history", response_model=List[Dict[str, Any]])
 async def get_schedule_history():
@@ -111,9 +585,17 @@ async def get_schedule_table():
         logger.error(f"Error retrieving schedule table: {str(e)}")
         return f"<p>Error: {str(e)}</p>"
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Counters and timers of the scheduling hot paths in the Prometheus text format.
+    Runs of background jobs are included once they finish. No samples are recorded when SCHEDULER_METRICS=0.
+    """
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/health")
 async def health_check():
     """
-    Health check endpoint to verify the API is running.
+    Health check endpoint to verify the API is running, with the start-to-ready report of this worker process.
     """
-    return {"status": "healthy", "version": "1.0.0"}
+    return {"status": "healthy", "version": "1.0.0", "startup": startup.report()}
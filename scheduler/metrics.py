@@ -0,0 +1,136 @@
+# In-process counters and timers for the scheduling hot paths, and structured request/job events
+# Exposed in the Prometheus text format by GET /metrics. Set SCHEDULER_METRICS=0 to disable
+# collection; every call then returns after a single attribute check.
+# Request and job lifecycle events go through structlog as JSON lines on the "scheduler.events"
+# logger, gated by SCHEDULER_EVENT_LEVEL (default INFO; e.g. WARNING turns them off).
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+import structlog
+
+PREFIX = "scheduler_"
+COUNTER = "counter"
+SUMMARY = "summary"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Metric:
+    """A counter (one value per label set) or a timer summary (count and sum of seconds per label set)."""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, kind: str, description: str):
+        self.registry = registry
+        self.name = name
+        self.kind = kind
+        self.description = description
+        self.values: Dict[Labels, List[float]] = {}
+
+    def _add(self, count: float, total: float, labels: Dict[str, str]):
+        key = tuple(sorted(labels.items()))
+        with self.registry.lock:
+            value = self.values.get(key)
+            if value is None:
+                self.values[key] = [count, total]
+            else:
+                value[0] += count
+                value[1] += total
+
+    def inc(self, amount: float = 1, **labels: str):
+        if self.registry.enabled:
+            self._add(amount, 0.0, labels)
+
+    def observe(self, seconds: float, count: int = 1, **labels: str):
+        """Record count events that took seconds in total."""
+        if self.registry.enabled:
+            self._add(count, seconds, labels)
+
+    @contextmanager
+    def time(self, count: int = 1, **labels: str) -> Iterator[None]:
+        if not self.registry.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(count, time.perf_counter() - started, labels)
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, Metric] = {}
+
+    def _metric(self, name: str, kind: str, description: str) -> Metric:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Metric(self, name, kind, description)
+        return metric
+
+    def counter(self, name: str, description: str) -> Metric:
+        return self._metric(name, COUNTER, description)
+
+    def timer(self, name: str, description: str) -> Metric:
+        return self._metric(name, SUMMARY, description)
+
+    def snapshot(self) -> Dict[str, Dict[Labels, List[float]]]:
+        with self.lock:
+            return {name: {key: list(value) for key, value in metric.values.items()} for name, metric in self.metrics.items()}
+
+    def merge(self, snapshot: Dict[str, Dict[Labels, List[float]]]):
+        """Add a snapshot taken in another process (e.g. a job worker)."""
+        if not self.enabled:
+            return
+        for name, values in snapshot.items():
+            metric = self.metrics.get(name)
+            if metric is None:
+                continue
+            for key, (count, total) in values.items():
+                metric._add(count, total, dict(key))
+
+    def reset(self):
+        with self.lock:
+            for metric in self.metrics.values():
+                metric.values.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+        for name, values in sorted(self.snapshot().items()):
+            metric = self.metrics[name]
+            full_name = PREFIX + name
+            lines.append(f"# HELP {full_name} {metric.description}")
+            lines.append(f"# TYPE {full_name} {metric.kind}")
+            for key, (count, total) in sorted(values.items()):
+                labels = "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}" if key else ""
+                if metric.kind == COUNTER:
+                    lines.append(f"{full_name}{labels} {count:g}")
+                else:
+                    lines.append(f"{full_name}_count{labels} {count:g}")
+                    lines.append(f"{full_name}_sum{labels} {total:.6f}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry(enabled=os.environ.get("SCHEDULER_METRICS", "1") != "0")
+
+slot_generation = REGISTRY.timer("slot_generation_seconds", "Time spent building weekly slot grids (cache misses only)")
+slot_grid_lookups = REGISTRY.counter("slot_grid_lookups_total", "Weekly slot grid lookups, by result (hit or miss)")
+eligibility_build = REGISTRY.timer("eligibility_build_seconds", "Time spent building the (subject, faculty) eligibility index")
+generation = REGISTRY.timer("generation_seconds", "Time spent in SchedulerService.generate_schedule, by engine")
+greedy_phase = REGISTRY.timer("greedy_phase_seconds", "Time spent in the greedy construction phase")
+classes_placed = REGISTRY.counter("classes_placed_total", "Classes placed by the greedy construction phase")
+classes_unplaced = REGISTRY.counter("classes_unplaced_total", "Required classes the greedy construction phase could not place")
+ga_generations = REGISTRY.timer("ga_generation_seconds", "Time spent per GA generation")
+fitness_evaluations = REGISTRY.timer("fitness_evaluation_seconds", "Time spent evaluating schedule fitness, by evaluator")
+startup = REGISTRY.timer("startup_seconds", "Start-to-ready time of the API process, by phase (import, warmup)")
+
+EVENT_LEVEL = logging.getLevelName(os.environ.get("SCHEDULER_EVENT_LEVEL", "INFO").upper())
+if not isinstance(EVENT_LEVEL, int):
+    EVENT_LEVEL = logging.INFO
+# Wrapped rather than configured globally; calls below EVENT_LEVEL return without rendering
+events = structlog.wrap_logger(
+    logging.getLogger("scheduler.events"),
+    processors=[structlog.processors.add_log_level, structlog.processors.TimeStamper(fmt="iso"), structlog.processors.JSONRenderer()],
+    wrapper_class=structlog.make_filtering_bound_logger(EVENT_LEVEL)
+)
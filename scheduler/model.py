@@ -1,18 +1,67 @@
 ## This file is part of the College Scheduler project.
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, NamedTuple
+
+# Valid days of the week
+VALID_DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY"]
+
+# Day index used by SlotRecord; the wildcard matches every day, unknown days match nothing.
+# Availability slots and breaks ("ALL_DAYS") and preferences ("ANY_DAY") have a wildcard day name;
+# schedule assignments do not
+ALL_DAYS_INDEX = -1
+UNKNOWN_DAY_INDEX = -2
+DAY_INDEX = {day: i for i, day in enumerate(VALID_DAYS)}
+
+class SlotRecord(NamedTuple):
+    """Compact integer form of a slot: day index plus start/end in minutes since midnight."""
+    day: int
+    start: int
+    end: int
+
+    @classmethod
+    def from_strings(cls, day: str, start_time: str, end_time: str, wildcard: Optional[str] = None) -> "SlotRecord":
+        """wildcard is the day name that stands for every day, if the slot kind has one."""
+        # Imported here because utils imports this module
+        from utils import time_to_minutes
+        day_index = ALL_DAYS_INDEX if wildcard is not None and day == wildcard else DAY_INDEX.get(day, UNKNOWN_DAY_INDEX)
+        return cls(day_index, time_to_minutes(start_time), time_to_minutes(end_time))
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+    def same_day(self, other: "SlotRecord") -> bool:
+        """True if both records fall on the same day; the wildcard day (ALL_DAYS availability and breaks, ANY_DAY preferences) matches every known day."""
+        if self.day == ALL_DAYS_INDEX or other.day == ALL_DAYS_INDEX:
+            return self.day != UNKNOWN_DAY_INDEX and other.day != UNKNOWN_DAY_INDEX
+        return self.day == other.day
+
+    def overlaps(self, other: "SlotRecord") -> bool:
+        return self.same_day(other) and self.start < other.end and other.start < self.end
+
+    def contains(self, other: "SlotRecord") -> bool:
+        return self.same_day(other) and self.start <= other.start and other.end <= self.end
 
 @dataclass
 class TimeSlot:
-    day: str  # e.g., "MONDAY", "TUESDAY", ..., "SATURDAY"
+    day: str  # e.g., "MONDAY", "TUESDAY", ..., "SATURDAY"; faculty availability may use "ALL_DAYS"
     startTime: str  # e.g., "09:30" (24-hour format)
     endTime: str  # e.g., "10:20" (24-hour format)
+    record: SlotRecord = field(init=False, repr=False, compare=False)  # Parsed once at ingest
+
+    def __post_init__(self):
+        # Faculty availability is a list of TimeSlots; generated slots always fall on a valid day
+        self.record = SlotRecord.from_strings(self.day, self.startTime, self.endTime, wildcard="ALL_DAYS")
 
 @dataclass
 class Break:
     day: str  # "MONDAY", "TUESDAY", ..., "SATURDAY", or "ALL_DAYS" for all weekdays
     startTime: str  # e.g., "11:10" (24-hour format)
     endTime: str  # e.g., "11:20" (24-hour format)
+    record: SlotRecord = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.record = SlotRecord.from_strings(self.day, self.startTime, self.endTime, wildcard="ALL_DAYS")
 
 @dataclass
 class PreferredSlot:
@@ -20,6 +69,10 @@ class PreferredSlot:
     startTime: str
     endTime: str
     priority: int = 1  # 1=highest, 5=lowest priority
+    record: SlotRecord = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.record = SlotRecord.from_strings(self.day, self.startTime, self.endTime, wildcard="ANY_DAY")
 
 @dataclass
 class Faculty:
@@ -42,6 +95,7 @@ class Subject:
     is_special: bool = False  # Mark as special class (lab, practical, etc.)
     preferred_slots: List[PreferredSlot] = None  # Subject-specific preferred slots
     requires_consecutive: bool = False  # For labs that need consecutive periods
+    room_id: Optional[str] = None  # Campus mode: room the subject is taught in (None = any room)
     
     def __post_init__(self):
         if self.duration is None:
@@ -69,6 +123,10 @@ class ScheduleAssignment:
     room_id: str
     is_special: bool = False
     priority_score: int = 0  # Higher score = better preference match
+    record: SlotRecord = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.record = SlotRecord.from_strings(self.day, self.startTime, self.endTime)
 
     def model_dump(self) -> Dict[str, Any]:
         """Return all fields as a dictionary for compatibility with SchedulerService."""
@@ -90,3 +148,31 @@ class ScheduleInput:
     break_: List[Break]
     college_time: CollegeTime
     rooms: List[str]
+
+@dataclass
+class ScheduleChanges:
+    faculty_availability: Dict[str, List[TimeSlot]] = None  # Faculty id -> new availability
+    classes_per_week: Dict[str, int] = None  # Subject name -> new no_of_classes_per_week
+    added_subjects: List[Subject] = None
+    removed_subjects: List[str] = None
+    break_: Optional[List[Break]] = None  # Replaces all breaks when given
+
+    def __post_init__(self):
+        if self.faculty_availability is None:
+            self.faculty_availability = {}
+        if self.classes_per_week is None:
+            self.classes_per_week = {}
+        if self.added_subjects is None:
+            self.added_subjects = []
+        if self.removed_subjects is None:
+            self.removed_subjects = []
+
+@dataclass
+class RescheduleInput:
+    input_data: ScheduleInput  # Input the previous schedule was generated from
+    previous_schedule: List[ScheduleAssignment]
+    changes: ScheduleChanges
+
+@dataclass
+class BatchScheduleInput:
+    inputs: List[ScheduleInput]  # One single-room input per room, solved independently
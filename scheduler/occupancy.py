@@ -0,0 +1,83 @@
+# Weekly occupancy bitmaps for faculty and room conflict detection.
+# The week is cut into fixed-width cells; every slot maps to a contiguous run of bits,
+# so "is this faculty/room free?" is a single AND and occupy/release a single OR/AND-NOT.
+from math import gcd
+from typing import Dict, Iterable, Optional
+from model import SlotRecord, VALID_DAYS, ALL_DAYS_INDEX
+
+MINUTES_PER_DAY = 24 * 60
+
+class SlotGrid:
+    """Discretization of the week shared by every occupancy index built for one request."""
+
+    def __init__(self, records: Iterable[SlotRecord]):
+        # The cell width divides every slot boundary, so masks of aligned slots are exact
+        unit = 0
+        for record in records:
+            unit = gcd(unit, record.start, record.end)
+        self.unit = unit or 1
+        self.cells_per_day = -(-MINUTES_PER_DAY // self.unit)
+        self._masks: Dict[SlotRecord, int] = {}
+
+    @classmethod
+    def from_slots(cls, slots: Iterable) -> "SlotGrid":
+        """Build a grid over the records of TimeSlot-like objects (e.g. generate_weekly_time_slots output)."""
+        return cls(slot.record for slot in slots)
+
+    def mask(self, record: SlotRecord) -> int:
+        """Bitmask of the cells covered by record; unaligned records are rounded outwards."""
+        mask = self._masks.get(record)
+        if mask is None:
+            first = record.start // self.unit
+            last = -(-record.end // self.unit)
+            day_mask = ((1 << (last - first)) - 1) << first if last > first else 0
+            if record.day == ALL_DAYS_INDEX:
+                mask = 0
+                for day in range(len(VALID_DAYS)):
+                    mask |= day_mask << (day * self.cells_per_day)
+            elif 0 <= record.day < len(VALID_DAYS):
+                mask = day_mask << (record.day * self.cells_per_day)
+            else:
+                mask = 0
+            self._masks[record] = mask
+        return mask
+
+class OccupancyIndex:
+    """Per-faculty and per-room weekly occupancy bitmaps over a SlotGrid."""
+
+    def __init__(self, grid: SlotGrid):
+        self.grid = grid
+        self.faculty: Dict[str, int] = {}
+        self.rooms: Dict[str, int] = {}
+
+    def faculty_free(self, faculty_id: str, record: SlotRecord) -> bool:
+        return not self.faculty.get(faculty_id, 0) & self.grid.mask(record)
+
+    def room_free(self, room_id: str, record: SlotRecord) -> bool:
+        return not self.rooms.get(room_id, 0) & self.grid.mask(record)
+
+    def is_free(self, faculty_id: str, room_id: Optional[str], record: SlotRecord) -> bool:
+        """True if neither the faculty nor the room is busy at any point of record."""
+        mask = self.grid.mask(record)
+        if self.faculty.get(faculty_id, 0) & mask:
+            return False
+        return room_id is None or not self.rooms.get(room_id, 0) & mask
+
+    def occupy(self, faculty_id: str, room_id: Optional[str], record: SlotRecord):
+        mask = self.grid.mask(record)
+        self.faculty[faculty_id] = self.faculty.get(faculty_id, 0) | mask
+        if room_id is not None:
+            self.rooms[room_id] = self.rooms.get(room_id, 0) | mask
+
+    def release(self, faculty_id: str, room_id: Optional[str], record: SlotRecord):
+        """Free record for the faculty and room; assumes it was occupied without overlaps."""
+        mask = ~self.grid.mask(record)
+        self.faculty[faculty_id] = self.faculty.get(faculty_id, 0) & mask
+        if room_id is not None:
+            self.rooms[room_id] = self.rooms.get(room_id, 0) & mask
+
+    def copy(self) -> "OccupancyIndex":
+        clone = OccupancyIndex(self.grid)
+        clone.faculty = dict(self.faculty)
+        clone.rooms = dict(self.rooms)
+        return clone
@@ -0,0 +1,175 @@
+# Per-request profiling for diagnosing slow inputs in production
+# Runs one call under cProfile (exact call counts and times, noticeable overhead) or a stack
+# sampler (low overhead, collapsed stacks for flamegraph.pl/speedscope). The artifact is kept in a
+# small in-memory store, optionally mirrored to a directory, and a summary of the hottest
+# functions is returned with the result.
+import cProfile
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "sampling")
+# Seconds between two stack samples
+SAMPLE_INTERVAL = 0.005
+# Functions listed in the summary
+TOP_FUNCTIONS = 25
+
+@dataclass
+class ProfileArtifact:
+    id: str
+    profiler: str
+    media_type: str
+    filename: str
+    data: bytes
+    summary: Dict[str, Any] = field(default_factory=dict)
+
+def _label(filename: str, line: int, name: str) -> str:
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+class StackSampler:
+    """Samples the stack of one thread from a background thread and counts collapsed stacks.
+
+    Frames at and above the root code object (the profiling wrapper) are left out.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL, root: Optional[Any] = None):
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not self.root:
+                code = frame.f_code
+                stack.append(_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+def _cprofile_artifact(profiler: cProfile.Profile, elapsed: float) -> ProfileArtifact:
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+    top = [{
+        "function": _label(*func),
+        "calls": calls,
+        "self_ms": round(own * 1000, 3),
+        "cumulative_ms": round(cumulative * 1000, 3),
+    } for func, (_, calls, own, cumulative, _) in rows]
+    profile_id = uuid.uuid4().hex
+    # Same format as pstats.Stats.dump_stats, so the file loads with pstats or snakeviz
+    return ProfileArtifact(
+        id=profile_id,
+        profiler="cprofile",
+        media_type="application/octet-stream",
+        filename=f"{profile_id}.pstats",
+        data=marshal.dumps(stats.stats),
+        summary={"profiler": "cprofile", "elapsed_ms": round(elapsed * 1000, 2), "total_calls": stats.total_calls, "top": top}
+    )
+
+def _sampling_artifact(sampler: StackSampler, elapsed: float) -> ProfileArtifact:
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, count in sampler.stacks.items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    samples = sum(sampler.stacks.values())
+    hottest = sorted(total, key=lambda frame: (own[frame], total[frame]), reverse=True)[:TOP_FUNCTIONS]
+    top = [{
+        "function": frame,
+        "self_samples": own[frame],
+        "total_samples": total[frame],
+    } for frame in hottest]
+    profile_id = uuid.uuid4().hex
+    collapsed = "".join(f"{stack} {count}\n" for stack, count in sorted(sampler.stacks.items()))
+    return ProfileArtifact(
+        id=profile_id,
+        profiler="sampling",
+        media_type="text/plain",
+        filename=f"{profile_id}.folded",
+        data=collapsed.encode(),
+        summary={"profiler": "sampling", "elapsed_ms": round(elapsed * 1000, 2), "samples": samples, "interval_ms": sampler.interval * 1000, "top": top}
+    )
+
+def profile_call(profiler: str, func: Callable, *args, **kwargs) -> Tuple[Any, ProfileArtifact]:
+    """Run func(*args, **kwargs) in the current thread under the given profiler.
+
+    Only the calling thread is profiled; work handed to process pools (GA workers) shows up
+    as time spent waiting on them.
+    """
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler '{profiler}'; expected one of {', '.join(PROFILERS)}")
+    started = time.perf_counter()
+    if profiler == "cprofile":
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profile.disable()
+        artifact = _cprofile_artifact(profile, time.perf_counter() - started)
+    else:
+        with StackSampler(threading.get_ident(), root=profile_call.__code__) as sampler:
+            result = func(*args, **kwargs)
+        artifact = _sampling_artifact(sampler, time.perf_counter() - started)
+    logger.info(f"Profiled {getattr(func, '__name__', func)} with {profiler} in {artifact.summary['elapsed_ms']} ms (profile {artifact.id})")
+    return result, artifact
+
+class ProfileStore:
+    """Thread-safe LRU of recent profile artifacts with an optional directory the files are written to."""
+
+    def __init__(self, max_entries: int = 16, directory: Optional[str] = None):
+        if max_entries < 0:
+            raise ValueError("Profile store size must not be negative")
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: "OrderedDict[str, ProfileArtifact]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def put(self, artifact: ProfileArtifact):
+        with self._lock:
+            self._entries[artifact.id] = artifact
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if self.directory:
+            try:
+                with open(os.path.join(self.directory, artifact.filename), "wb") as f:
+                    f.write(artifact.data)
+            except OSError as e:
+                logger.warning(f"Could not write profile {artifact.id}: {e}")
+
+    def get(self, profile_id: str) -> Optional[ProfileArtifact]:
+        with self._lock:
+            return self._entries.get(profile_id)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"id": a.id, "profiler": a.profiler, "filename": a.filename, "size": len(a.data), "elapsed_ms": a.summary.get("elapsed_ms")} for a in self._entries.values()]
@@ -0,0 +1,216 @@
+# Content-addressed cache of schedule generation results
+# Results are keyed by a SHA-256 of the normalized ScheduleInput plus the engine parameters,
+# kept in an in-memory LRU and optionally mirrored to a directory of JSON files that survives restarts.
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Optional, Tuple
+from model import ScheduleInput
+from csp_solver import SOLVED, INFEASIBLE
+from utils import time_to_minutes, minutes_to_time
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Bumped whenever engine output changes, so stale disk entries are never served
+CACHE_VERSION = 5
+_TIME_FIELDS = ("startTime", "endTime")
+_GA_PARAMS = ("patience", "generations", "islands", "topology")
+_LOCAL_SEARCH_PARAMS = ("local_search_iterations",)
+# Only matter to the randomized passes (GA and local search), and time_budget to the CSP search
+_RANDOM_PARAMS = ("time_budget", "seed")
+# CSP outcomes that do not depend on how much time the search got; a timeout falls back to greedy
+_FINAL_CSP_STATUSES = (SOLVED, INFEASIBLE)
+
+def _normalize(value: Any, name: Optional[str] = None) -> Any:
+    """JSON-ready form of input dataclasses; derived fields are skipped and times canonicalized."""
+    if is_dataclass(value):
+        return {f.name: _normalize(getattr(value, f.name), f.name) for f in fields(value) if f.init}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if name in _TIME_FIELDS and isinstance(value, str):
+        try:
+            return minutes_to_time(time_to_minutes(value))
+        except ValueError:
+            return value
+    return value
+
+def _is_randomized(params: Dict[str, Any]) -> bool:
+    return bool(params.get("use_ga") or params.get("local_search"))
+
+def is_cacheable(params: Dict[str, Any]) -> bool:
+    """Greedy runs are deterministic; GA and local-search runs only with a fixed seed and no wall-clock budget.
+
+    Seeded runs draw from their own random.Random, never the global RNG, so a run that shared
+    the process with other requests gives what the same seed gives on its own.
+
+    CSP runs are looked up too, but only stored when the search finished (see is_final).
+    """
+    if not _is_randomized(params):
+        return True
+    return params.get("seed") is not None and params.get("time_budget") is None
+
+def cache_key(input_data: ScheduleInput, params: Dict[str, Any]) -> str:
+    # Drop settings of passes that do not run, so equivalent requests share an entry
+    ignored = set()
+    if not params.get("use_ga"):
+        ignored.update(_GA_PARAMS)
+    if not params.get("local_search"):
+        ignored.update(_LOCAL_SEARCH_PARAMS)
+    if params.get("islands", 1) == 1:
+        # A single population, keyed as before the island model was selectable
+        ignored.update(("islands", "topology"))
+    else:
+        # Islands have no patience stop
+        ignored.add("patience")
+    if not _is_randomized(params):
+        ignored.update(_RANDOM_PARAMS)
+        if params.get("engine") == "csp":
+            # The search is bounded by the budget, so a larger one may solve what a smaller one did not
+            ignored.discard("time_budget")
+    params = {k: v for k, v in params.items() if k not in ignored}
+    payload = {
+        "version": CACHE_VERSION,
+        "input": _normalize(input_data),
+        "params": {k: v for k, v in sorted(params.items()) if v is not None},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def is_final(result: Dict[str, Any]) -> bool:
+    """False for results that depend on wall-clock time: CSP runs that timed out and fell back to greedy."""
+    csp = result.get("csp")
+    return csp is None or csp.get("status") in _FINAL_CSP_STATUSES
+
+class ResultCache:
+    """Thread-safe LRU of generation results with an optional on-disk backend."""
+
+    def __init__(self, max_entries: int = 128, directory: Optional[str] = None, max_disk_entries: int = 1024):
+        if max_entries < 0 or max_disk_entries < 0:
+            raise ValueError("Cache sizes must not be negative")
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or bool(self.directory)
+
+    def lookup(self, input_data: ScheduleInput, params: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Return (key, cached result or None, cache info for the response); key is None when not cacheable."""
+        if not self.enabled or not is_cacheable(params):
+            return None, None, {"hit": False, "cacheable": False}
+        key = cache_key(input_data, params)
+        source = "memory"
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+        if result is None:
+            result = self._read_disk(key)
+            source = "disk"
+            if result is not None:
+                self._remember(key, result)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if result is None:
+            return key, None, {"hit": False, "cacheable": True, "key": key}
+        return key, result, {"hit": True, "cacheable": True, "key": key, "source": source}
+
+    def store(self, key: Optional[str], result: Dict[str, Any]):
+        if key is None or not is_final(result):
+            return
+        self._remember(key, result)
+        self._write_disk(key, result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "directory": self.directory,
+            }
+
+    def _remember(self, key: str, result: Dict[str, Any]):
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None
+        try:
+            # Touch the file so disk eviction is least-recently-used as well
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def _write_disk(self, key: str, result: Dict[str, Any]):
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write cache entry {path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _prune_disk(self):
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")]
+        if len(entries) <= self.max_disk_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -472,11 +472,18 @@
 #             "subject_coverage": subject_coverage,
 #             "guaranteed_100_percent": unassigned_slots == 0
 #         }
-from typing import List, Dict, Any, Tuple, Optional
-from collections import defaultdict
-from model import ScheduleInput, ScheduleAssignment, TimeSlot, Break, Subject, Faculty
-from utils import check_time_conflict, check_break_conflict, time_to_minutes, minutes_to_time, VALID_DAYS, generate_time_slots, generate_weekly_time_slots, calculate_preference_score
+from typing import List, Dict, Any, Tuple, Optional, Callable
+from collections import defaultdict, Counter
+from model import ScheduleInput, ScheduleAssignment, TimeSlot, Break, Subject, Faculty, ScheduleChanges
+from utils import check_time_conflict, check_break_conflict, time_to_minutes, minutes_to_time, VALID_DAYS, generate_time_slots, generate_weekly_time_slots, calculate_preference_score, record_conflicts_with_breaks
+from occupancy import SlotGrid, OccupancyIndex
+from eligibility import EligibilityIndex
+from csp_solver import CSPSolver, CSPResult, SOLVED, INFEASIBLE
+from local_search import LocalSearchImprover
+from feasibility import check_feasibility
+import metrics
 import random
+import time
 from datetime import datetime
 import logging
 import copy
@@ -485,138 +492,543 @@ import copy
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Construction engines; "csp" falls back to greedy when it cannot finish
+ENGINES = ("greedy", "csp")
+# Wall-clock limit of the CSP search when the request has no time_budget, in seconds
+CSP_TIME_LIMIT = 5.0
+# Default iteration budget of the local-search pass
+LOCAL_SEARCH_ITERATIONS = 2000
+
+class GenerationCancelled(Exception):
+    """Raised when a schedule generation is cancelled through its should_stop callback."""
+
 class EnhancedConstraintChecker:
     def __init__(self, subjects: List[Subject]):
         self.subjects = subjects
 
-    def sort_subjects_by_constraints(self, subjects: List[Subject]) -> List[Subject]:
+    def sort_subjects_by_constraints(self, subjects: List[Subject], use_degree: bool = False) -> List[Subject]:
+        """Most constrained subjects first; use_degree also ranks subjects sharing faculty with many others earlier."""
+        degree = self.faculty_degree(subjects) if use_degree else {}
         def sort_key(s):
             special_priority = 0 if getattr(s, 'is_special', False) else 1
             faculty_constraint = len(s.faculty)
             class_priority = -s.no_of_classes_per_week
             duration_constraint = s.time / 50
+            if use_degree:
+                return (special_priority, faculty_constraint, -degree[id(s)], class_priority, duration_constraint)
             return (special_priority, faculty_constraint, class_priority, duration_constraint)
         return sorted(subjects, key=sort_key)
 
+    def faculty_degree(self, subjects: List[Subject]) -> Dict[int, int]:
+        """Number of other subjects sharing at least one faculty member, keyed by id(subject)."""
+        subjects_by_faculty = defaultdict(set)
+        for subject in subjects:
+            for faculty in subject.faculty:
+                subjects_by_faculty[faculty.id].add(id(subject))
+        degree = {}
+        for subject in subjects:
+            neighbours = set()
+            for faculty in subject.faculty:
+                neighbours |= subjects_by_faculty[faculty.id]
+            neighbours.discard(id(subject))
+            degree[id(subject)] = len(neighbours)
+        return degree
+
     def get_valid_slots_for_duration(self, availability: List[TimeSlot], fixed_slots: List[TimeSlot], duration: int) -> List[TimeSlot]:
         valid_slots = []
         for slot in fixed_slots:
-            slot_duration = time_to_minutes(slot.endTime) - time_to_minutes(slot.startTime)
-            if slot_duration != duration:
+            record = slot.record
+            if record.duration != duration:
                 continue
             for avail in availability:
-                if avail.day == slot.day or avail.day == "ALL_DAYS":
-                    avail_start = time_to_minutes(avail.startTime)
-                    avail_end = time_to_minutes(avail.endTime)
-                    slot_start = time_to_minutes(slot.startTime)
-                    slot_end = time_to_minutes(slot.endTime)
-                    if avail_start <= slot_start and slot_end <= avail_end:
-                        valid_slots.append(slot)
-                        break
+                if avail.record.contains(record):
+                    valid_slots.append(slot)
+                    break
         return valid_slots
 
 class SchedulerService:
-    def generate_schedule(self, input_data: ScheduleInput, use_ga: bool = False) -> Dict[str, Any]:
+    def generate_schedule(self, input_data: ScheduleInput, use_ga: bool = False, time_budget: Optional[float] = None, patience: Optional[int] = None, generations: int = 50, seed: Optional[int] = None, should_stop: Optional[Callable[[], bool]] = None, engine: str = "greedy", local_search: bool = False, local_search_iterations: int = LOCAL_SEARCH_ITERATIONS, progress: Optional[Callable[[Dict[str, Any]], None]] = None, slot_grid: Optional[Tuple[List[str], List[TimeSlot]]] = None, eligibility_cache: Optional[Dict] = None, islands: int = 1, topology: str = "ring") -> Dict[str, Any]:
+        """Build a schedule with the greedy or CSP engine, optionally refined by local search and the GA.
+
+        time_budget (seconds) bounds the whole request; the GA gets whatever the construction
+        left over. patience stops the GA after that many generations without improvement.
+        should_stop is polled between subjects and GA generations; when it returns True the
+        run is abandoned with GenerationCancelled. The feasibility bounds are checked first and
+        reported under "feasibility"; when they prove the input infeasible, the CSP search and
+        the GA are skipped. A CSP "infeasible" only rules out schedules with one class of a
+        subject per day, so the GA still runs after it.
+        local_search runs a simulated-annealing pass of local_search_iterations moves over the
+        constructed schedule, a cheaper alternative (or warm start) to the GA.
+        progress receives an event dict with a "stage" key as work happens: the feasibility and
+        CSP outcomes, every greedy subject, the local-search report and every GA generation.
+        slot_grid and eligibility_cache let callers that solve many rooms with the same college
+        time, breaks and durations (see batch.py) reuse the weekly slots and eligibility filters.
+        islands > 1 runs the GA as an island model (see island_model.py) whose sub-populations
+        exchange their best individuals along the given topology.
+        """
+        notify = progress or (lambda event: None)
+        started = time.monotonic()
+        if engine not in ENGINES:
+            raise ValueError(f"Invalid engine: {engine}. Expected one of {ENGINES}")
+        if islands < 1:
+            raise ValueError("islands must be at least 1")
         self._validate_input(input_data)
+
+        if slot_grid is None:
+            slot_grid = generate_weekly_time_slots(
+                input_data.college_time.startTime,
+                input_data.college_time.endTime,
+                input_data.break_,
+                input_data.subjects
+            )
+        self.time_slot_labels, self.fixed_slots = slot_grid
         self._initialize_schedules(input_data)
 
+        self.constraint_checker = EnhancedConstraintChecker(input_data.subjects)
+        self.eligibility = EligibilityIndex(input_data.subjects, self.fixed_slots, cache=eligibility_cache)
+        feasibility = check_feasibility(input_data, self.fixed_slots, self.eligibility, input_data.rooms[:1])
+        notify({"stage": "feasibility", "feasible": feasibility.feasible, "reason": feasibility.reason})
+
+        schedule = []
+        subjects = self.constraint_checker.sort_subjects_by_constraints(input_data.subjects)
+
+        csp = None
+        if engine == "csp":
+            if feasibility.feasible:
+                csp = self._solve_with_csp(input_data, started, time_budget)
+            else:
+                # The bounds already prove that no complete schedule exists
+                csp = CSPResult(status=INFEASIBLE, reason=feasibility.reason)
+            notify(dict(csp.report(), stage="csp"))
+            if csp.status == SOLVED:
+                schedule = csp.assignments
+            else:
+                logger.warning(f"CSP engine {csp.status} ({csp.reason}); falling back to greedy")
+
+        if csp is None or csp.status != SOLVED:
+            logger.info("Phase 1: Scheduling minimum required classes...")
+            greedy_started = time.perf_counter()
+            for index, subject in enumerate(subjects):
+                if should_stop is not None and should_stop():
+                    raise GenerationCancelled("Schedule generation cancelled")
+                assigned = self._assign_subject(subject, input_data.rooms[:1], input_data)
+                schedule.extend(assigned)
+                notify({"stage": "greedy", "subject": subject.name, "assigned": len(assigned), "required": subject.no_of_classes_per_week, "completed": index + 1, "total": len(subjects)})
+                metrics.classes_placed.inc(len(assigned))
+                metrics.classes_unplaced.inc(max(0, subject.no_of_classes_per_week - len(assigned)))
+            metrics.greedy_phase.observe(time.perf_counter() - greedy_started)
+
+            logger.info("Phase 2: Filling remaining slots up to class limits...")
+            # Optionally implement more slot filling logic
+
+        improvement = None
+        if local_search:
+            schedule, improvement = self._improve_with_local_search(schedule, input_data, self._remaining(started, time_budget), local_search_iterations, seed, should_stop)
+            notify(dict(improvement, stage="local_search"))
+
+        optimization = None
+        if use_ga and not feasibility.feasible:
+            logger.info("Skipping genetic algorithm: the input is infeasible")
+            optimization = {
+                "engine": "genetic_algorithm",
+                "generations_run": 0,
+                "stopped_reason": "infeasible",
+                "best_fitness": None,
+                "fitness_history": []
+            }
+        elif use_ga:
+            schedule, optimization = self._optimize_with_ga(schedule, input_data, self._remaining(started, time_budget), patience, generations, seed, should_stop, on_generation=lambda event: notify(dict(event, stage="genetic_algorithm")), islands=islands, topology=topology)
+
+        weekly_schedule = self._build_weekly_schedule(schedule)
+
+        result = {
+            "weekly_schedule": {
+                "time_slots": self.time_slot_labels,
+                "days": weekly_schedule
+            },
+            "subject_coverage": {s.name: s.no_of_classes_per_week for s in input_data.subjects},
+            "total_assignments": len(schedule),
+            "feasibility": feasibility.report()
+        }
+        if csp is not None:
+            result["csp"] = csp.report()
+        if improvement is not None:
+            result["local_search"] = improvement
+        if optimization is not None:
+            result["optimization"] = optimization
+        metrics.generation.observe(time.monotonic() - started, engine=engine)
+        return result
+
+    def check_feasibility(self, input_data: ScheduleInput) -> Dict[str, Any]:
+        """Run only the feasibility bounds, without generating a schedule."""
+        self._validate_input(input_data)
+        _, slots = generate_weekly_time_slots(
+            input_data.college_time.startTime,
+            input_data.college_time.endTime,
+            input_data.break_,
+            input_data.subjects
+        )
+        eligibility = EligibilityIndex(input_data.subjects, slots)
+        return check_feasibility(input_data, slots, eligibility, input_data.rooms[:1]).report()
+
+    def _solve_with_csp(self, input_data: ScheduleInput, started: float, time_budget: Optional[float]) -> CSPResult:
+        """Run the CSP engine within the request budget (or CSP_TIME_LIMIT)."""
+        time_limit = CSP_TIME_LIMIT
+        if time_budget is not None:
+            time_limit = max(0.0, time_budget - (time.monotonic() - started))
+        subjects = self.constraint_checker.sort_subjects_by_constraints(input_data.subjects, use_degree=True)
+        solver = CSPSolver(input_data, self.fixed_slots, self.eligibility, input_data.rooms[:1], subjects, time_limit=time_limit)
+        return solver.solve()
+
+    def generate_campus_schedule(self, input_data: ScheduleInput, should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+        """Schedule every room of a campus jointly with one faculty occupancy shared by all rooms.
+
+        Subjects with a room_id stay in that room; the others take the first room that is free
+        at the chosen time. Slots, eligibility and the occupancy grid are built once for the
+        whole campus, so a shared faculty member can never be double-booked across rooms.
+        """
+        started = time.monotonic()
+        self._validate_campus_input(input_data)
+
         self.time_slot_labels, self.fixed_slots = generate_weekly_time_slots(
             input_data.college_time.startTime,
             input_data.college_time.endTime,
             input_data.break_,
             input_data.subjects
         )
+        self._initialize_schedules(input_data)
 
         self.constraint_checker = EnhancedConstraintChecker(input_data.subjects)
+        self.eligibility = EligibilityIndex(input_data.subjects, self.fixed_slots)
 
         schedule = []
         subjects = self.constraint_checker.sort_subjects_by_constraints(input_data.subjects)
-
-        logger.info("Phase 1: Scheduling minimum required classes...")
+        logger.info(f"Campus scheduling: {len(subjects)} subjects across {len(input_data.rooms)} rooms...")
+        greedy_started = time.perf_counter()
         for subject in subjects:
-            required_classes = subject.no_of_classes_per_week
-            assigned_count = 0
-            assigned_days = set()
-
-            while assigned_count < required_classes:
-                day_assigned = False
-                for faculty in subject.faculty:
-                    valid_slots = self.constraint_checker.get_valid_slots_for_duration(
-                        faculty.availability,
-                        self.fixed_slots,
-                        subject.time
-                    )
-                    if not valid_slots:
-                        continue
-
-                    distributed_slot_map = defaultdict(list)
-                    for slot in valid_slots:
-                        distributed_slot_map[slot.day].append(slot)
-
-                    for day in VALID_DAYS:
-                        if day in distributed_slot_map and day not in assigned_days:
-                            day_slots = sorted(distributed_slot_map[day], key=lambda s: time_to_minutes(s.startTime))
-                            for slot in day_slots:
-                                score = calculate_preference_score(slot, getattr(subject, 'preferred_slots', []), getattr(faculty, 'preferred_slots', []))
-                                if self._is_valid_assignment(faculty.id, slot, input_data.rooms[0], input_data):
-                                    assignment = ScheduleAssignment(
-                                        subject_name=subject.name,
-                                        faculty_id=faculty.id,
-                                        faculty_name=faculty.name,
-                                        day=slot.day,
-                                        startTime=slot.startTime,
-                                        endTime=slot.endTime,
-                                        room_id=input_data.rooms[0],
-                                        is_special=getattr(subject, 'is_special', False),
-                                        priority_score=score
-                                    )
-                                    schedule.append(assignment)
-                                    assigned_count += 1
-                                    assigned_days.add(day)
-                                    day_assigned = True
-                                    logger.info(f"Assigned {subject.name}[{assigned_count}/{required_classes}] to {faculty.name} at {slot.day} {slot.startTime}-{slot.endTime}")
-                                    break
-                            if day_assigned:
-                                break
-                    if day_assigned:
-                        break
-                if not day_assigned:
-                    logger.warning(f"Could not distribute subject {subject.name} beyond {assigned_count} sessions due to constraints.")
-                    break
+            if should_stop is not None and should_stop():
+                raise GenerationCancelled("Schedule generation cancelled")
+            rooms = [subject.room_id] if subject.room_id else input_data.rooms
+            assigned = self._assign_subject(subject, rooms, input_data)
+            schedule.extend(assigned)
+            metrics.classes_placed.inc(len(assigned))
+            metrics.classes_unplaced.inc(max(0, subject.no_of_classes_per_week - len(assigned)))
+        metrics.greedy_phase.observe(time.perf_counter() - greedy_started)
 
-        logger.info("Phase 2: Filling remaining slots up to class limits...")
-        # Optionally implement more slot filling logic
+        by_room = {room_id: [] for room_id in input_data.rooms}
+        for assignment in schedule:
+            by_room[assignment.room_id].append(assignment)
+        rooms = {}
+        for room_id, assignments in by_room.items():
+            scheduled_subjects = {a.subject_name for a in assignments}
+            rooms[room_id] = {
+                "weekly_schedule": {
+                    "time_slots": self.time_slot_labels,
+                    "days": self._build_weekly_schedule(assignments)
+                },
+                "subject_coverage": {
+                    s.name: s.no_of_classes_per_week for s in input_data.subjects
+                    if s.room_id == room_id or (s.room_id is None and s.name in scheduled_subjects)
+                },
+                "total_assignments": len(assignments)
+            }
 
-        weekly_schedule = self._build_weekly_schedule(schedule)
-
-        return {
+        result = {
             "weekly_schedule": {
                 "time_slots": self.time_slot_labels,
-                "days": weekly_schedule
+                "days": self._build_weekly_schedule(schedule)
             },
+            "rooms": rooms,
             "subject_coverage": {s.name: s.no_of_classes_per_week for s in input_data.subjects},
             "total_assignments": len(schedule)
         }
+        metrics.generation.observe(time.monotonic() - started, engine="campus")
+        return result
+
+    def reschedule(self, input_data: ScheduleInput, previous_schedule: List[ScheduleAssignment], changes: ScheduleChanges) -> Dict[str, Any]:
+        """Repair a previous schedule after small input changes instead of regenerating it.
+
+        Only assignments touched by the changes are re-validated; invalid or surplus ones are
+        dropped, everything else stays pinned, and missing classes are placed greedily around
+        the pinned assignments.
+        """
+        updated = self._apply_changes(input_data, changes)
+        self.time_slot_labels, self.fixed_slots = generate_weekly_time_slots(
+            updated.college_time.startTime,
+            updated.college_time.endTime,
+            updated.break_,
+            updated.subjects
+        )
+        # The grid also covers the previous records, which may not line up with the new slots
+        grid = SlotGrid([slot.record for slot in self.fixed_slots] + [a.record for a in previous_schedule])
+        self.occupancy = OccupancyIndex(grid)
+        self.subject_counts = {}
+
+        subjects = {}
+        for subject in updated.subjects:
+            subjects.setdefault(subject.name, subject)
+        affected_faculty = set(changes.faculty_availability)
+        affected_subjects = set(changes.classes_per_week) | set(changes.removed_subjects) | {s.name for s in changes.added_subjects}
+        check_all = changes.break_ is not None
+
+        kept, removed = [], []
+        counts = Counter()
+        used_days = defaultdict(set)
+        for assignment in previous_schedule:
+            subject = subjects.get(assignment.subject_name)
+            affected = check_all or assignment.faculty_id in affected_faculty or assignment.subject_name in affected_subjects
+            if (
+                subject is None
+                or counts[subject.name] >= subject.no_of_classes_per_week
+                or (affected and not self._is_still_valid(assignment, subject, updated))
+                or not self.occupancy.is_free(assignment.faculty_id, assignment.room_id, assignment.record)
+            ):
+                removed.append(assignment)
+                continue
+            self.occupancy.occupy(assignment.faculty_id, assignment.room_id, assignment.record)
+            kept.append(assignment)
+            counts[subject.name] += 1
+            used_days[subject.name].add(assignment.day)
+
+        self.constraint_checker = EnhancedConstraintChecker(updated.subjects)
+        short = [s for s in self.constraint_checker.sort_subjects_by_constraints(updated.subjects) if counts[s.name] < s.no_of_classes_per_week]
+        # Eligibility is only needed for the subjects that still miss classes
+        self.eligibility = EligibilityIndex(short, self.fixed_slots)
+        added = []
+        unplaced = {}
+        for subject in short:
+            rooms = [subject.room_id] if subject.room_id else updated.rooms
+            missing = subject.no_of_classes_per_week - counts[subject.name]
+            placed = self._assign_subject(subject, rooms, updated, required_classes=missing, assigned_days=used_days[subject.name])
+            added.extend(placed)
+            counts[subject.name] += len(placed)
+            if len(placed) < missing:
+                unplaced[subject.name] = missing - len(placed)
+        logger.info(f"Rescheduled: kept {len(kept)}, removed {len(removed)}, added {len(added)} assignments")
+
+        schedule = kept + added
+        return {
+            "weekly_schedule": {
+                "time_slots": self.time_slot_labels,
+                "days": self._build_weekly_schedule(schedule)
+            },
+            "subject_coverage": {s.name: s.no_of_classes_per_week for s in updated.subjects},
+            "total_assignments": len(schedule),
+            "changes": {
+                "kept": len(kept),
+                "removed": [a.model_dump() for a in removed],
+                "added": [a.model_dump() for a in added],
+                "unplaced": unplaced
+            }
+        }
+
+    def _apply_changes(self, input_data: ScheduleInput, changes: ScheduleChanges) -> ScheduleInput:
+        """Return a copy of input_data with changes applied; the original is left untouched."""
+        updated = copy.deepcopy(input_data)
+        names = {s.name for s in updated.subjects}
+        for name in list(changes.removed_subjects) + list(changes.classes_per_week):
+            if name not in names:
+                raise ValueError(f"Unknown subject in changes: {name}")
+        updated.subjects = [s for s in updated.subjects if s.name not in set(changes.removed_subjects)]
+        for subject in updated.subjects:
+            if subject.name in changes.classes_per_week:
+                subject.no_of_classes_per_week = changes.classes_per_week[subject.name]
+        updated.subjects.extend(copy.deepcopy(changes.added_subjects))
+
+        faculty_ids = set()
+        for subject in updated.subjects:
+            for faculty in subject.faculty:
+                faculty_ids.add(faculty.id)
+                # A faculty member appears once per subject they teach; update every copy
+                if faculty.id in changes.faculty_availability:
+                    faculty.availability = copy.deepcopy(changes.faculty_availability[faculty.id])
+        unknown = set(changes.faculty_availability) - faculty_ids
+        if unknown:
+            raise ValueError(f"Unknown faculty in changes: {', '.join(sorted(unknown))}")
+        if changes.break_ is not None:
+            updated.break_ = copy.deepcopy(changes.break_)
+        return updated
+
+    def _is_still_valid(self, assignment: ScheduleAssignment, subject: Subject, input_data: ScheduleInput) -> bool:
+        """Whether a previous assignment still fits its subject, faculty availability and the breaks."""
+        record = assignment.record
+        faculty = next((f for f in subject.faculty if f.id == assignment.faculty_id), None)
+        if faculty is None or record.duration != subject.time:
+            return False
+        if not any(avail.record.contains(record) for avail in faculty.availability):
+            return False
+        return not record_conflicts_with_breaks(record, input_data.break_)
+
+    def _assign_subject(self, subject: Subject, rooms: List[str], input_data: ScheduleInput, required_classes: Optional[int] = None, assigned_days: Optional[set] = None) -> List[ScheduleAssignment]:
+        """Greedily place the weekly classes of one subject, at most one per day, in the first free room.
+
+        required_classes defaults to the subject's weekly count; days in assigned_days are skipped.
+        """
+        assignments = []
+        if required_classes is None:
+            required_classes = subject.no_of_classes_per_week
+        assigned_days = set(assigned_days or ())
+
+        while len(assignments) < required_classes:
+            day_assigned = False
+            for faculty in subject.faculty:
+                distributed_slot_map = self.eligibility.slots_by_day(subject.name, faculty.id)
+                if not distributed_slot_map:
+                    continue
+
+                for day in VALID_DAYS:
+                    if day in distributed_slot_map and day not in assigned_days:
+                        day_slots = distributed_slot_map[day]
+                        for slot in day_slots:
+                            room_id = self._find_free_room(faculty.id, slot, rooms, input_data)
+                            if room_id is not None:
+                                score = calculate_preference_score(slot, getattr(subject, 'preferred_slots', []), getattr(faculty, 'preferred_slots', []))
+                                assignment = ScheduleAssignment(
+                                    subject_name=subject.name,
+                                    faculty_id=faculty.id,
+                                    faculty_name=faculty.name,
+                                    day=slot.day,
+                                    startTime=slot.startTime,
+                                    endTime=slot.endTime,
+                                    room_id=room_id,
+                                    is_special=getattr(subject, 'is_special', False),
+                                    priority_score=score
+                                )
+                                assignments.append(assignment)
+                                assigned_days.add(day)
+                                day_assigned = True
+                                logger.info(f"Assigned {subject.name}[{len(assignments)}/{required_classes}] to {faculty.name} at {slot.day} {slot.startTime}-{slot.endTime} in {room_id}")
+                                break
+                        if day_assigned:
+                            break
+                if day_assigned:
+                    break
+            if not day_assigned:
+                logger.warning(f"Could not distribute subject {subject.name} beyond {len(assignments)} sessions due to constraints.")
+                break
+        return assignments
+
+    def _find_free_room(self, faculty_id: str, slot: TimeSlot, rooms: List[str], input_data: ScheduleInput) -> Optional[str]:
+        """Book and return the first room where slot is valid for the faculty, or None."""
+        record = slot.record
+        if not self.occupancy.faculty_free(faculty_id, record) or record_conflicts_with_breaks(record, input_data.break_):
+            return None
+        for room_id in rooms:
+            if self.occupancy.room_free(room_id, record):
+                self.occupancy.occupy(faculty_id, room_id, record)
+                return room_id
+        return None
+
+    def _remaining(self, started: float, time_budget: Optional[float]) -> Optional[float]:
+        if time_budget is None:
+            return None
+        return max(0.0, time_budget - (time.monotonic() - started))
+
+    def _improve_with_local_search(self, schedule: List[ScheduleAssignment], input_data: ScheduleInput, time_budget: Optional[float], iterations: int, seed: Optional[int], should_stop: Optional[Callable[[], bool]] = None) -> Tuple[List[ScheduleAssignment], Dict[str, Any]]:
+        """Run simulated annealing over the constructed schedule and report what it changed."""
+        logger.info("Improving schedule with local search...")
+        improver = LocalSearchImprover(
+            input_data,
+            self.fixed_slots,
+            self.eligibility,
+            SlotGrid.from_slots(self.fixed_slots),
+            input_data.rooms[0],
+            iterations=iterations,
+            time_budget=time_budget,
+            seed=seed,
+            should_stop=should_stop
+        )
+        improved, report = improver.improve(schedule)
+        if report["stopped_reason"] == "cancelled":
+            raise GenerationCancelled("Schedule generation cancelled")
+        return improved, report
+
+    def _optimize_with_ga(self, schedule: List[ScheduleAssignment], input_data: ScheduleInput, time_budget: Optional[float], patience: Optional[int], generations: int, seed: Optional[int], should_stop: Optional[Callable[[], bool]] = None, on_generation: Optional[Callable[[Dict[str, Any]], None]] = None, islands: int = 1, topology: str = "ring") -> Tuple[List[ScheduleAssignment], Dict[str, Any]]:
+        """Run the GA (or the island model) seeded with the greedy schedule and report how the search went."""
+        logger.info("Phase 3: Optimizing with genetic algorithm...")
+        # Building the engine (slot filters, codec, fitness tables) counts against the budget too
+        ga_started = time.monotonic()
+        # Imported on first use: the GA pulls in DEAP and NumPy, which most requests never need
+        if islands > 1:
+            # Islands evolve in their own processes and have no patience stop
+            from island_model import IslandModel
+            ga = IslandModel(
+                input_data,
+                self.fixed_slots,
+                islands=islands,
+                generations=generations,
+                topology=topology,
+                fixed_room_id=input_data.rooms[0],
+                eligibility=self.eligibility,
+                seed=seed,
+                representation="compact"
+            )
+            best, best_fitness = ga.run(initial=[schedule], time_budget=self._remaining(ga_started, time_budget), should_stop=should_stop, on_generation=on_generation)
+        else:
+            from genetic_algorithm import GeneticAlgorithm
+            ga = GeneticAlgorithm(
+                input_data,
+                self.fixed_slots,
+                generations=generations,
+                fixed_room_id=input_data.rooms[0],
+                eligibility=self.eligibility,
+                seed=seed,
+                representation="compact"
+            )
+            best, best_fitness = ga.run(initial=[schedule], time_budget=self._remaining(ga_started, time_budget), patience=patience, should_stop=should_stop, on_generation=on_generation)
+        if ga.stop_reason == "cancelled":
+            raise GenerationCancelled("Schedule generation cancelled")
+        optimized = [self._annotate_assignment(a, input_data) for a in best]
+        report = {
+            "engine": "genetic_algorithm",
+            "generations_run": ga.generations_run,
+            "stopped_reason": ga.stop_reason,
+            "best_fitness": best_fitness,
+            "fitness_history": ga.fitness_history
+        }
+        if islands > 1:
+            report.update(islands=islands, topology=topology)
+        return optimized, report
+
+    def _annotate_assignment(self, assignment: ScheduleAssignment, input_data: ScheduleInput) -> ScheduleAssignment:
+        """Fill in is_special and priority_score, which GA-built assignments leave at their defaults."""
+        for subject in input_data.subjects:
+            if subject.name != assignment.subject_name:
+                continue
+            for faculty in subject.faculty:
+                if faculty.id == assignment.faculty_id:
+                    slot = TimeSlot(day=assignment.day, startTime=assignment.startTime, endTime=assignment.endTime)
+                    assignment.is_special = getattr(subject, 'is_special', False)
+                    assignment.priority_score = calculate_preference_score(slot, getattr(subject, 'preferred_slots', []), getattr(faculty, 'preferred_slots', []))
+                    return assignment
+        return assignment
 
     def _validate_input(self, input_data: ScheduleInput):
         pass
 
+    def _validate_campus_input(self, input_data: ScheduleInput):
+        if not input_data.rooms:
+            raise ValueError("Campus scheduling needs at least one room")
+        rooms = set(input_data.rooms)
+        durations = {}
+        for subject in input_data.subjects:
+            if subject.room_id is not None and subject.room_id not in rooms:
+                raise ValueError(f"Subject {subject.name} is assigned to unknown room {subject.room_id}")
+            # Candidate slots are looked up by subject name, so a name must mean one duration campus-wide
+            if durations.setdefault(subject.name, subject.time) != subject.time:
+                raise ValueError(f"Subject {subject.name} has different durations in different rooms")
+
     def _initialize_schedules(self, input_data: ScheduleInput):
         self.subject_counts = {}
-        self.faculty_schedule = defaultdict(lambda: defaultdict(list))
-        self.room_schedule = defaultdict(lambda: defaultdict(list))
+        self.occupancy = OccupancyIndex(SlotGrid.from_slots(self.fixed_slots))
 
     def _is_valid_assignment(self, faculty_id: str, slot: TimeSlot, room_id: str, input_data: ScheduleInput) -> bool:
-        for s in self.faculty_schedule[faculty_id][slot.day]:
-            if check_time_conflict(s, slot):
-                return False
-        for s in self.room_schedule[room_id][slot.day]:
-            if check_time_conflict(s, slot):
-                return False
-        if check_break_conflict(slot, input_data.break_):
+        record = slot.record
+        if not self.occupancy.is_free(faculty_id, room_id, record):
+            return False
+        if record_conflicts_with_breaks(record, input_data.break_):
             return False
-        self.faculty_schedule[faculty_id][slot.day].append(slot)
-        self.room_schedule[room_id][slot.day].append(slot)
+        self.occupancy.occupy(faculty_id, room_id, record)
         return True
 
     def _build_weekly_schedule(self, schedule: List[ScheduleAssignment]) -> Dict[str, List[Any]]:
@@ -0,0 +1,6 @@
+# The scheduler modules import each other flat (from model import ...), as when main.py is run
+# from this directory, so the tests put the scheduler directory on the path the same way
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,82 @@
+# ConstraintChecker.calculate_fitness against the pairwise conflict count its sweeps replaced
+import random
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from constraints import ConstraintChecker
+from model import ScheduleAssignment
+from utils import minutes_to_time, record_conflicts_with_breaks
+
+# SUNDAY is not a valid day, so its records get the unknown day index
+DAYS = ["MONDAY", "TUESDAY", "SATURDAY", "SUNDAY"]
+
+def pairwise_fitness(schedule, input_data):
+    counts = {s.name: 0 for s in input_data.subjects}
+    for a in schedule:
+        counts[a.subject_name] += 1
+    unmet = sum(max(0, s.no_of_classes_per_week - counts[s.name]) for s in input_data.subjects)
+    conflicts = 0
+    for i, a1 in enumerate(schedule):
+        r1 = a1.record
+        for a2 in schedule[i + 1:]:
+            r2 = a2.record
+            if (a1.faculty_id == a2.faculty_id or a1.room_id == a2.room_id) and r1.day == r2.day and r1.start < r2.end and r2.start < r1.end:
+                conflicts += 1
+        if record_conflicts_with_breaks(r1, input_data.break_):
+            conflicts += 1
+    return unmet * 1000 + conflicts * 10
+
+def random_schedule(rng, input_data, size, degenerate=0.0):
+    """Random classes over a few days and rooms; a degenerate fraction of them is empty or inverted."""
+    teaching = [(s.name, f) for s in input_data.subjects for f in s.faculty]
+    rooms = input_data.rooms + ["R-extra"]
+    schedule = []
+    for _ in range(size):
+        subject_name, faculty = rng.choice(teaching)
+        start = rng.randrange(480, 1000, 10)
+        length = rng.choice([0, -30]) if rng.random() < degenerate else rng.choice([10, 50, 100])
+        schedule.append(ScheduleAssignment(
+            subject_name=subject_name,
+            faculty_id=faculty.id,
+            faculty_name=faculty.name,
+            day=rng.choice(DAYS),
+            startTime=minutes_to_time(start),
+            endTime=minutes_to_time(start + length),
+            room_id=rng.choice(rooms)
+        ))
+    return schedule
+
+def test_matches_pairwise_count():
+    for seed in range(150):
+        rng = random.Random(seed)
+        input_data = make_schedule_input(SyntheticSpec(rooms=2, subjects=5, breaks=2, seed=seed))
+        checker = ConstraintChecker(input_data.subjects)
+        schedule = random_schedule(rng, input_data, rng.randint(0, 60))
+        assert checker.calculate_fitness(schedule, input_data) == pairwise_fitness(schedule, input_data)
+
+def test_counts_empty_inverted_and_unknown_day_records_like_pairwise():
+    for seed in range(150):
+        rng = random.Random(seed)
+        input_data = make_schedule_input(SyntheticSpec(rooms=2, subjects=5, breaks=2, seed=seed))
+        checker = ConstraintChecker(input_data.subjects)
+        schedule = random_schedule(rng, input_data, rng.randint(0, 60), degenerate=0.3)
+        assert checker.calculate_fitness(schedule, input_data) == pairwise_fitness(schedule, input_data)
+
+def test_does_not_depend_on_order():
+    rng = random.Random(7)
+    input_data = make_schedule_input(SyntheticSpec(rooms=2, subjects=5, breaks=2))
+    checker = ConstraintChecker(input_data.subjects)
+    schedule = random_schedule(rng, input_data, 80, degenerate=0.2)
+    expected = checker.calculate_fitness(schedule, input_data)
+    for _ in range(10):
+        rng.shuffle(schedule)
+        assert checker.calculate_fitness(schedule, input_data) == expected
+
+def test_inverted_record_inside_a_class_is_a_conflict():
+    input_data = make_schedule_input(SyntheticSpec(rooms=1, subjects=2, breaks=0))
+    subject = input_data.subjects[0]
+    faculty = subject.faculty[0]
+    def assignment(start, end):
+        return ScheduleAssignment(subject_name=subject.name, faculty_id=faculty.id, faculty_name=faculty.name, day="MONDAY", startTime=start, endTime=end, room_id="R1")
+    checker = ConstraintChecker(input_data.subjects)
+    clash = [assignment("10:00", "11:00"), assignment("10:40", "10:20")]
+    apart = [assignment("10:00", "11:00"), assignment("12:40", "12:20")]
+    assert checker.calculate_fitness(clash, input_data) - checker.calculate_fitness(apart, input_data) == 10
@@ -0,0 +1,43 @@
+# CSP engine: budgets, proofs and solutions
+import time
+import pytest
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from constraints import ConstraintChecker
+from csp_solver import CSPSolver, SOLVED, TIMEOUT
+from eligibility import EligibilityIndex
+from model import ScheduleAssignment
+from scheduler import SchedulerService
+from utils import generate_weekly_time_slots
+
+def solver_for(input_data, **kwargs):
+    _, slots = generate_weekly_time_slots(input_data.college_time.startTime, input_data.college_time.endTime, input_data.break_, input_data.subjects)
+    return CSPSolver(input_data, slots, EligibilityIndex(input_data.subjects, slots), input_data.rooms[:1], input_data.subjects, **kwargs)
+
+def test_time_limit_bounds_preprocessing():
+    # Building the constraint tables and AC-3 alone take seconds on this input
+    input_data = make_schedule_input(SyntheticSpec(rooms=1, subjects=80, faculty_per_subject=3, breaks=1))
+    started = time.monotonic()
+    result = solver_for(input_data, time_limit=0.05).solve()
+    assert result.status == TIMEOUT
+    assert time.monotonic() - started < 0.5
+
+def weekly_assignments(result):
+    return [ScheduleAssignment(**a) for day in result["weekly_schedule"]["days"].values() for a in day]
+
+# Tight inputs the CSP solves; greedy leaves classes out on seed 3
+@pytest.mark.parametrize("seed", [0, 2, 3])
+def test_csp_solution_is_correct_and_no_worse_than_greedy(seed):
+    input_data = make_schedule_input(SyntheticSpec(rooms=1, subjects=14, availability_density=0.4, breaks=2, seed=seed))
+    greedy = SchedulerService().generate_schedule(input_data)
+    csp = SchedulerService().generate_schedule(input_data, engine="csp")
+    assert csp["csp"]["status"] == SOLVED
+    schedule = weekly_assignments(csp)
+    # Every class placed, without clashes, inside its faculty's availability and on distinct days
+    assert ConstraintChecker(input_data.subjects).calculate_fitness(schedule, input_data) == 0
+    faculty = {f.id: f for s in input_data.subjects for f in s.faculty}
+    for a in schedule:
+        assert any(slot.record.contains(a.record) for slot in faculty[a.faculty_id].availability)
+    for subject in input_data.subjects:
+        days = [a.day for a in schedule if a.subject_name == subject.name]
+        assert len(days) == len(set(days)) == subject.no_of_classes_per_week
+    assert csp["total_assignments"] >= greedy["total_assignments"]
@@ -0,0 +1,44 @@
+# The feasibility bounds: a failed bound proves that no engine places every class, while the
+# one-class-per-day rule of the greedy and CSP engines is only a warning
+from model import CollegeTime, Faculty, ScheduleInput, Subject, TimeSlot
+from scheduler import SchedulerService
+
+def make_input(days, classes, end="11:00", subjects=1):
+    faculty = Faculty(id="F1", name="A", availability=[TimeSlot(day=day, startTime="09:00", endTime="17:00") for day in days])
+    return ScheduleInput(
+        subjects=[Subject(name=f"S{i}", time=50, no_of_classes_per_week=classes, faculty=[faculty]) for i in range(subjects)],
+        break_=[],
+        college_time=CollegeTime(startTime="09:00", endTime=end),
+        rooms=["R1"]
+    )
+
+def test_one_class_per_day_is_a_warning():
+    # Two slots on Monday are enough room for two classes, but not on distinct days
+    report = SchedulerService().check_feasibility(make_input(["MONDAY"], 2))
+    assert report["feasible"]
+    assert report["capacity"]["max_placeable"] == 2
+    assert report["capacity"]["one_class_per_day"]["max_placeable"] == 1
+    assert report["subjects"]["S0"]["reasons"] == [] and report["subjects"]["S0"]["warnings"]
+    assert report["warnings"]
+
+def test_per_day_warning_does_not_skip_the_ga():
+    result = SchedulerService().generate_schedule(make_input(["MONDAY"], 2), use_ga=True, generations=5, seed=1)
+    assert result["feasibility"]["feasible"]
+    assert result["optimization"]["stopped_reason"] != "infeasible"
+    assert result["optimization"]["generations_run"] > 0
+
+def test_capacity_bound_proves_infeasibility():
+    # Three subjects need six classes but Monday and Tuesday offer only four room slots
+    report = SchedulerService().check_feasibility(make_input(["MONDAY", "TUESDAY"], 2, subjects=3))
+    assert not report["feasible"]
+    assert report["capacity"]["max_placeable"] == 4 < report["capacity"]["required_classes"] == 6
+    assert sorted(report["capacity"]["bottleneck"]["subjects"]) == ["S0", "S1", "S2"]
+    result = SchedulerService().generate_schedule(make_input(["MONDAY", "TUESDAY"], 2, subjects=3), use_ga=True, engine="csp")
+    assert result["csp"]["status"] == "infeasible"
+    assert result["optimization"]["stopped_reason"] == "infeasible"
+    assert result["total_assignments"] <= 4
+
+def test_subject_without_faculty_time_is_infeasible():
+    report = SchedulerService().check_feasibility(make_input([], 1))
+    assert not report["feasible"]
+    assert report["impossible_subjects"] == ["S0"]
@@ -0,0 +1,90 @@
+# The GA fitness paths must score every individual identically: the scalar loop, the incremental
+# FitnessState (also after crossover and mutation), the vectorized evaluator and the compact codec
+import copy
+import random
+import pytest
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from delta_fitness import FitnessState
+from genetic_algorithm import GeneticAlgorithm
+from model import ScheduleAssignment
+from utils import generate_weekly_time_slots
+from vectorized_fitness import BatchFitnessEvaluator
+
+SPECS = [
+    SyntheticSpec(rooms=1, subjects=6, faculty_per_subject=2, breaks=1, durations=(50,)),
+    SyntheticSpec(rooms=2, subjects=10, faculty_per_subject=3, availability_density=0.6, breaks=2, durations=(50, 100)),
+]
+
+def make_ga(spec, seed, representation="assignments"):
+    input_data = make_schedule_input(spec)
+    _, fixed_slots = generate_weekly_time_slots(input_data.college_time.startTime, input_data.college_time.endTime, input_data.break_, input_data.subjects)
+    return GeneticAlgorithm(input_data, fixed_slots, pop_size=20, fixed_room_id=input_data.rooms[0], seed=seed, representation=representation)
+
+def clashing_schedule(rng, ga, size):
+    """Random classes on assignable slots, ignoring eligibility, so faculty, room and break clashes are common."""
+    teaching = [(s.name, f) for s in ga.input_data.subjects for f in s.faculty]
+    rooms = ga.input_data.rooms + ["R-extra"]
+    schedule = []
+    for _ in range(size):
+        subject_name, faculty = rng.choice(teaching)
+        slot = rng.choice(ga.fixed_slots)
+        schedule.append(ScheduleAssignment(subject_name=subject_name, faculty_id=faculty.id, faculty_name=faculty.name, day=slot.day, startTime=slot.startTime, endTime=slot.endTime, room_id=rng.choice(rooms)))
+    return schedule
+
+def individuals(ga, seed, count=30):
+    rng = random.Random(seed)
+    generated = [ga.toolbox.individual() for _ in range(count)]
+    clashing = [clashing_schedule(rng, ga, rng.randint(0, 40)) for _ in range(count)]
+    return generated + clashing + [[]]
+
+@pytest.mark.parametrize("spec", SPECS)
+@pytest.mark.parametrize("seed", range(3))
+def test_scalar_state_and_vectorized_agree(spec, seed):
+    ga = make_ga(spec, seed)
+    population = individuals(ga, seed)
+    scalar = [ga._calculate_fitness(ind) for ind in population]
+    states = [FitnessState.from_assignments(ga.fitness_context, ind).fitness() for ind in population]
+    vectorized = BatchFitnessEvaluator(ga.input_data, ga.assignable_slots).evaluate(population)
+    assert states == scalar
+    assert vectorized == scalar
+
+@pytest.mark.parametrize("spec", SPECS)
+@pytest.mark.parametrize("seed", range(3))
+def test_state_after_crossover_and_mutation(spec, seed):
+    ga = make_ga(spec, seed)
+    population = ga.toolbox.population(n=20)
+    for ind in population:
+        ga._state(ind)
+    random.seed(seed)
+    for _ in range(40):
+        child1, child2 = (copy.deepcopy(ind) for ind in random.sample(population, 2))
+        ga._crossover(child1, child2)
+        ga._mutate(child1, indpb=0.3)
+        for child in (child1, child2):
+            assert child.state.fitness() == ga._calculate_fitness(child)
+            assert FitnessState.from_assignments(ga.fitness_context, child).fitness() == child.state.fitness()
+        population[random.randrange(len(population))] = child1
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_evaluate_population_matches_scalar_in_every_mode(spec):
+    ga = make_ga(spec, 0)
+    population = ga.toolbox.population(n=20)
+    expected = [ga._calculate_fitness(ind) for ind in population]
+    for mode in ("vectorized", "crosscheck"):
+        ga.fitness_mode = mode
+        ga.batch_evaluator = BatchFitnessEvaluator(ga.input_data, ga.assignable_slots)
+        assert ga._evaluate_population([copy.deepcopy(ind) for ind in population]) == expected
+
+@pytest.mark.parametrize("spec", SPECS)
+@pytest.mark.parametrize("seed", range(3))
+def test_compact_codec_matches_scalar(spec, seed):
+    ga = make_ga(spec, seed, representation="compact")
+    population = [ga.toolbox.individual() for _ in range(30)]
+    random.seed(seed)
+    for _ in range(30):
+        child1, child2 = (copy.deepcopy(ind) for ind in random.sample(population, 2))
+        ga.toolbox.mate(child1, child2)
+        ga.toolbox.mutate(child1)
+        population.extend((child1, child2))
+    for genes in population:
+        assert ga.codec.fitness(genes) == ga._calculate_fitness(ga.codec.decode(genes))
@@ -0,0 +1,43 @@
+# Seeded GA runs are reproducible on their own generator, whatever else runs in the process
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from genetic_algorithm import GeneticAlgorithm
+from utils import generate_weekly_time_slots
+
+INPUT = make_schedule_input(SyntheticSpec(rooms=1, subjects=8, breaks=1))
+_, SLOTS = generate_weekly_time_slots(INPUT.college_time.startTime, INPUT.college_time.endTime, INPUT.break_, INPUT.subjects)
+
+def run(seed, representation):
+    ga = GeneticAlgorithm(INPUT, SLOTS, pop_size=20, generations=8, fixed_room_id=INPUT.rooms[0], seed=seed, representation=representation)
+    best, fitness = ga.run()
+    return [a.model_dump() for a in best], fitness, ga.fitness_history
+
+@pytest.mark.parametrize("representation", ["assignments", "compact"])
+def test_seeded_run_leaves_the_global_rng_alone(representation):
+    random.seed(123)
+    expected = random.random()
+    random.seed(123)
+    run(7, representation)
+    assert random.random() == expected
+
+@pytest.mark.parametrize("representation", ["assignments", "compact"])
+def test_concurrent_seeded_runs_match_a_run_on_its_own(representation):
+    alone = run(7, representation)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda seed: run(seed, representation), [7, 8, 7, 8]))
+    assert results[0] == results[2] == alone
+    assert results[1] == results[3] == run(8, representation)
+
+@pytest.mark.parametrize("representation", ["assignments", "compact"])
+def test_time_budget_covers_population_creation(representation):
+    input_data = make_schedule_input(SyntheticSpec(rooms=1, subjects=60, breaks=1))
+    _, slots = generate_weekly_time_slots(input_data.college_time.startTime, input_data.college_time.endTime, input_data.break_, input_data.subjects)
+    ga = GeneticAlgorithm(input_data, slots, pop_size=100, generations=50, fixed_room_id=input_data.rooms[0], seed=1, representation=representation)
+    started = time.monotonic()
+    best, _ = ga.run(time_budget=0.1)
+    # Creating the full population alone takes about four times the budget here
+    assert time.monotonic() - started < 0.25
+    assert ga.stop_reason == "time_budget" and best
@@ -0,0 +1,28 @@
+# The GA path of SchedulerService with islands > 1 runs the island model
+import pytest
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from result_cache import cache_key
+from scheduler import SchedulerService
+
+INPUT = make_schedule_input(SyntheticSpec(rooms=1, subjects=6, breaks=1))
+
+@pytest.mark.parametrize("topology", ["ring", "fully_connected", "random"])
+def test_islands_run_and_are_reproducible(topology):
+    runs = [SchedulerService().generate_schedule(INPUT, use_ga=True, generations=6, seed=5, islands=2, topology=topology) for _ in range(2)]
+    optimization = runs[0]["optimization"]
+    assert optimization["islands"] == 2 and optimization["topology"] == topology
+    assert optimization["generations_run"] == 6 and optimization["stopped_reason"] == "completed"
+    assert runs[0]["weekly_schedule"] == runs[1]["weekly_schedule"]
+
+def test_rejects_bad_island_settings():
+    with pytest.raises(ValueError):
+        SchedulerService().generate_schedule(INPUT, use_ga=True, islands=0)
+    with pytest.raises(ValueError):
+        SchedulerService().generate_schedule(INPUT, use_ga=True, generations=1, islands=2, topology="star")
+
+def test_cache_key_only_keeps_island_settings_that_apply():
+    ga = dict(use_ga=True, seed=1, generations=10, patience=3)
+    assert cache_key(INPUT, dict(ga, islands=1, topology="ring")) == cache_key(INPUT, ga)
+    assert cache_key(INPUT, dict(ga, islands=1, topology="random")) == cache_key(INPUT, ga)
+    assert cache_key(INPUT, dict(ga, islands=2, topology="ring")) != cache_key(INPUT, dict(ga, islands=2, topology="random"))
+    assert cache_key(INPUT, dict(ga, islands=2, patience=9)) == cache_key(INPUT, dict(ga, islands=2))
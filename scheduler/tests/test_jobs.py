@@ -0,0 +1,55 @@
+# JobQueue: runs in worker processes report progress, can be cancelled queued or running, and
+# finished results are served from the cache
+import time
+import pytest
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from jobs import JobQueue, QueueFullError, CANCELLED, COMPLETED, FINAL_STATES, RUNNING
+from result_cache import ResultCache
+
+INPUT = make_schedule_input(SyntheticSpec(rooms=1, subjects=8, breaks=1))
+# Far more generations than a test waits for; only cancellation ends it
+ENDLESS = dict(use_ga=True, generations=1_000_000, seed=1)
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(workers=1, max_pending=2, cache=ResultCache())
+    yield queue
+    queue.shutdown()
+
+def wait_for(queue, job, predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job.id)
+        if predicate(job):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job.id} stuck in {job.status}")
+
+def test_job_reports_progress_and_completes(queue):
+    job = queue.submit(INPUT, use_ga=True, generations=200, seed=1)
+    running = wait_for(queue, job, lambda j: j.progress is not None and j.progress["stage"] == "genetic_algorithm")
+    assert running.status == RUNNING and running.started_at is not None
+    done = wait_for(queue, job, lambda j: j.status in FINAL_STATES)
+    assert done.status == COMPLETED
+    assert done.result["optimization"]["generations_run"] > 0
+    assert not done.result["cache"]["hit"]
+    # The same seeded request is answered from the cache without a worker
+    cached = queue.submit(INPUT, use_ga=True, generations=200, seed=1)
+    assert cached.status == COMPLETED and cached.result["cache"]["hit"]
+    assert cached.result["weekly_schedule"] == done.result["weekly_schedule"]
+
+def test_cancel_running_and_queued_jobs(queue):
+    running = queue.submit(INPUT, **ENDLESS)
+    queued = queue.submit(INPUT, **dict(ENDLESS, seed=2))
+    with pytest.raises(QueueFullError):
+        queue.submit(INPUT, **dict(ENDLESS, seed=3))
+    wait_for(queue, running, lambda j: j.status == RUNNING)
+    # The waiting job may already sit in the pool's call queue; it then stops at its first checkpoint
+    started = time.monotonic()
+    queue.cancel(queued.id)
+    queue.cancel(running.id)
+    for job in (running, queued):
+        cancelled = wait_for(queue, job, lambda j: j.status in FINAL_STATES)
+        assert cancelled.status == CANCELLED and cancelled.result is None
+    assert time.monotonic() - started < 5.0
+    assert queue.pending() == 0
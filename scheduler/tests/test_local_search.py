@@ -0,0 +1,29 @@
+# Simulated annealing keeps the best schedule it saw, so it never returns one worse than its input
+import pytest
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from constraints import ConstraintChecker
+from local_search import FILL_WEIGHT
+from model import ScheduleAssignment
+from scheduler import SchedulerService
+
+SPECS = [
+    SyntheticSpec(rooms=1, subjects=8, breaks=1),
+    SyntheticSpec(rooms=1, subjects=14, availability_density=0.4, breaks=2, seed=3),
+    SyntheticSpec(rooms=1, subjects=18, availability_density=0.5, breaks=2, seed=1),
+]
+
+def weekly_assignments(result):
+    return [ScheduleAssignment(**a) for day in result["weekly_schedule"]["days"].values() for a in day]
+
+@pytest.mark.parametrize("spec", SPECS)
+@pytest.mark.parametrize("seed", range(3))
+def test_local_search_never_makes_the_schedule_worse(spec, seed):
+    input_data = make_schedule_input(spec)
+    greedy = SchedulerService().generate_schedule(input_data)
+    improved = SchedulerService().generate_schedule(input_data, local_search=True, local_search_iterations=1500, seed=seed)
+    report = improved["local_search"]
+    assert report["classes_added"] >= 0
+    assert report["classes_added"] * FILL_WEIGHT + report["final_score"] >= report["initial_score"]
+    assert improved["total_assignments"] >= greedy["total_assignments"]
+    checker = ConstraintChecker(input_data.subjects)
+    assert checker.calculate_fitness(weekly_assignments(improved), input_data) <= checker.calculate_fitness(weekly_assignments(greedy), input_data)
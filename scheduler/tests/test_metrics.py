@@ -0,0 +1,29 @@
+# Metrics registry rendering and the structured event log
+import json
+import logging
+import metrics
+
+def test_events_are_json_lines_gated_by_level(caplog):
+    with caplog.at_level(logging.DEBUG, logger="scheduler.events"):
+        metrics.events.info("job_finished", job_id="abc", status="completed", run_ms=12.5)
+        metrics.events.debug("noise", job_id="abc")
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "scheduler.events"]
+    assert len(records) == 1
+    assert records[0]["event"] == "job_finished" and records[0]["job_id"] == "abc" and records[0]["level"] == "info"
+
+def test_disabled_registry_records_nothing():
+    registry = metrics.MetricsRegistry(enabled=False)
+    timer = registry.timer("t_seconds", "test timer")
+    with timer.time(engine="greedy"):
+        pass
+    registry.counter("c_total", "test counter").inc(3)
+    assert registry.snapshot() == {"t_seconds": {}, "c_total": {}}
+
+def test_render_and_merge():
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter("placed_total", "Classes placed")
+    counter.inc(2, stage="greedy")
+    other = metrics.MetricsRegistry()
+    other.counter("placed_total", "Classes placed").inc(3, stage="greedy")
+    registry.merge(other.snapshot())
+    assert 'scheduler_placed_total{stage="greedy"} 5' in registry.render()
@@ -0,0 +1,48 @@
+# Day matching of the slot kinds: which day name is a wildcard depends on what the slot describes
+import pytest
+from model import Break, CollegeTime, Faculty, PreferredSlot, ScheduleAssignment, ScheduleInput, Subject, TimeSlot, ALL_DAYS_INDEX, UNKNOWN_DAY_INDEX, VALID_DAYS
+from scheduler import SchedulerService
+
+def assignment(day, start="10:00", end="10:50"):
+    return ScheduleAssignment(subject_name="Math", faculty_id="F1", faculty_name="A", day=day, startTime=start, endTime=end, room_id="R1")
+
+def test_availability_and_breaks_use_all_days_as_wildcard():
+    availability = TimeSlot(day="ALL_DAYS", startTime="09:00", endTime="17:00")
+    lunch = Break(day="ALL_DAYS", startTime="10:30", endTime="11:00")
+    assert availability.record.day == lunch.record.day == ALL_DAYS_INDEX
+    for day in VALID_DAYS:
+        assert availability.record.contains(assignment(day).record)
+        assert lunch.record.overlaps(assignment(day).record)
+
+def test_preferences_use_any_day_as_wildcard():
+    preferred = PreferredSlot(day="ANY_DAY", startTime="09:00", endTime="12:00")
+    assert preferred.record.day == ALL_DAYS_INDEX
+    assert all(preferred.record.contains(assignment(day).record) for day in VALID_DAYS)
+    # ANY_DAY is not a wildcard for the other kinds, nor ALL_DAYS for preferences
+    assert TimeSlot(day="ANY_DAY", startTime="09:00", endTime="17:00").record.day == UNKNOWN_DAY_INDEX
+    assert Break(day="ANY_DAY", startTime="09:00", endTime="17:00").record.day == UNKNOWN_DAY_INDEX
+    assert PreferredSlot(day="ALL_DAYS", startTime="09:00", endTime="12:00").record.day == UNKNOWN_DAY_INDEX
+
+@pytest.mark.parametrize("day", ["ALL_DAYS", "ANY_DAY", "SUNDAY", "monday"])
+def test_assignments_have_no_wildcard(day):
+    record = assignment(day).record
+    assert record.day == UNKNOWN_DAY_INDEX
+    assert not TimeSlot(day="ALL_DAYS", startTime="09:00", endTime="17:00").record.contains(record)
+
+def test_weekday_slots_match_only_their_day():
+    monday = TimeSlot(day="MONDAY", startTime="09:00", endTime="17:00")
+    assert monday.record.contains(assignment("MONDAY").record)
+    assert not monday.record.contains(assignment("TUESDAY").record)
+
+@pytest.mark.parametrize("options", [{}, {"engine": "csp"}, {"local_search": True, "seed": 1}, {"use_ga": True, "seed": 1, "generations": 3}])
+def test_all_days_availability_is_scheduled(options):
+    faculty = Faculty(id="F1", name="A", availability=[TimeSlot(day="ALL_DAYS", startTime="09:00", endTime="17:00")])
+    input_data = ScheduleInput(
+        subjects=[Subject(name="Math", time=50, no_of_classes_per_week=3, faculty=[faculty])],
+        break_=[],
+        college_time=CollegeTime(startTime="09:00", endTime="12:00"),
+        rooms=["R1"]
+    )
+    result = SchedulerService().generate_schedule(input_data, **options)
+    assert result["feasibility"]["feasible"]
+    assert result["total_assignments"] == 3
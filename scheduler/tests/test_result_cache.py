@@ -0,0 +1,63 @@
+# Result cache: what it stores must be what the same request computes on its own
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from model import CollegeTime
+import result_cache
+from result_cache import ResultCache, cache_key, is_cacheable, is_final
+from scheduler import SchedulerService
+
+INPUT = make_schedule_input(SyntheticSpec(rooms=1, subjects=8, breaks=1))
+
+def test_concurrent_seeded_runs_are_cacheable_results():
+    params = dict(use_ga=True, generations=5, seed=11, local_search=True, local_search_iterations=300)
+    assert is_cacheable(params)
+    alone = SchedulerService().generate_schedule(INPUT, **params)
+    # API runs execute in threadpool threads next to other requests
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        runs = list(executor.map(lambda seed: SchedulerService().generate_schedule(INPUT, **dict(params, seed=seed)), [11, 12, 11, 12]))
+    for result in (runs[0], runs[2]):
+        assert result["weekly_schedule"] == alone["weekly_schedule"]
+        assert result["optimization"]["fitness_history"] == alone["optimization"]["fitness_history"]
+
+def test_cache_key_is_stable():
+    params = dict(use_ga=True, seed=3, generations=10, patience=None)
+    key = cache_key(INPUT, params)
+    assert cache_key(make_schedule_input(SyntheticSpec(rooms=1, subjects=8, breaks=1)), params) == key
+    assert cache_key(INPUT, dict(reversed(list(params.items())))) == key
+    # Unset parameters and those of passes that do not run
+    assert cache_key(INPUT, dict(use_ga=True, seed=3, generations=10)) == key
+    assert cache_key(INPUT, dict(params, local_search_iterations=50)) == key
+    assert cache_key(INPUT, {}) == cache_key(INPUT, dict(generations=99, seed=4, time_budget=2.0))
+    # Equivalent spellings of the same time
+    afternoon = dataclasses.replace(INPUT, college_time=CollegeTime(startTime="09:00", endTime="05:00 PM"))
+    assert cache_key(afternoon, {}) == cache_key(dataclasses.replace(INPUT, college_time=CollegeTime(startTime="9:00", endTime="17:00")), {})
+
+def test_cache_key_changes_with_input_params_and_version(monkeypatch):
+    params = dict(use_ga=True, seed=3, generations=10)
+    key = cache_key(INPUT, params)
+    changed = dataclasses.replace(INPUT, subjects=[dataclasses.replace(INPUT.subjects[0], no_of_classes_per_week=INPUT.subjects[0].no_of_classes_per_week + 1)] + INPUT.subjects[1:])
+    assert cache_key(changed, params) != key
+    assert cache_key(INPUT, dict(params, seed=4)) != key
+    assert cache_key(INPUT, dict(params, generations=11)) != key
+    # The CSP search is bounded by its budget, so the budget is part of its key
+    assert cache_key(INPUT, dict(engine="csp", time_budget=1.0)) != cache_key(INPUT, dict(engine="csp", time_budget=2.0))
+    monkeypatch.setattr(result_cache, "CACHE_VERSION", result_cache.CACHE_VERSION + 1)
+    assert cache_key(INPUT, params) != key
+
+def test_only_reproducible_results_are_stored(tmp_path):
+    assert is_cacheable({}) and is_cacheable(dict(engine="csp", time_budget=1.0))
+    assert not is_cacheable(dict(use_ga=True))
+    assert not is_cacheable(dict(local_search=True, seed=1, time_budget=1.0))
+    cache = ResultCache(directory=str(tmp_path))
+    key, cached, info = cache.lookup(INPUT, dict(engine="csp"))
+    assert cached is None and info["cacheable"]
+    timed_out = {"total_assignments": 0, "csp": {"status": "timeout"}}
+    assert not is_final(timed_out)
+    cache.store(key, timed_out)
+    assert cache.lookup(INPUT, dict(engine="csp"))[1] is None
+    solved = {"total_assignments": 1, "csp": {"status": "solved"}}
+    cache.store(key, solved)
+    # A fresh cache on the same directory serves the entry from disk
+    _, cached, info = ResultCache(directory=str(tmp_path)).lookup(INPUT, dict(engine="csp"))
+    assert cached == solved and info["source"] == "disk"
@@ -0,0 +1,17 @@
+# Weekly slot grids are memoized per configuration, but every caller gets its own slots
+from benchmarks.synthetic import SyntheticSpec, make_schedule_input
+from utils import generate_weekly_time_slots
+
+def test_cache_hit_returns_equal_but_unshared_slots():
+    input_data = make_schedule_input(SyntheticSpec(rooms=1, subjects=4, breaks=2))
+    args = (input_data.college_time.startTime, input_data.college_time.endTime, input_data.break_, input_data.subjects)
+    labels, first = generate_weekly_time_slots(*args)
+    again_labels, second = generate_weekly_time_slots(*args)
+    assert labels == again_labels and first == second
+    assert [s.record for s in first] == [s.record for s in second]
+    assert all(a is not b for a, b in zip(first, second))
+    # A caller mutating its slots does not change what the next request gets
+    first[0].startTime = "00:00"
+    first.pop()
+    _, third = generate_weekly_time_slots(*args)
+    assert third == second
@@ -1,12 +1,15 @@
 # Utility functions for the scheduler module
 # this module provides utility functions for time conversion, conflict checking, and slot generation.
-from typing import List, Tuple
-from model import TimeSlot, Break, PreferredSlot
+from typing import Iterable, List, NamedTuple, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from model import TimeSlot, Break, PreferredSlot, SlotRecord, VALID_DAYS, DAY_INDEX
+import metrics
 import re
+import threading
+import time
 
-# Valid days of the week
-VALID_DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY"]
-
+@lru_cache(maxsize=4096)
 def time_to_minutes(time_str: str) -> int:
     """Convert time string (HH:MM or HH:MM AM/PM) to minutes since midnight."""
     # Handle AM/PM format
@@ -52,136 +55,149 @@ def minutes_to_time(minutes: int) -> str:
 
 def check_time_conflict(slot1: TimeSlot, slot2: TimeSlot) -> bool:
     """Check if two time slots conflict with each other."""
-    if slot1.day != slot2.day:
-        return False
-    
-    start1 = time_to_minutes(slot1.startTime)
-    end1 = time_to_minutes(slot1.endTime)
-    start2 = time_to_minutes(slot2.startTime)
-    end2 = time_to_minutes(slot2.endTime)
-    
-    # Check if one slot starts during the other slot
-    return (start1 < end2 and start2 < end1)
+    record1 = slot1.record
+    record2 = slot2.record
+    return record1.day == record2.day and record1.start < record2.end and record2.start < record1.end
 
-def check_break_conflict(slot: TimeSlot, breaks: List[Break]) -> bool:
-    """Check if a time slot conflicts with any break, including ALL_DAYS breaks."""
+def record_conflicts_with_breaks(record: SlotRecord, breaks: List[Break]) -> bool:
+    """Check if a slot record overlaps any break, including ALL_DAYS breaks."""
     for break_slot in breaks:
-        # Handle ALL_DAYS break - applies to every day
-        if break_slot.day == "ALL_DAYS" or break_slot.day == slot.day:
-            break_start = time_to_minutes(break_slot.startTime)
-            break_end = time_to_minutes(break_slot.endTime)
-            slot_start = time_to_minutes(slot.startTime)
-            slot_end = time_to_minutes(slot.endTime)
-            
-            # Check if the slot overlaps with the break
-            if slot_start < break_end and break_start < slot_end:
-                return True
-    
+        if break_slot.record.overlaps(record):
+            return True
     return False
 
+def check_break_conflict(slot: TimeSlot, breaks: List[Break]) -> bool:
+    """Check if a time slot conflicts with any break, including ALL_DAYS breaks."""
+    return record_conflicts_with_breaks(slot.record, breaks)
+
 def calculate_preference_score(slot: TimeSlot, subject_preferences: List[PreferredSlot], faculty_preferences: List[PreferredSlot]) -> int:
     """Calculate preference score for a slot based on subject and faculty preferences."""
+    record = slot.record
     score = 0
     
     # Check subject preferences
     for pref in subject_preferences:
-        if (pref.day == "ANY_DAY" or pref.day == slot.day):
-            pref_start = time_to_minutes(pref.startTime)
-            pref_end = time_to_minutes(pref.endTime)
-            slot_start = time_to_minutes(slot.startTime)
-            slot_end = time_to_minutes(slot.endTime)
-            
-            # If slot fits within preferred time
-            if pref_start <= slot_start and slot_end <= pref_end:
-                score += (6 - pref.priority) * 10  # Higher priority = higher score
+        # If slot fits within preferred time
+        if pref.record.contains(record):
+            score += (6 - pref.priority) * 10  # Higher priority = higher score
     
     # Check faculty preferences
     for pref in faculty_preferences:
-        if (pref.day == "ANY_DAY" or pref.day == slot.day):
-            pref_start = time_to_minutes(pref.startTime)
-            pref_end = time_to_minutes(pref.endTime)
-            slot_start = time_to_minutes(slot.startTime)
-            slot_end = time_to_minutes(slot.endTime)
-            
-            # If slot fits within preferred time
-            if pref_start <= slot_start and slot_end <= pref_end:
-                score += (6 - pref.priority) * 5  # Faculty preferences worth less than subject
+        if pref.record.contains(record):
+            score += (6 - pref.priority) * 5  # Faculty preferences worth less than subject
     
     return score
 
-def generate_time_slots(start_time: str, end_time: str, breaks: List[Break], subjects: List) -> List[str]:
-    """Generate non-overlapping time slot labels, excluding ALL_DAYS breaks."""
-    start_minutes = time_to_minutes(start_time)
-    end_minutes = time_to_minutes(end_time)
-    
-    # Get unique subject durations and sort them
-    durations = sorted(set(subject.time for subject in subjects))
+# Distinct (college time, breaks, durations) configurations whose weekly slot grids are kept
+SLOT_GRID_CACHE_SIZE = 64
+
+class WeeklySlotGrid(NamedTuple):
+    """Precomputed weekly slots of one (college time, breaks, durations) configuration.
+
+    Grids are shared between requests; generate_weekly_time_slots hands out copies of the TimeSlots.
+    """
+    labels: Tuple[str, ...]  # "HH:MM-HH:MM", non-overlapping, in time order
+    bounds: Tuple[Tuple[int, int], ...]  # (start, end) in minutes per label
+    break_masks: Tuple[int, ...]  # Per VALID_DAYS index: bit i is set when label i overlaps a break that day
+    slots: Tuple[TimeSlot, ...]  # Break-free TimeSlots, day by day in label order
+
+_slot_grids: "OrderedDict[Tuple, WeeklySlotGrid]" = OrderedDict()
+_slot_grids_lock = threading.Lock()
+
+def _slot_bounds(start_minutes: int, end_minutes: int, break_records: Tuple[SlotRecord, ...], durations: Tuple[int, ...]) -> List[Tuple[int, int]]:
+    """Non-overlapping (start, end) pairs of every duration, stepping by the smallest one."""
     if not durations:
         return []
-    
-    # Use the smallest duration as the base unit
-    base_duration = min(durations)
-    
-    # Generate sequential time slots without overlaps
-    time_slots = []
+    base_duration = durations[0]
+    candidates = set()
     current_time = start_minutes
-    
     while current_time + base_duration <= end_minutes:
-        # For each duration, create a slot starting at current_time
         for duration in durations:
             if current_time + duration <= end_minutes:
-                slot_start = minutes_to_time(current_time)
-                slot_end = minutes_to_time(current_time + duration)
-                slot_label = f"{slot_start}-{slot_end}"
-                
-                # Check if this slot conflicts with any break (including ALL_DAYS)
-                temp_slot = TimeSlot(day="MONDAY", startTime=slot_start, endTime=slot_end)
-                if not check_break_conflict(temp_slot, breaks):
-                    time_slots.append(slot_label)
-        
-        # Move to next time slot
+                # Checked as a Monday slot, so ALL_DAYS and Monday breaks remove the time everywhere
+                candidate = SlotRecord(DAY_INDEX["MONDAY"], current_time, current_time + duration)
+                if not any(record.overlaps(candidate) for record in break_records):
+                    candidates.add((candidate.start, candidate.end))
         current_time += base_duration
-    
-    # Remove duplicates and sort
-    unique_slots = sorted(set(time_slots), key=lambda x: (time_to_minutes(x.split('-')[0]), time_to_minutes(x.split('-')[1])))
-    
-    # Filter out overlapping slots - keep only non-overlapping ones
-    non_overlapping = []
-    for slot in unique_slots:
-        start, end = slot.split('-')
-        slot_start = time_to_minutes(start)
-        slot_end = time_to_minutes(end)
-        
-        # Check if this slot overlaps with any already selected slot
-        overlaps = False
-        for existing in non_overlapping:
-            ex_start, ex_end = existing.split('-')
-            ex_start_min = time_to_minutes(ex_start)
-            ex_end_min = time_to_minutes(ex_end)
-            
-            # Check for overlap
-            if slot_start < ex_end_min and ex_start_min < slot_end:
-                overlaps = True
-                break
-        
-        if not overlaps:
-            non_overlapping.append(slot)
-    
-    return non_overlapping
+
+    # Sorted by start, the kept slots end in increasing order, so a candidate overlaps one of
+    # them exactly when it starts before the last kept slot ends
+    bounds = []
+    last_end = None
+    for slot_start, slot_end in sorted(candidates):
+        if last_end is None or slot_start >= last_end:
+            bounds.append((slot_start, slot_end))
+            last_end = slot_end
+    return bounds
+
+def _build_slot_grid(start_minutes: int, end_minutes: int, break_records: Tuple[SlotRecord, ...], durations: Tuple[int, ...]) -> WeeklySlotGrid:
+    bounds = _slot_bounds(start_minutes, end_minutes, break_records, durations)
+    labels = tuple(f"{minutes_to_time(start)}-{minutes_to_time(end)}" for start, end in bounds)
+    break_masks = []
+    slots = []
+    for day_index, day in enumerate(VALID_DAYS):
+        mask = 0
+        for i, (start, end) in enumerate(bounds):
+            record = SlotRecord(day_index, start, end)
+            if any(break_record.overlaps(record) for break_record in break_records):
+                mask |= 1 << i
+            else:
+                slots.append(TimeSlot(day=day, startTime=minutes_to_time(start), endTime=minutes_to_time(end)))
+        break_masks.append(mask)
+    return WeeklySlotGrid(labels=labels, bounds=tuple(bounds), break_masks=tuple(break_masks), slots=tuple(slots))
+
+def slot_grid_key(start_time: str, end_time: str, breaks: List[Break], subjects: List) -> Tuple:
+    """Everything a weekly slot grid depends on: college time, the set of breaks and the set of durations."""
+    return _grid_key(start_time, end_time, breaks, (subject.time for subject in subjects))
+
+def _grid_key(start_time: str, end_time: str, breaks: List[Break], durations: Iterable[int]) -> Tuple:
+    return (
+        time_to_minutes(start_time),
+        time_to_minutes(end_time),
+        tuple(sorted(set(break_slot.record for break_slot in breaks))),
+        tuple(sorted(set(durations)))
+    )
+
+def _cached_slot_grid(key: Tuple) -> WeeklySlotGrid:
+    with _slot_grids_lock:
+        grid = _slot_grids.get(key)
+        if grid is not None:
+            _slot_grids.move_to_end(key)
+    if grid is not None:
+        metrics.slot_grid_lookups.inc(result="hit")
+        return grid
+    started = time.perf_counter()
+    grid = _build_slot_grid(*key)
+    metrics.slot_generation.observe(time.perf_counter() - started)
+    metrics.slot_grid_lookups.inc(result="miss")
+    with _slot_grids_lock:
+        _slot_grids[key] = grid
+        while len(_slot_grids) > SLOT_GRID_CACHE_SIZE:
+            _slot_grids.popitem(last=False)
+    return grid
+
+def weekly_slot_grid(start_time: str, end_time: str, breaks: List[Break], subjects: List) -> WeeklySlotGrid:
+    """Memoized weekly slot grid; built once per distinct college time, break set and duration set."""
+    return _cached_slot_grid(slot_grid_key(start_time, end_time, breaks, subjects))
+
+def warm_slot_grid(start_time: str, end_time: str, breaks: List[Break], durations: List[int]) -> WeeklySlotGrid:
+    """Build (or look up) the grid that requests with these class durations will use, ahead of them."""
+    return _cached_slot_grid(_grid_key(start_time, end_time, breaks, durations))
+
+def generate_time_slots(start_time: str, end_time: str, breaks: List[Break], subjects: List) -> List[str]:
+    """Generate non-overlapping time slot labels, excluding ALL_DAYS breaks."""
+    return list(weekly_slot_grid(start_time, end_time, breaks, subjects).labels)
+
+def _copy_slot(slot: TimeSlot) -> TimeSlot:
+    # copy.copy without its dispatch overhead; the parsed record is an immutable tuple and is shared
+    copied = TimeSlot.__new__(TimeSlot)
+    copied.__dict__.update(slot.__dict__)
+    return copied
 
 def generate_weekly_time_slots(start_time: str, end_time: str, breaks: List[Break], subjects: List) -> Tuple[List[str], List[TimeSlot]]:
-    """Generate time slots for all days of the week, excluding ALL_DAYS breaks."""
-    time_slot_labels = generate_time_slots(start_time, end_time, breaks, subjects)
-    
-    # Create TimeSlot objects for each day and time slot
-    fixed_slots = []
-    for day in VALID_DAYS:
-        for slot_label in time_slot_labels:
-            start, end = slot_label.split('-')
-            slot = TimeSlot(day=day, startTime=start, endTime=end)
-            
-            # Skip slots that conflict with breaks (including ALL_DAYS)
-            if not check_break_conflict(slot, breaks):
-                fixed_slots.append(slot)
-    
-    return time_slot_labels, fixed_slots
+    """Generate time slots for all days of the week, excluding ALL_DAYS breaks.
+
+    The slots are fresh copies, so a caller that changes one cannot affect later requests.
+    """
+    grid = weekly_slot_grid(start_time, end_time, breaks, subjects)
+    return list(grid.labels), [_copy_slot(slot) for slot in grid.slots]
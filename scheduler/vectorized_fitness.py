@@ -0,0 +1,116 @@
+# Batched NumPy fitness evaluation for GA populations.
+# Encodes a whole population as padded integer arrays and scores it in one pass;
+# the result is identical to GeneticAlgorithm._calculate_fitness for every individual.
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from model import ScheduleInput, ScheduleAssignment, TimeSlot, ALL_DAYS_INDEX, UNKNOWN_DAY_INDEX
+
+# Upper bound on P x L x L cells materialized at once by the pairwise clash check
+MAX_PAIRWISE_CELLS = 4_000_000
+# Minutes range used to pack (day, start, end) into one integer key
+_KEY_BASE = 1441
+
+class BatchFitnessEvaluator:
+    """Scores lists of ScheduleAssignment individuals with vectorized NumPy operations."""
+
+    def __init__(self, input_data: ScheduleInput, assignable_slots: List[TimeSlot]):
+        self.subject_index: Dict[str, int] = {}
+        for subject in input_data.subjects:
+            self.subject_index.setdefault(subject.name, len(self.subject_index))
+        # One entry per input subject, mirroring the scalar loop over input_data.subjects
+        self.subject_columns = np.array([self.subject_index[s.name] for s in input_data.subjects], dtype=np.int64)
+        self.required = np.array([s.no_of_classes_per_week for s in input_data.subjects], dtype=np.int64)
+        self.break_day = np.array([b.record.day for b in input_data.break_], dtype=np.int64)
+        self.break_start = np.array([b.record.start for b in input_data.break_], dtype=np.int64)
+        self.break_end = np.array([b.record.end for b in input_data.break_], dtype=np.int64)
+        self.n_assignable = len(assignable_slots)
+        self.faculty_index: Dict[str, int] = {}
+        self.room_index: Dict[str, int] = {}
+
+    def encode(self, population: Sequence[List[ScheduleAssignment]]) -> Dict[str, np.ndarray]:
+        """Encode individuals as (P, L) arrays padded with -1, plus a validity mask."""
+        length = max((len(ind) for ind in population), default=0)
+        shape = (len(population), length)
+        columns = {name: np.full(shape, -1, dtype=np.int64) for name in ("subject", "faculty", "room", "day", "start", "end")}
+        valid = np.zeros(shape, dtype=bool)
+        for p, individual in enumerate(population):
+            n = len(individual)
+            if not n:
+                continue
+            columns["subject"][p, :n] = [self.subject_index[a.subject_name] for a in individual]
+            columns["faculty"][p, :n] = [self.faculty_index.setdefault(a.faculty_id, len(self.faculty_index)) for a in individual]
+            columns["room"][p, :n] = [self.room_index.setdefault(a.room_id, len(self.room_index)) for a in individual]
+            records = [a.record for a in individual]
+            columns["day"][p, :n] = [r.day for r in records]
+            columns["start"][p, :n] = [r.start for r in records]
+            columns["end"][p, :n] = [r.end for r in records]
+            valid[p, :n] = True
+        columns["valid"] = valid
+        return columns
+
+    def evaluate(self, population: Sequence[List[ScheduleAssignment]]) -> List[Tuple[int]]:
+        """Return one (fitness,) tuple per individual, in population order."""
+        if not population:
+            return []
+        length = max(1, max(len(ind) for ind in population))
+        chunk = max(1, MAX_PAIRWISE_CELLS // (length * length))
+        fitnesses = []
+        for offset in range(0, len(population), chunk):
+            scores = self._evaluate_encoded(self.encode(population[offset:offset + chunk]))
+            fitnesses.extend((int(score),) for score in scores)
+        return fitnesses
+
+    def _evaluate_encoded(self, enc: Dict[str, np.ndarray]) -> np.ndarray:
+        valid = enc["valid"]
+        pop_size, length = valid.shape
+        if length == 0:
+            return self._empty_scores(pop_size)
+
+        # Requirement deficit and excess
+        counts = np.zeros((pop_size, len(self.subject_index)), dtype=np.int64)
+        rows = np.broadcast_to(np.arange(pop_size)[:, None], valid.shape)
+        np.add.at(counts, (rows[valid], enc["subject"][valid]), 1)
+        requirement_penalty = self._requirement_penalty(counts)
+
+        day, start, end = enc["day"], enc["start"], enc["end"]
+
+        # Break hits: one per assignment overlapping any break (ALL_DAYS breaks match every known day)
+        if len(self.break_day):
+            bday = self.break_day[None, None, :]
+            aday = day[:, :, None]
+            wildcard = (bday == ALL_DAYS_INDEX) | (aday == ALL_DAYS_INDEX)
+            same_day = np.where(wildcard, (bday != UNKNOWN_DAY_INDEX) & (aday != UNKNOWN_DAY_INDEX), bday == aday)
+            overlap = (start[:, :, None] < self.break_end[None, None, :]) & (self.break_start[None, None, :] < end[:, :, None])
+            break_hits = ((same_day & overlap).any(axis=2) & valid).sum(axis=1)
+        else:
+            break_hits = np.zeros(pop_size, dtype=np.int64)
+
+        # Pairwise faculty and room clashes over i < j
+        pair_mask = np.triu(np.ones((length, length), dtype=bool), k=1)[None, :, :] & valid[:, :, None] & valid[:, None, :]
+        clash = (
+            pair_mask
+            & (day[:, :, None] == day[:, None, :])
+            & (start[:, :, None] < end[:, None, :])
+            & (start[:, None, :] < end[:, :, None])
+        )
+        faculty_clashes = (clash & (enc["faculty"][:, :, None] == enc["faculty"][:, None, :])).sum(axis=(1, 2))
+        room_clashes = (clash & (enc["room"][:, :, None] == enc["room"][:, None, :])).sum(axis=(1, 2))
+        conflicts = break_hits + faculty_clashes + room_clashes
+
+        # Distinct (day, start, end) slots used; padding keys are -1 and sort first
+        keys = np.where(valid, ((day - UNKNOWN_DAY_INDEX) * _KEY_BASE + start) * _KEY_BASE + end, -1)
+        keys.sort(axis=1)
+        first = np.ones((pop_size, 1), dtype=bool)
+        new_key = np.concatenate([first, keys[:, 1:] != keys[:, :-1]], axis=1)
+        distinct = (new_key & (keys >= 0)).sum(axis=1)
+        unfilled_penalty = (self.n_assignable - distinct) * 5000
+
+        return requirement_penalty + conflicts * 100 + unfilled_penalty
+
+    def _requirement_penalty(self, counts: np.ndarray) -> np.ndarray:
+        scheduled = counts[:, self.subject_columns]
+        return (np.abs(scheduled - self.required[None, :]) * 1000).sum(axis=1)
+
+    def _empty_scores(self, pop_size: int) -> np.ndarray:
+        counts = np.zeros((pop_size, len(self.subject_index)), dtype=np.int64)
+        return self._requirement_penalty(counts) + self.n_assignable * 5000
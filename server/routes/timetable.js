@@ -5,6 +5,56 @@ const { auth, adminOnly } = require("../middleware/auth");
 const axios = require("axios");
 
 const FASTAPI_URL = "http://127.0.0.1:8000";
+// Schedule generation runs as a FastAPI background job that is polled until it finishes
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_TIMEOUT_MS = Number(process.env.SCHEDULE_JOB_TIMEOUT_MS) || 10 * 60 * 1000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Submit a generation job and wait for its result; failures are thrown in the
+// same shape as an axios error so the route's error handling applies unchanged.
+// The job is cancelled once isCancelled() returns true (e.g. the client went away).
+async function runScheduleJob(payload, isCancelled = () => false) {
+  const submitResponse = await axios.post(
+    `${FASTAPI_URL}/api/jobs`,
+    JSON.stringify(payload),
+    {
+      headers: { "Content-Type": "application/json" },
+    }
+  );
+  const jobId = submitResponse.data.job_id;
+  const deadline = Date.now() + JOB_TIMEOUT_MS;
+
+  while (Date.now() < deadline) {
+    await sleep(JOB_POLL_INTERVAL_MS);
+    if (isCancelled()) {
+      await axios.delete(`${FASTAPI_URL}/api/jobs/${jobId}`).catch(() => {});
+      const error = new Error(`Schedule job ${jobId} cancelled by the client`);
+      error.code = "ECANCELED";
+      throw error;
+    }
+    const { data: job } = await axios.get(`${FASTAPI_URL}/api/jobs/${jobId}`);
+    if (job.progress) {
+      console.log(`Schedule job ${jobId} progress:`, job.progress);
+    }
+    if (job.status === "completed") {
+      return job.result;
+    }
+    if (job.status === "failed" || job.status === "cancelled") {
+      const error = new Error(job.error || `Schedule job ${job.status}`);
+      error.response = {
+        status: job.error_type === "ValueError" ? 400 : 500,
+        data: { message: job.error || `Schedule job ${job.status}` },
+      };
+      throw error;
+    }
+  }
+
+  await axios.delete(`${FASTAPI_URL}/api/jobs/${jobId}`).catch(() => {});
+  const error = new Error(`Schedule job ${jobId} did not finish in time`);
+  error.code = "ECONNABORTED";
+  throw error;
+}
 
 router.post("/room/:roomId/generate", [auth, adminOnly], async (req, res) => {
   const { roomId } = req.params;
@@ -130,15 +180,11 @@ router.post("/room/:roomId/generate", [auth, adminOnly], async (req, res) => {
       rooms: [roomId],
     };
 
-    const fastapiResponse = await axios.post(
-      `${FASTAPI_URL}/api/generate-schedule`,
-      JSON.stringify(fastapiPayload),
-      {
-        headers: { "Content-Type": "application/json" },
-      }
-    );
-
-    const fastapiData = fastapiResponse.data;
+    let clientGone = false;
+    res.on("close", () => {
+      clientGone = !res.writableEnded;
+    });
+    const fastapiData = await runScheduleJob(fastapiPayload, () => clientGone);
 
     if (!fastapiData) {
       throw new Error("Empty response from FastAPI service");
@@ -212,6 +258,11 @@ router.post("/room/:roomId/generate", [auth, adminOnly], async (req, res) => {
   } catch (error) {
     console.error("Error in schedule generation:", error);
 
+    if (error.code === "ECANCELED") {
+      // The client disconnected; there is nobody left to answer
+      return;
+    }
+
     if (error.code === "ECONNREFUSED") {
       return res.status(503).json({
         message: "Schedule generation service is unavailable",
@@ -232,7 +283,9 @@ router.post("/room/:roomId/generate", [auth, adminOnly], async (req, res) => {
     if (error.code === "ECONNABORTED") {
       return res.status(408).json({
         message: "Schedule generation timed out",
-        error: "Request took too long to complete (>60 seconds)",
+        error: `Request took too long to complete (>${Math.round(
+          JOB_TIMEOUT_MS / 1000
+        )} seconds)`,
       });
     }
 